@@ -1,41 +1,78 @@
-from fastapi import Depends, HTTPException, status
+import logging
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.database import SupabaseClient 
+from app.core.container import ServiceContainer
+from app.services.auth_service import AuthService
+from app.services.booking_service import BookingService
+from app.services.dashboard_service import DashboardService
+from app.services.event_category_service import CategoryService
+from app.services.event_participant_service import EventParticipantService
+from app.services.event_service import EventService
+from app.services.profile_service import ProfileService
+from app.utils.storage import StorageService
 # We don't need decode_access_token anymore
 
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
-# 1. Initialize Client once to save resources
-supabase_client = SupabaseClient.get_client()
+# Service Providers -> The Container is Built by the Lifespan in app.main
+# Async So Resolving Them Doesn't Take a Threadpool Hop, Override With app.dependency_overrides in Tests
+async def get_services(request: Request) -> ServiceContainer:
+    return request.app.state.services
+
+async def get_auth_service(services: ServiceContainer = Depends(get_services)) -> AuthService:
+    return services.auth_service
+
+async def get_booking_service(services: ServiceContainer = Depends(get_services)) -> BookingService:
+    return services.booking_service
+
+async def get_category_service(services: ServiceContainer = Depends(get_services)) -> CategoryService:
+    return services.category_service
+
+async def get_dashboard_service(services: ServiceContainer = Depends(get_services)) -> DashboardService:
+    return services.dashboard_service
+
+async def get_event_participant_service(services: ServiceContainer = Depends(get_services)) -> EventParticipantService:
+    return services.event_participant_service
+
+async def get_event_service(services: ServiceContainer = Depends(get_services)) -> EventService:
+    return services.event_service
+
+async def get_profile_service(services: ServiceContainer = Depends(get_services)) -> ProfileService:
+    return services.profile_service
+
+async def get_storage_service(services: ServiceContainer = Depends(get_services)) -> StorageService:
+    return services.storage_service
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    services: ServiceContainer = Depends(get_services)
 ):
     """
     Validates the Bearer Token directly with Supabase Auth Server.
     """
     token = credentials.credentials
-    
+
     try:
-        # This sends the token to Supabase. 
+        # This sends the token to Supabase.
         # Supabase verifies the signature, expiration, and user existence for you.
-        response = supabase_client.auth.get_user(token)
-        
+        response = services.client.auth.get_user(token)
+
         if not response.user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token or user not found"
             )
-            
+
         # Return the Supabase User object
         # It contains .id, .email, .user_metadata, etc.
         return response.user
 
     except Exception as e:
         # If Supabase says "No", we say "No"
-        print(f"Auth Validation Error: {e}") # Debugging help
+        logger.warning("Auth Validation Error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Auth Failed: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
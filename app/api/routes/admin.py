@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+
+router = APIRouter()
+
+def require_profiling_admin(request: Request):
+    # Hidden Unless Profiling is Enabled -> Then Gated by X-Profile-Token
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "Not Found")
+    from app.core.profiling import is_admin # -> Only Imported Once Profiling is Enabled
+    if not is_admin(request.headers):
+        raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = "Admin Token Required")
+
+@router.get("/profiles", dependencies = [Depends(require_profiling_admin)])
+def list_profiles():
+    from app.core.profiling import profiles
+    return {"profiles": profiles.list()}
+
+@router.get("/profiles/{profile_id}", dependencies = [Depends(require_profiling_admin)])
+def get_profile(profile_id: str, format: str = "json"):
+    # json -> Summary and Top Functions, folded / folded-cpu -> Collapsed Stacks for flamegraph.pl or speedscope
+    from app.core.profiling import profiles
+    profile = profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "Profile Not Found")
+    if format == "json":
+        return profile.to_dict()
+    if format in ("folded", "folded-cpu"):
+        return PlainTextResponse(
+            profile.folded(cpu = format == "folded-cpu"),
+            headers = {"Content-Disposition": f'attachment; filename="profile-{profile_id}.{format}.txt"'}
+        )
+    raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = "Format Must Be json, folded or folded-cpu")
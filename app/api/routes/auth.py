@@ -1,21 +1,19 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.api.deps import get_current_user
+from app.api.deps import get_auth_service, get_current_user
 from app.schemas import auth
 from app.schemas.auth import ForgotPasswordRequest, GithubLoginRequest, GoogleLoginRequest, OAuthUrlResponse, UserLogin, UserPasswordUpdate, UserRegister, TokenResponse, VerifyResetCodeRequest
-from app.services import auth_service
 from app.services.auth_service import AuthService
-from app.core.database import supabase
 from typing import Union
 from fastapi.responses import JSONResponse
 
 router = APIRouter()
 security = HTTPBearer()
-auth_service = AuthService()
 
 @router.post("/register", response_model=Union[TokenResponse, dict], status_code=status.HTTP_201_CREATED)
 def register(
-    user_data: UserRegister
+    user_data: UserRegister,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Register a new User
     try:
@@ -31,7 +29,8 @@ def register(
 
 @router.post('/login', response_model = TokenResponse, status_code = status.HTTP_201_CREATED)
 def login(
-    user_data: UserLogin
+    user_data: UserLogin,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Login User and Return Access Token
     try: 
@@ -47,7 +46,8 @@ def login(
 
 @router.get("/oauth/google/url", response_model = OAuthUrlResponse)
 def get_google_oauth_url(
-    redirect_url: str
+    redirect_url: str,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Get Google OAuth URL for Authentication
     try: 
@@ -63,7 +63,8 @@ def get_google_oauth_url(
 
 @router.post("/oauth/google/callback", response_model = TokenResponse)
 def google_oauth_callback(
-    payload: GoogleLoginRequest
+    payload: GoogleLoginRequest,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Verify the Code Send by the Frontend and Return the Session
     try: 
@@ -78,18 +79,20 @@ def google_oauth_callback(
         )
 
 @router.get("/oauth/github/url", status_code=status.HTTP_200_OK)
-def get_github_url(redirect_url: str):
+def get_github_url(redirect_url: str, auth_service: AuthService = Depends(get_auth_service)):
     return auth_service.get_github_oauth_url(redirect_url)
 
 @router.post("/oauth/github/callback", response_model = TokenResponse, status_code = status.HTTP_200_OK)
 def github_oauth_callback(
-    payload: GithubLoginRequest
+    payload: GithubLoginRequest,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     return auth_service.login_with_github_code(payload.code)
 
 @router.post("/logout", status_code = status.HTTP_200_OK)
 def logout(
-    auth: HTTPAuthorizationCredentials = Depends(security)
+    auth: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Logout User Requries a Valid Access Token in the Authorization Bearer
     try: 
@@ -108,7 +111,8 @@ def logout(
 
 @router.post("/refresh", response_model = TokenResponse)
 def refresh_token(
-    refresh_token: str
+    refresh_token: str,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Get a New Access Token Using the Refresh Token
     try:
@@ -124,7 +128,8 @@ def refresh_token(
 
 @router.post("/forgot-password", status_code = status.HTTP_200_OK)
 def forgot_password(
-    request: ForgotPasswordRequest
+    request: ForgotPasswordRequest,
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     # Request Password Reset Email
     try: 
@@ -139,7 +144,7 @@ def forgot_password(
         )
 
 @router.put("/reset-password", status_code = status.HTTP_200_OK)
-def reset_password(payload: UserPasswordUpdate, user = Depends(get_current_user)):
+def reset_password(payload: UserPasswordUpdate, user = Depends(get_current_user), auth_service: AuthService = Depends(get_auth_service)):
     try:
         if not user.id: 
             raise HTTPException(
@@ -156,5 +161,5 @@ def reset_password(payload: UserPasswordUpdate, user = Depends(get_current_user)
         )
 
 @router.post("/verify-reset-code", response_model = TokenResponse, status_code = status.HTTP_200_OK)
-def verify_reset_code(payload: VerifyResetCodeRequest):
+def verify_reset_code(payload: VerifyResetCodeRequest, auth_service: AuthService = Depends(get_auth_service)):
     return auth_service.verify_reset_code(payload.code)
\ No newline at end of file
@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from typing import Optional, List
 from datetime import datetime
-from app.api.deps import get_current_user 
-from app.services import booking_service
+from app.api.deps import get_booking_service, get_current_user
 from app.services.booking_service import BookingService
+from app.core.responses import FastJSONResponse, TypedJSONResponse, typed_adapter
 from app.schemas.booking import BookingCreateSchema, BookingDetailResponse, BookingResponse
 
 router = APIRouter()
-booking_service = BookingService()
+
+# Precompiled Adapters -> Validate and Encode the Response in One Pass
+booking_list_adapter = typed_adapter(List[BookingDetailResponse])
+booking_detail_adapter = typed_adapter(BookingDetailResponse)
 
 @router.post("/checkout", response_model = BookingResponse, status_code = status.HTTP_201_CREATED)
 def create_booking(
     payload: BookingCreateSchema,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    booking_service: BookingService = Depends(get_booking_service)
 ):
     if not user.id: 
         raise HTTPException(
@@ -33,7 +37,8 @@ def create_booking(
 
 @router.post("/webhook", include_in_schema = True)
 async def stripe_webhook(
-    request: Request
+    request: Request,
+    booking_service: BookingService = Depends(get_booking_service)
 ):
     try:
         response = await booking_service.handle_stripe_webhook(request)
@@ -49,7 +54,8 @@ async def stripe_webhook(
 @router.get("/organizer/event/{event_id}/participants", status_code = status.HTTP_200_OK)
 def list_event_participants(
     event_id: str,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    booking_service: BookingService = Depends(get_booking_service)
 ): 
     if not user.id: 
         raise HTTPException(
@@ -59,7 +65,7 @@ def list_event_participants(
 
     try:
         response = booking_service.get_event_bookings_for_organizer(event_id, user.id)
-        return response
+        return FastJSONResponse(response)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -69,23 +75,23 @@ def list_event_participants(
         )
 
 @router.get("/my-history", response_model=List[BookingDetailResponse])
-def get_my_booking_history(user = Depends(get_current_user)):
+def get_my_booking_history(user = Depends(get_current_user), booking_service: BookingService = Depends(get_booking_service)):
     if not user.id: 
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED, 
             detail="Authentication Fail"
         )
-    return booking_service.list_my_bookings(user.id)
+    return TypedJSONResponse(booking_list_adapter, booking_service.list_my_bookings(user.id))
 
 @router.get("/{booking_id}", response_model = BookingDetailResponse)
-def get_booking_detail(booking_id: str, user = Depends(get_current_user)):
+def get_booking_detail(booking_id: str, user = Depends(get_current_user), booking_service: BookingService = Depends(get_booking_service)):
     if not user.id:
         raise HTTPException(
             status_code = status.HTTP_404_NOT_FOUND,
             detail = "Authentication Fail"
         )
     try: 
-        return booking_service.get_booking_detail(booking_id)
+        return TypedJSONResponse(booking_detail_adapter, booking_service.get_booking_detail(booking_id))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -97,9 +103,10 @@ def get_booking_detail(booking_id: str, user = Depends(get_current_user)):
 @router.get("/status/{event_id}", status_code=status.HTTP_200_OK)
 def check_participation_status(
     event_id: str,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    booking_service: BookingService = Depends(get_booking_service)
 ):
     """
     Check if the current logged-in user has booked this event.
     """
-    return booking_service.get_booking_status(user.id, event_id)
\ No newline at end of file
+    return FastJSONResponse(booking_service.get_booking_status(user.id, event_id))
\ No newline at end of file
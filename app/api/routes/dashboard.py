@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from app.api.deps import get_current_user
+from fastapi import APIRouter, Depends, status, HTTPException, Query
+from typing import Optional
+from datetime import datetime
+from app.api.deps import get_current_user, get_dashboard_service
 from app.services.dashboard_service import DashboardService
+from app.core.responses import TypedJSONResponse, typed_adapter
 from app.schemas.dashboard import DashboardResponse
 
 router = APIRouter()
-dashboard_service = DashboardService()
+dashboard_adapter = typed_adapter(DashboardResponse)
 
 @router.get("/organizer", response_model=DashboardResponse)
 def get_analytics(
+    date_from: Optional[datetime] = Query(None, alias = "from"),
+    date_to: Optional[datetime] = Query(None, alias = "to"),
+    granularity: str = Query("day", pattern = "^(hour|day|week|month)$"),
+    event_id: Optional[str] = None,
+    currency: Optional[str] = Query(None, min_length = 3, max_length = 3),
     user = Depends(get_current_user),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
 ):
     if not user.id: raise HTTPException(401, "Auth failed")
-    return dashboard_service.get_organizer_dashboard(user.id)
\ No newline at end of file
+    return TypedJSONResponse(
+        dashboard_adapter,
+        dashboard_service.get_organizer_dashboard(user.id, date_from, date_to, granularity, event_id, currency)
+    )
\ No newline at end of file
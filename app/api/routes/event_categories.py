@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
+from app.api.deps import get_category_service
 from app.services.event_category_service import CategoryService
+from app.core.responses import TypedJSONResponse, typed_adapter
 from app.schemas.event_category import CategoryResponse
 
 router = APIRouter()
-category_service = CategoryService()
+category_list_adapter = typed_adapter(List[CategoryResponse])
 
 @router.get("/", response_model = List[CategoryResponse], status_code = status.HTTP_200_OK)
-def list_categories():
+def list_categories(category_service: CategoryService = Depends(get_category_service)):
     try:
-        return category_service.get_all_categories()
+        return TypedJSONResponse(category_list_adapter, category_service.get_all_categories())
     except HTTPException:
         raise
     except Exception as e:
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Query
 from typing import Optional
 from datetime import datetime
-from app.api.deps import get_current_user 
-from app.services import event_service
+from app.api.deps import get_current_user, get_event_service, get_storage_service
 from app.services.event_service import EventService
 from app.schemas.event import EventListResponse, EventResponse, EventUpdateSchema
+from app.schemas.upload import SignedUploadRequest, SignedUploadResponse, UploadCompleteRequest, UploadResult
+from app.core.responses import FastJSONResponse
 from app.utils.storage import StorageService
 
 router = APIRouter()
-event_service = EventService()
 
 @router.post("/", response_model = EventResponse, status_code = status.HTTP_201_CREATED)
 def create_event(
@@ -24,10 +24,12 @@ def create_event(
     currency: str = Form("usd"),
     category_id: str = Form(...),
     event_status: str = Form("published", pattern="^(draft|published|cancelled)$"),
-    # File Upload
-    image: UploadFile = File(...),
+    # File Upload -> Or the Path Returned by POST /events/image/upload-url After a Direct Upload
+    image: Optional[UploadFile] = File(None),
+    image_path: Optional[str] = Form(None),
     # Authentication
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    event_service: EventService = Depends(get_event_service)
 ):
     try:
         # Create Event Endpoint -> Accept Multipart / Form-Data
@@ -48,7 +50,8 @@ def create_event(
         result = event_service.create_event(
             user_id = user.id,
             event_data = event_payload_dict,
-            image_file = image
+            image_file = image,
+            image_path = image_path
         )
         
         return result
@@ -60,16 +63,56 @@ def create_event(
             detail = f"Event Created Fail: {str(e)}"
         )
 
+@router.post("/image/upload-url", response_model = SignedUploadResponse, status_code = status.HTTP_201_CREATED)
+def create_event_image_upload_url(
+    payload: SignedUploadRequest,
+    user = Depends(get_current_user),
+    storage_service: StorageService = Depends(get_storage_service)
+):
+    """
+    Direct Upload Flow:
+    1. Get a Signed URL Here, Then PUT the File Straight to Storage -> The File Doesn't Pass Through the API
+    2. Pass the Returned Path as image_path to POST /events, or Call POST /events/{event_id}/image/complete
+    """
+    try:
+        return storage_service.create_event_image_upload_url(user.id, payload.content_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail = f"Create Upload URL Fail: {str(e)}"
+        )
+
+@router.post("/{event_id}/image/complete", response_model = UploadResult, status_code = status.HTTP_200_OK)
+def complete_event_image_upload(
+    event_id: str,
+    payload: UploadCompleteRequest,
+    user = Depends(get_current_user),
+    event_service: EventService = Depends(get_event_service)
+):
+    try:
+        return event_service.attach_uploaded_image(event_id, user.id, payload.path)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail = f"Complete Upload Fail: {str(e)}"
+        )
+
 @router.get("/", status_code = status.HTTP_200_OK)
 def list_events(
     page: int = Query(1, ge = 1),
     size: int = Query(9, ge = 1, le = 50),
     search: Optional[str] = None,
     category_id: Optional[str] = None,
-    created_by: Optional[str] = None
+    created_by: Optional[str] = None,
+    event_service: EventService = Depends(get_event_service)
 ):
     try:
-        return event_service.list_events(page, size, search, category_id, created_by)
+        # Large Page of Plain Dicts -> Encoded Directly by orjson
+        return FastJSONResponse(event_service.list_events(page, size, search, category_id, created_by))
     except HTTPException:
         raise
     except Exception as e:
@@ -80,10 +123,11 @@ def list_events(
 
 @router.get("/{event_id}", status_code = status.HTTP_200_OK)
 def get_event(
-    event_id: str
+    event_id: str,
+    event_service: EventService = Depends(get_event_service)
 ):
     try:
-        return event_service.get_event(event_id)
+        return FastJSONResponse(event_service.get_event(event_id))
     except HTTPException:
         raise
     except Exception as e:
@@ -95,7 +139,8 @@ def get_event(
 @router.delete("/{event_id}", status_code = status.HTTP_200_OK)
 def delete_event(
     event_id: str,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    event_service: EventService = Depends(get_event_service)
 ):
     try:
         user_id = user.id
@@ -117,7 +162,8 @@ def delete_event(
 def update_event(
     event_id: str,
     payload: EventUpdateSchema,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    event_service: EventService = Depends(get_event_service)
 ): 
     """
     Update Event Details:
@@ -147,12 +193,19 @@ def update_event(
 
 @router.post("/upload-image", status_code = status.HTTP_201_CREATED)
 def upload_event_image(
-    event_id: str,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    event_id: Optional[str] = Query(None, deprecated = True),
+    storage_service: StorageService = Depends(get_storage_service)
 ): 
+    """
+    Upload an Event Image -> Returns the URL to Pass in image_url When Creating or Updating the Event
+        - event_id is Still Accepted From Older Clients, but No Longer Part of the Storage Path -> Images are Stored
+          Under Their Content Hash and Shared Across Events, and This Endpoint Never Linked the Image to the Event
+    """
     try: 
-        storage = StorageService()
-        return storage.upload_event_image(file, event_id)
+        return storage_service.upload_event_image(file)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
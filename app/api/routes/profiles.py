@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_profile_service, get_storage_service
 from app.services.profile_service import ProfileService
 from app.schemas.profile import ProfileResponse, ProfileUpdate
+from app.schemas.upload import SignedUploadRequest, SignedUploadResponse, UploadCompleteRequest, UploadResult
+from app.core.responses import FastJSONResponse
 from app.utils.storage import StorageService
 
 router = APIRouter()
-profile_service = ProfileService()
-storage_service = StorageService()
 
 @router.get("/me", response_model = ProfileResponse, status_code= status.HTTP_200_OK)
-def get_my_profile(user = Depends(get_current_user)):
+def get_my_profile(user = Depends(get_current_user), profile_service: ProfileService = Depends(get_profile_service)):
     try:
         if not user.id:
             raise HTTPException(
@@ -26,7 +26,7 @@ def get_my_profile(user = Depends(get_current_user)):
         )
 
 @router.post("/upload-avatar", status_code = status.HTTP_200_OK)
-def upload_avatar_image(file: UploadFile = File(...), user = Depends(get_current_user)):
+def upload_avatar_image(file: UploadFile = File(...), user = Depends(get_current_user), storage_service: StorageService = Depends(get_storage_service)):
     try:
         if not user.id:
             raise HTTPException(
@@ -42,8 +42,46 @@ def upload_avatar_image(file: UploadFile = File(...), user = Depends(get_current
             detail = f"Upload Avatar Image Fail: {str(e)}"
         )
 
+@router.post("/avatar/upload-url", response_model = SignedUploadResponse, status_code = status.HTTP_201_CREATED)
+def create_avatar_upload_url(payload: SignedUploadRequest, user = Depends(get_current_user), storage_service: StorageService = Depends(get_storage_service)):
+    # Direct Upload -> PUT the File to the Signed URL, Then Call POST /profiles/avatar/complete With the Path
+    try:
+        if not user.id:
+            raise HTTPException(
+                status_code = status.HTTP_401_UNAUTHORIZED,
+                detail = "Authentication Failed"
+            )
+        return storage_service.create_avatar_upload_url(user.id, payload.content_type)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail = f"Create Avatar Upload URL Fail: {str(e)}"
+        )
+
+@router.post("/avatar/complete", response_model = UploadResult, status_code = status.HTTP_200_OK)
+def complete_avatar_upload(payload: UploadCompleteRequest, user = Depends(get_current_user), profile_service: ProfileService = Depends(get_profile_service), storage_service: StorageService = Depends(get_storage_service)):
+    try:
+        if not user.id:
+            raise HTTPException(
+                status_code = status.HTTP_401_UNAUTHORIZED,
+                detail = "Authentication Failed"
+            )
+        result = storage_service.complete_avatar_upload(user.id, payload.path)
+        # Link the Verified Avatar to the Profile
+        profile_service.update_profile(user.id, ProfileUpdate(avatar_url = result["url"]))
+        return result
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail = f"Complete Avatar Upload Fail: {str(e)}"
+        )
+
 @router.put("/me", response_model = ProfileResponse, status_code = status.HTTP_200_OK)
-def update_my_profile(payload: ProfileUpdate, user = Depends(get_current_user)):
+def update_my_profile(payload: ProfileUpdate, user = Depends(get_current_user), profile_service: ProfileService = Depends(get_profile_service)):
     try:
         if not user.id: 
             raise HTTPException(
@@ -60,6 +98,6 @@ def update_my_profile(payload: ProfileUpdate, user = Depends(get_current_user)):
         )
 
 @router.get("/{user_id}", status_code = status.HTTP_200_OK)
-def get_public_profile(user_id: str):
-    return profile_service.get_public_profile(user_id)
+def get_public_profile(user_id: str, profile_service: ProfileService = Depends(get_profile_service)):
+    return FastJSONResponse(profile_service.get_public_profile(user_id))
     
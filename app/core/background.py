@@ -0,0 +1,53 @@
+import logging
+import threading
+from typing import Callable, Optional
+from app.core.tracing import background_span
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Run a Job on a Daemon Thread Until Stopped
+        - The Job Returns True When There is More Work Queued -> Run Again Immediately
+        - Otherwise Sleep for the Poll Interval, or Until wake() is Called
+    """
+    def __init__(self, name: str, interval: float, job: Callable[[], bool]):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target = self._run, name = self.name, daemon = True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        # Skip the Remaining Sleep -> Used When a Request is Waiting on the Job
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            has_more = False
+            try:
+                # Each Run is Its Own Trace -> Sampled at the Same Rate as Requests
+                with background_span(f"worker.{self.name}"):
+                    has_more = bool(self.job())
+            except Exception as e:
+                logger.error("Worker Error: %s", e, extra = {"worker": self.name})
+            if has_more:
+                continue
+            self._wake.wait(self.interval)
+            self._wake.clear()
\ No newline at end of file
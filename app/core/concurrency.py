@@ -0,0 +1,51 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from app.core.config import settings
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread Pool That Runs Each Job in a Copy of the Submitter's Context
+        - Request-Scoped Context Variables (Per-Request Call Timings, ...) Follow the Fan-Out
+        - Counts Submitted-but-Unfinished Jobs -> Exported as Running / Queued by app.core.runtime
+        - wrap_job (When Set) Wraps Each Job on Submit -> The Profiler Uses It to Follow Requests Into the Pool
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self.wrap_job: Optional[Callable[[Callable], Callable]] = None
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        if self.wrap_job is not None:
+            fn = self.wrap_job(fn)
+        context = contextvars.copy_context()
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            future = super().submit(context.run, fn, *args, **kwargs)
+        except BaseException:
+            self._job_done(None)
+            raise
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def pending(self) -> int:
+        return self._pending
+
+    def queued(self) -> int:
+        return self._work_queue.qsize()
+
+
+# Shared Thread Pool for Fanning Out Independent External Calls (Image Variant Uploads, Warm-Up) Within a Request
+# Kept Separate From AnyIO's Request Threadpool So a Fan-Out Never Waits Behind Other Requests
+io_executor = ContextThreadPoolExecutor(
+    max_workers = settings.EXTERNAL_IO_WORKERS,
+    thread_name_prefix = "eventora-io"
+)
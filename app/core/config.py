@@ -12,6 +12,35 @@ class Settings(BaseSettings):
     EVENT_IMAGE_FOLDER: str = "banners"
     AVATAR_BUCKET: str = "avatars"
 
+    # Upload Configuration
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_TEMP_DIR: Optional[str] = None
+
+    # Image Processing Configuration
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_PROCESS_START_METHOD: str = "forkserver" # -> Or "spawn" -> Never "fork" From the Threaded API Process
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 40_000_000
+    IMAGE_PROCESS_TIMEOUT_SECONDS: float = 30.0
+
+    # Image Variant Worker Configuration
+    IMAGE_VARIANT_WORKER_ENABLED: bool = True
+    IMAGE_VARIANT_POLL_SECONDS: float = 2.0
+    IMAGE_VARIANT_BATCH_SIZE: int = 5
+    IMAGE_VARIANT_LEASE_SECONDS: int = 300
+    IMAGE_VARIANT_MAX_ATTEMPTS: int = 5
+    IMAGE_VARIANT_BACKOFF_SECONDS: float = 5.0
+    IMAGE_VARIANT_MAX_BACKOFF_SECONDS: float = 900.0
+
+    # Storage Garbage Collection Configuration
+    STORAGE_GC_WORKER_ENABLED: bool = True
+    STORAGE_GC_POLL_SECONDS: float = 60.0
+    STORAGE_GC_GRACE_SECONDS: int = 3600
+    STORAGE_GC_BATCH_SIZE: int = 500
+    STORAGE_GC_SWEEP_SECONDS: float = 6 * 60 * 60
+    STORAGE_GC_LIST_PAGE_SIZE: int = 1000
+
     # JWT Configuration
     JWT_SECRET_KEY: str = ""
     JWT_ALGORITHM: str = "HS256"
@@ -21,6 +50,100 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str = ""
     STRIPE_PUBLISHABLE_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
+    STRIPE_API_BASE: Optional[str] = None # -> Point at a Local Stand-In (benchmarks/fakes) Instead of api.stripe.com
+
+    # Stripe Outbox Configuration
+    STRIPE_OUTBOX_WORKER_ENABLED: bool = True
+    STRIPE_OUTBOX_POLL_SECONDS: float = 2.0
+    STRIPE_OUTBOX_BATCH_SIZE: int = 50
+    STRIPE_OUTBOX_LEASE_SECONDS: int = 60
+    STRIPE_OUTBOX_MAX_ATTEMPTS: int = 8
+    STRIPE_OUTBOX_BACKOFF_SECONDS: float = 5.0
+    STRIPE_OUTBOX_MAX_BACKOFF_SECONDS: float = 900.0
+    STRIPE_PRICE_WAIT_SECONDS: float = 5.0
+
+    # Currency Configuration
+    DEFAULT_REPORTING_CURRENCY: str = "MYR"
+    FX_RATES_PATH: str = "app/data/fx_rates.json"
+    FX_RATES_REFRESH_SECONDS: int = 3600
+
+    # Concurrency Configuration
+    EXTERNAL_IO_WORKERS: int = 16
+
+    # Response Compression Configuration
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    GZIP_COMPRESSLEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # Cache Configuration
+    CATEGORY_CACHE_SECONDS: float = 300.0
+
+    # Startup Warm-Up Configuration
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 4
+    WARMUP_EVENT_PAGE_SIZE: int = 9
+
+    # Observability Configuration
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "" # -> console | file | package.module:factory, Empty Disables Tracing
+    TRACING_SAMPLE_RATE: float = 0.1
+    TRACING_TRUST_TRACEPARENT_SAMPLED: bool = False # -> Honour the Caller's Sampled Flag, Only Behind a Trusted Gateway / Mesh
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_QUEUE_SIZE: int = 1000
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json" # -> json | text
+    LOG_RATE_LIMIT: int = 10 # -> Warnings / Errors per Message per Window, 0 Disables
+    LOG_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+
+    # Runtime Monitoring Configuration
+    RUNTIME_MONITOR_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    EVENT_LOOP_LAG_WARN_SECONDS: float = 0.1 # -> Above This /health/details Reports Degraded
+
+    # Load Shedding Configuration
+    LOAD_SHEDDING_ENABLED: bool = True # -> Needs RUNTIME_MONITOR_ENABLED
+    LOAD_SHED_MAX_IN_FLIGHT: int = 200 # -> High-Priority Routes Shed Only Past This, Lower Priorities Earlier
+    LOAD_SHED_QUEUE_DELAY_SECONDS: float = 0.5 # -> Threadpool Wait at Which Low-Priority Routes Start Shedding
+    LOAD_SHED_RETRY_AFTER_MAX_SECONDS: int = 30
+
+    # Deadline Configuration
+    DEADLINES_ENABLED: bool = True
+    DEADLINE_DEFAULT_SECONDS: float = 10.0
+    DEADLINE_BUDGETS: dict = {} # -> {"GET /events/": 3} Route Budgets in Seconds, Without the API Prefix
+
+    # Rate Limiting Configuration
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory" # -> memory (Per Process) | redis (Shared by Every Worker)
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    RATE_LIMIT_POLICIES: dict = {} # -> {"login": "20/60"} Overrides limit/window per Policy, "0/60" Disables One
+    RATE_LIMIT_PROXY_HOPS: int = 0 # -> Trusted Proxies in Front, Client IP is Taken From X-Forwarded-For When > 0
+
+    # Profiling Configuration
+    PROFILING_ENABLED: bool = False # -> Middleware Not Installed Unless Set
+    PROFILING_ADMIN_TOKEN: Optional[str] = None # -> X-Profile-Token Value That Forces a Profile and Unlocks /admin/profiles
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_MAX_CONCURRENT: int = 2 # -> Caps Sampled (Not Requested) Profiles Running at Once
+    PROFILING_INTERVAL_MS: float = 1.0
+    PROFILING_MAX_ARTIFACTS: int = 50
+
+    # Resilience Configuration
+    RESILIENCE_ENABLED: bool = True
+    RETRY_MAX_ATTEMPTS: int = 2 # -> Extra Attempts for Idempotent Supabase Reads on Connection Errors and 502/503/504
+    RETRY_BASE_DELAY_SECONDS: float = 0.05
+    RETRY_MAX_DELAY_SECONDS: float = 1.0
+    CIRCUIT_FAILURE_RATE: float = 0.5 # -> Share of Failed Calls in the Window That Opens a Dependency's Circuit
+    CIRCUIT_MIN_CALLS: int = 20 # -> Calls Needed in the Window Before the Failure Rate Counts
+    CIRCUIT_WINDOW_SECONDS: float = 10.0
+    CIRCUIT_OPEN_SECONDS: float = 15.0 # -> How Long an Open Circuit Fails Fast Before Trial Calls
+    CIRCUIT_HALF_OPEN_CALLS: int = 3
+
+    # Last-Known-Good Configuration
+    LAST_KNOWN_GOOD_ENABLED: bool = True
+    LAST_KNOWN_GOOD_MAX_BYTES: int = 64 * 1024 * 1024 # -> Serialized Size of All Stored Responses, Least Recently Used Evicted First
+    LAST_KNOWN_GOOD_LATENCY_SECONDS: float = 2.0 # -> A Live Call Slower Than This is Cut Short When a Stored Copy Exists
 
     # CORS Configuration
     CORS_ORIGINS: list = ["*"]
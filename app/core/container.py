@@ -0,0 +1,104 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+from supabase import Client
+from app.core.database import SupabaseClient
+from app.services.auth_service import AuthService
+from app.services.booking_service import BookingService
+from app.services.dashboard_service import DashboardService
+from app.services.event_category_service import CategoryService
+from app.services.event_participant_service import EventParticipantService
+from app.services.event_service import EventService
+from app.services.image_variant_service import ImageVariantService
+from app.services.profile_service import ProfileService
+from app.services.storage_gc_service import StorageGcService
+from app.services.stripe_sync_service import StripeSyncService
+from app.utils.storage import StorageService
+
+
+class ServiceContainer:
+    """
+    Shared Clients and Services for the Application
+        - Built by the Lifespan, but Each Client and Service is Only Created on First Use
+        - One Anon Client and One Service-Role Client are Shared by Every Service
+        - Pass Clients In to Swap Them (e.g. Local Stand-Ins), Closed Again on Shutdown
+    """
+    def __init__(self, client: Optional[Client] = None, service_client: Optional[Client] = None):
+        self._instances: Dict[str, Any] = {}
+        # Re-Entrant -> A Service Factory Asks the Container for Its Own Dependencies
+        self._lock = threading.RLock()
+        if client is not None:
+            self._instances["client"] = client
+        if service_client is not None:
+            self._instances["service_client"] = service_client
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = factory()
+                    self._instances[name] = instance
+        return instance
+
+    # Clients
+    @property
+    def client(self) -> Client:
+        return self._get("client", SupabaseClient.get_client)
+
+    @property
+    def service_client(self) -> Client:
+        return self._get("service_client", SupabaseClient.get_service_client)
+
+    # Services
+    @property
+    def storage_service(self) -> StorageService:
+        return self._get("storage_service", lambda: StorageService(self.service_client))
+
+    @property
+    def auth_service(self) -> AuthService:
+        return self._get("auth_service", lambda: AuthService(self.client, self.service_client))
+
+    @property
+    def category_service(self) -> CategoryService:
+        return self._get("category_service", lambda: CategoryService(self.client))
+
+    @property
+    def event_participant_service(self) -> EventParticipantService:
+        return self._get("event_participant_service", lambda: EventParticipantService(self.client))
+
+    @property
+    def stripe_sync_service(self) -> StripeSyncService:
+        return self._get("stripe_sync_service", lambda: StripeSyncService(self.service_client))
+
+    @property
+    def storage_gc_service(self) -> StorageGcService:
+        return self._get("storage_gc_service", lambda: StorageGcService(self.service_client))
+
+    @property
+    def image_variant_service(self) -> ImageVariantService:
+        return self._get("image_variant_service", lambda: ImageVariantService(self.service_client, self.storage_service))
+
+    @property
+    def event_service(self) -> EventService:
+        return self._get("event_service", lambda: EventService(self.client, self.service_client, self.storage_service))
+
+    @property
+    def profile_service(self) -> ProfileService:
+        return self._get("profile_service", lambda: ProfileService(self.client, self.service_client, self.storage_service))
+
+    @property
+    def booking_service(self) -> BookingService:
+        return self._get("booking_service", lambda: BookingService(
+            self.client, self.service_client, self.event_participant_service, self.stripe_sync_service
+        ))
+
+    @property
+    def dashboard_service(self) -> DashboardService:
+        return self._get("dashboard_service", lambda: DashboardService(self.client, self.service_client))
+
+    def close(self):
+        # Injected Clients Belong to the Caller -> Only the Shared Default Clients are Closed
+        with self._lock:
+            SupabaseClient.close()
+            self._instances.clear()
@@ -1,35 +1,73 @@
+import logging
 from supabase import create_client, Client
 from app.core.config import settings
-from supabase.lib.client_options import ClientOptions
+from supabase.lib.client_options import SyncClientOptions
+from app.core.deadline import DeadlineTransport
+from app.core.instrumentation import InstrumentedTransport
+from app.core.resilience import ResilientTransport
 from typing import Optional
 import httpx
 
+logger = logging.getLogger(__name__)
+
 class SupabaseClient:
     _client: Optional[Client] = None
+    _service_client: Optional[Client] = None
+
+    @staticmethod
+    def _create(key: str) -> Client:
+        # One HTTP Pool per Client, Shared by PostgREST, Storage and Auth
+        # Wrapped So Every Call is Timed and Counted -> See app.core.instrumentation
+        # And So Calls Made for a Request Never Outlast Its Deadline -> See app.core.deadline
+        # Retries and Circuit Breakers Go Outermost, So Each Retry Gets a Fresh Deadline Check -> See app.core.resilience
+        transport = httpx.HTTPTransport(http2 = True)
+        if settings.METRICS_ENABLED or settings.TRACING_EXPORTER:
+            transport = InstrumentedTransport(transport)
+        if settings.DEADLINES_ENABLED:
+            transport = DeadlineTransport(transport)
+        if settings.RESILIENCE_ENABLED:
+            transport = ResilientTransport(transport)
+        http_client = httpx.Client(
+            transport = transport,
+            timeout = httpx.Timeout(60.0),
+            follow_redirects = True
+        )
+        return create_client(settings.SUPABASE_URL, key, SyncClientOptions(httpx_client = http_client))
 
     @classmethod
     def get_client(cls) -> Client:
         if cls._client is None:
-            cls._client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-            cls._client.postgrest.timeout = 60
-            try: 
-                cls._client.auth._http_client.timeout = httpx.Timeout(60.0)
-            except AttributeError:
-                pass
+            cls._client = cls._create(settings.SUPABASE_KEY)
         return cls._client
 
     @classmethod
     def get_service_client(cls) -> Client:
         """Get Supbase Client with Service Role Key for Admin Operations"""
         if settings.SUPABASE_SERVICE_ROLE_KEY:
-            client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
-            client.postgrest.timeout = 60 
-            try: 
-                client.auth._http_client.timeout = httpx.Timeout(60.0)
-            except AttributeError:
-                pass
-            return client  
+            # One Shared Client -> Every Service Reuses the Same Connection Pools
+            if cls._service_client is None:
+                cls._service_client = cls._create(settings.SUPABASE_SERVICE_ROLE_KEY)
+            return cls._service_client
         return cls.get_client()
 
-# Initialize Supabase Client
-supabase: Client = SupabaseClient.get_client()
\ No newline at end of file
+    @staticmethod
+    def close_client(client: Client):
+        # Close the HTTP Pools the Client Actually Opened -> Sub-Clients are Created on First Use
+        sessions = [
+            client.options.httpx_client,
+            getattr(client, "_postgrest", None) and client._postgrest.session,
+            getattr(client, "_storage", None) and client._storage.session,
+            getattr(getattr(client, "auth", None), "_http_client", None)
+        ]
+        for session in {id(s): s for s in sessions if s is not None}.values():
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning("Failed to Close Supabase Session: %s", e)
+
+    @classmethod
+    def close(cls):
+        for client in {id(c): c for c in (cls._client, cls._service_client) if c is not None}.values():
+            cls.close_client(client)
+        cls._client = None
+        cls._service_client = None
@@ -0,0 +1,156 @@
+"""
+Per-Request Deadlines
+    - DeadlineMiddleware Gives Each Request a Budget by Route -> Stored in a Context Variable, So It Follows the
+      Request Into the Threadpool and the io_executor Fan-Out
+    - Outbound Supabase and Stripe Calls Take the Remaining Budget as Their Timeout, and are Refused Outright Once
+      It is Spent -> A Chain of Calls Can't Outlive Its Request
+    - The Middleware Turns a Spent Budget Into a 504, Whatever the Route Did With the Error
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+import httpx
+from app.core.metrics import registry
+
+deadline_exceeded = registry.counter(
+    "eventora_deadline_exceeded_total",
+    "Requests That Ran Out of Their Time Budget -> where=before_call (Call Refused) | timeout (Call Cut Short)",
+    ("route", "where")
+)
+deadline_overrun = registry.histogram(
+    "eventora_deadline_overrun_seconds",
+    "How Far Past Its Budget a Request Finished",
+    ("route",)
+)
+
+# Route Template -> Budget in Seconds, the API Prefix is Added at Lookup Time, Other Routes Get DEADLINE_DEFAULT_SECONDS
+DEFAULT_BUDGETS = {
+    "POST /bookings/checkout": 15.0,
+    "POST /bookings/webhook": 20.0,
+    "GET /dashboard/organizer": 10.0,
+    "POST /events/": 20.0,
+    "PUT /events/{event_id}": 20.0,
+    "POST /events/upload-image": 45.0,
+    "POST /events/{event_id}/image/complete": 45.0,
+    "POST /profiles/upload-avatar": 45.0,
+    "POST /profiles/avatar/complete": 45.0,
+}
+
+
+def load_budgets(prefix: str, overrides: Dict[str, float]) -> Dict[str, float]:
+    """DEADLINE_BUDGETS={"GET /events/": 3} -> Overrides or Adds a Budget for a Route (Without the API Prefix)"""
+    budgets = {}
+    for route, seconds in {**DEFAULT_BUDGETS, **overrides}.items():
+        method, path = route.split(" ", 1)
+        budgets[f"{method} {prefix}{path}"] = float(seconds)
+    return budgets
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, message: str, during_call: bool = False):
+        super().__init__(message)
+        # True When an Upstream Call Was Cut Short, False When It Was Never Sent
+        self.during_call = during_call
+
+
+class Deadline:
+    """One Request's Budget -> Shared by Reference With Every Thread the Request Fans Out To"""
+    __slots__ = ("route", "budget", "expires", "exceeded")
+
+    def __init__(self, route: str, budget: float):
+        self.route = route
+        self.budget = budget
+        self.expires = time.monotonic() + budget
+        self.exceeded = False
+
+    def remaining(self) -> float:
+        return self.expires - time.monotonic()
+
+    def expire(self, where: str):
+        if not self.exceeded:
+            self.exceeded = True
+            deadline_exceeded.inc(self.route, where)
+
+    def check(self, operation: str) -> float:
+        # Remaining Seconds -> Raises Instead of Starting a Call That Can't Finish in Time
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.expire("before_call")
+            raise DeadlineExceeded(f"Deadline of {self.budget:g}s Exceeded Before {operation}")
+        return remaining
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default = None)
+
+
+class DeadlineTransport(httpx.BaseTransport):
+    """
+    httpx Transport Wrapper for the Supabase Clients
+        - Caps Every Phase Timeout (Connect, Read, Write, Pool) at the Remaining Budget via request.extensions["timeout"]
+        - Outside a Request (Workers, Warm-Up) Calls Keep the Client's Own Timeout
+    """
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        deadline = current_deadline.get()
+        if deadline is None:
+            return self._transport.handle_request(request)
+        remaining = deadline.check(f"{request.method} {request.url.path}")
+        timeouts = request.extensions.get("timeout") or {}
+        request.extensions["timeout"] = {
+            phase: remaining if timeouts.get(phase) is None else min(timeouts[phase], remaining)
+            for phase in ("connect", "read", "write", "pool")
+        }
+        try:
+            return self._transport.handle_request(request)
+        except httpx.TimeoutException:
+            if deadline.remaining() <= 0:
+                deadline.expire("timeout")
+                raise DeadlineExceeded(
+                    f"Deadline of {deadline.budget:g}s Exceeded During {request.method} {request.url.path}", during_call = True
+                )
+            raise
+
+    def close(self):
+        self._transport.close()
+
+
+def stripe_session():
+    """requests Session for the Stripe SDK's RequestsClient -> Each Call's Timeout is Capped at the Remaining Budget"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class DeadlineSession(requests.Session):
+        def request(self, method, url, *args, timeout = None, **kwargs):
+            deadline = current_deadline.get()
+            if deadline is not None:
+                remaining = deadline.check(f"stripe {method.upper()}")
+                if timeout is None:
+                    timeout = remaining
+                elif isinstance(timeout, tuple):
+                    timeout = tuple(remaining if part is None else min(part, remaining) for part in timeout)
+                else:
+                    timeout = min(timeout, remaining)
+            try:
+                return super().request(method, url, *args, timeout = timeout, **kwargs)
+            except requests.Timeout:
+                if deadline is not None and deadline.remaining() <= 0:
+                    deadline.expire("timeout")
+                raise
+
+    session = DeadlineSession()
+    # Shared by Every Thread -> Pool Sized for the Request Threadpool Plus the Fan-Out
+    adapter = HTTPAdapter(pool_connections = 4, pool_maxsize = 64)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def install_stripe_deadlines():
+    # Only When No Client is Configured Yet -> A Custom stripe.default_http_client is Left Alone
+    import stripe
+    if stripe.default_http_client is None:
+        stripe.default_http_client = stripe.RequestsClient(
+            session = stripe_session(), verify_ssl_certs = stripe.verify_ssl_certs, proxy = stripe.proxy
+        )
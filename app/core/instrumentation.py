@@ -0,0 +1,221 @@
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from app.core.metrics import SIZE_BUCKETS, registry
+from app.core.tracing import span
+
+LABELS = ("client", "caller", "target", "operation")
+
+external_duration = registry.histogram(
+    "eventora_external_request_duration_seconds",
+    "Latency of Calls to PostgREST, Storage, Auth and Stripe",
+    LABELS
+)
+external_errors = registry.counter(
+    "eventora_external_request_errors_total",
+    "Failed Calls to PostgREST, Storage, Auth and Stripe (HTTP Status >= 400 or Transport Error)",
+    LABELS + ("reason",)
+)
+external_payload = registry.histogram(
+    "eventora_external_payload_bytes",
+    "Request and Response Body Sizes of External Calls",
+    LABELS + ("direction",),
+    SIZE_BUCKETS
+)
+
+# External Calls Made While Handling the Current Request -> (Client, Target, Operation, Seconds)
+# Set by ServerTimingMiddleware, None Outside a Request (Background Workers, Warm-Up)
+request_calls: ContextVar[Optional[List[Tuple[str, str, str, float]]]] = ContextVar("request_calls", default = None)
+
+
+def record(client: str, caller: str, target: str, operation: str, seconds: float,
+           error: Optional[str] = None, sent: int = 0, received: int = 0):
+    labels = (client, caller, target, operation)
+    external_duration.observe(*labels, value = seconds)
+    external_payload.observe(*labels, "request", value = sent)
+    external_payload.observe(*labels, "response", value = received)
+    if error is not None:
+        external_errors.inc(*labels, error)
+    calls = request_calls.get()
+    if calls is not None:
+        calls.append((client, target, operation, seconds))
+
+
+# Caller Label -> The Innermost App Function on the Stack (e.g. EventService.list_events)
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+# The Transport and Client Wrappers Themselves -> Never the Caller, Whatever Order They are Stacked In
+_WRAPPERS = {os.path.join(_APP_ROOT, "core", name) for name in ("instrumentation.py", "deadline.py", "resilience.py")}
+_caller_labels: Dict[Any, Optional[str]] = {}
+
+def current_caller() -> str:
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        label = _caller_labels.get(code, "")
+        if label == "":
+            inside = code.co_filename.startswith(_APP_ROOT) and code.co_filename not in _WRAPPERS
+            # Lambdas and Closures Submitted to io_executor Report the Method That Defined Them
+            label = code.co_qualname.split(".<locals>")[0] if inside else None
+            _caller_labels[code] = label
+        if label:
+            return label
+        frame = frame.f_back
+    return "-"
+
+
+# Path Segments That are Identifiers, Not Resource Names -> Folded Away to Keep Label Cardinality Bounded
+_ID_SEGMENT = re.compile(r".*(\d|[A-Z]).*|[0-9a-f-]{32,36}")
+
+def _resource(segments: List[str]) -> str:
+    return "/".join(segment for segment in segments if not _ID_SEGMENT.fullmatch(segment)) or "-"
+
+
+_STORAGE_ACTIONS = {"list", "move", "copy", "sign", "upload", "info", "public", "authenticated"}
+_STORAGE_METHODS = {"GET": "download", "HEAD": "exists", "POST": "upload", "PUT": "update", "DELETE": "remove"}
+_POSTGREST_METHODS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "PUT": "upsert", "DELETE": "delete"}
+
+def classify_supabase(request: httpx.Request) -> Tuple[str, str, str]:
+    """Map a Supabase URL to (Client, Target, Operation) -> (postgrest, event, select), (storage, avatars, upload), ..."""
+    segments = [segment for segment in request.url.path.split("/") if segment]
+    method = request.method
+    if len(segments) >= 2 and segments[0] == "rest":
+        rest = segments[2:]
+        if rest[:1] == ["rpc"]:
+            return "postgrest", rest[1] if len(rest) > 1 else "-", "rpc"
+        operation = _POSTGREST_METHODS.get(method, method.lower())
+        if method == "POST" and "resolution=" in request.headers.get("prefer", ""):
+            operation = "upsert"
+        return "postgrest", rest[0] if rest else "-", operation
+    if len(segments) >= 2 and segments[0] == "storage":
+        rest = segments[2:]
+        if rest[:1] == ["object"]:
+            rest = rest[1:]
+            if rest and rest[0] in _STORAGE_ACTIONS:
+                action = rest[0]
+                # upload/sign -> Signed Upload URL, Not an Upload
+                if action == "upload" and rest[1:2] == ["sign"]:
+                    return "storage", rest[2] if len(rest) > 2 else "-", "sign_upload"
+                return "storage", rest[1] if len(rest) > 1 else "-", action
+            return "storage", rest[0] if rest else "-", _STORAGE_METHODS.get(method, method.lower())
+        return "storage", _resource(rest), method.lower()
+    if len(segments) >= 2 and segments[0] == "auth":
+        return "auth", _resource(segments[2:]), method.lower()
+    return "http", request.url.host or "-", method.lower()
+
+
+class _RecordedStream(httpx.SyncByteStream):
+    """Response Body Passed Through Chunk by Chunk as the Caller Reads It -> on_close(Bytes Received) Runs Once, When Closed"""
+    def __init__(self, stream: httpx.SyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._received = 0
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._received += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close(self._received)
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """
+    httpx Transport Wrapper Shared by the Supabase Sub-Clients (PostgREST, Storage, Auth)
+        - Times Each Call Until Its Body is Closed, Then Records It Under Its (Caller, Target, Operation)
+        - The Body is Never Read Here -> Streamed Downloads (client.stream) Keep Their Bounded Memory
+    """
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        client, target, operation = classify_supabase(request)
+        caller = current_caller()
+        sent = int(request.headers.get("content-length", 0))
+        # Ended by Hand -> The Span Outlives This Call Until the Caller Closes the Body
+        call_span = span(f"{client} {operation} {target}", caller = caller, method = request.method, bytes_sent = sent)
+        if call_span.traceparent:
+            request.headers["traceparent"] = call_span.traceparent
+        started = time.perf_counter()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as e:
+            record(client, caller, target, operation, time.perf_counter() - started, error = type(e).__name__, sent = sent)
+            call_span.end(f"{type(e).__name__}: {e}"[:200])
+            raise
+        error = str(response.status_code) if response.status_code >= 400 else None
+        call_span.set_attribute("status_code", response.status_code)
+
+        def on_close(received: int):
+            record(client, caller, target, operation, time.perf_counter() - started, error = error, sent = sent, received = received)
+            call_span.set_attribute("bytes_received", received)
+            call_span.end()
+
+        response.stream = _RecordedStream(response.stream, on_close)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+def classify_stripe(method: str, url: str) -> Tuple[str, str]:
+    """Map a Stripe API Call to (Resource, Operation) -> (checkout/sessions, create), (prices, retrieve), ..."""
+    segments = [segment for segment in httpx.URL(url).path.split("/") if segment][1:]
+    resource = _resource(segments)
+    has_id = bool(segments) and _ID_SEGMENT.fullmatch(segments[-1]) is not None
+    method = method.lower()
+    if method == "get":
+        return resource, "retrieve" if has_id else "list"
+    if method == "post":
+        return resource, "update" if has_id else "create"
+    return resource, method
+
+
+class InstrumentedStripeClient:
+    """
+    Wraps the Stripe SDK's HTTP Client -> Every stripe.* Call Goes Through request_with_retries
+        - Retries are Included in the Timing, Which is the Latency the Caller Actually Sees
+    """
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    def request_with_retries(self, method, url, headers, post_data = None, max_network_retries = None, *, _usage = None):
+        target, operation = classify_stripe(method, url)
+        caller = current_caller()
+        sent = len(post_data or "")
+        with span(f"stripe {operation} {target}", caller = caller, method = method.upper(), bytes_sent = sent) as call_span:
+            started = time.perf_counter()
+            try:
+                content, status_code, response_headers = self._client.request_with_retries(
+                    method, url, headers, post_data, max_network_retries, _usage = _usage
+                )
+            except Exception as e:
+                record("stripe", caller, target, operation, time.perf_counter() - started, error = type(e).__name__, sent = sent)
+                raise
+            error = str(status_code) if status_code >= 400 else None
+            record("stripe", caller, target, operation, time.perf_counter() - started,
+                   error = error, sent = sent, received = len(content or ""))
+            call_span.set_attribute("status_code", status_code)
+        return content, status_code, response_headers
+
+
+def instrument_stripe():
+    import stripe
+    if isinstance(stripe.default_http_client, InstrumentedStripeClient):
+        return
+    client = stripe.default_http_client or stripe.new_default_http_client(
+        verify_ssl_certs = stripe.verify_ssl_certs, proxy = stripe.proxy
+    )
+    stripe.default_http_client = InstrumentedStripeClient(client)
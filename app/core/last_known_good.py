@@ -0,0 +1,167 @@
+"""
+Last-Known-Good Responses for Public Browsing
+    - The Latest Successful Result of Each Decorated Call is Kept per Arguments, Serialized With orjson -> The Store is
+      Bounded by Those Bytes (LAST_KNOWN_GOOD_MAX_BYTES) and Evicts the Least Recently Used Entries First
+    - When the Live Call Fails (5xx, Open Circuit, Connection Error) or Runs Past LAST_KNOWN_GOOD_LATENCY_SECONDS, the
+      Stored Copy is Returned Instead and LastKnownGoodMiddleware Marks the Response With X-Last-Known-Good and Age
+    - 4xx Errors are Answers, Not Outages -> A Deleted Event Stays Deleted
+    - The Latency Budget Only Applies When There is a Copy to Fall Back To, and is Enforced by the Deadline Transport
+      (DEADLINES_ENABLED) -> The Slow Call is Cut Short Instead of Left Running
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional, Tuple
+import orjson
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.deadline import Deadline, current_deadline
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+served = registry.counter(
+    "eventora_last_known_good_served_total",
+    "Responses Served From the Last-Known-Good Store -> reason=error (Live Call Failed) | slow (Over Its Latency Budget)",
+    ("name", "reason")
+)
+evictions = registry.counter(
+    "eventora_last_known_good_evictions_total",
+    "Entries Dropped From the Last-Known-Good Store to Stay Under LAST_KNOWN_GOOD_MAX_BYTES",
+    ()
+)
+
+# A Key Refreshed This Recently Isn't Re-Serialized -> Hot Pages Cost One Dict Lookup per Hit
+_REFRESH_SECONDS = 1.0
+
+
+class LastKnownGoodStore:
+    """LRU of Key -> (Stored At, orjson Bytes), Bounded by the Sum of the Bytes -> Shared by Every Worker Thread"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def fresh(self, key: Hashable, now: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and now - entry[0] < _REFRESH_SECONDS
+
+    def put(self, key: Hashable, body: bytes, now: float):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[1])
+            self._entries[key] = (now, body)
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last = False)
+                self.bytes -= len(dropped)
+                evictions.inc()
+
+
+store = LastKnownGoodStore(settings.LAST_KNOWN_GOOD_MAX_BYTES)
+
+registry.gauge(
+    "eventora_last_known_good_bytes",
+    "Serialized Size of Everything in the Last-Known-Good Store",
+    (),
+    callback = lambda: [((), store.bytes)]
+)
+registry.gauge(
+    "eventora_last_known_good_entries",
+    "Responses Held in the Last-Known-Good Store",
+    (),
+    callback = lambda: [((), len(store))]
+)
+
+
+class Staleness:
+    """Set by LastKnownGoodMiddleware per Request, Filled In When a Stored Copy was Served -> Read Back for the Headers"""
+    __slots__ = ("reason", "age")
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self.age = 0.0
+
+
+current_staleness: ContextVar[Optional[Staleness]] = ContextVar("current_staleness", default = None)
+
+
+class LatencyBudget(Deadline):
+    """Deadline Scoped to One Call -> Running Out is the Cue to Fall Back, Not a Request Failure, So It Isn't Counted"""
+    __slots__ = ()
+
+    def expire(self, where: str):
+        self.exceeded = True
+
+
+def _is_outage(error: Exception) -> bool:
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500
+    return True
+
+
+def last_known_good(name: Optional[str] = None) -> Callable:
+    """Decorator for Read-Only Service Methods -> Keyed by the Arguments After self, the Result Must be JSON-Serializable"""
+    def decorator(fn: Callable) -> Callable:
+        key_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(service, *args, **kwargs):
+            if not settings.LAST_KNOWN_GOOD_ENABLED:
+                return fn(service, *args, **kwargs)
+            key = (key_name, args, tuple(sorted(kwargs.items())))
+            stored = store.get(key)
+            deadline = current_deadline.get()
+            token = None
+            if stored is not None and settings.DEADLINES_ENABLED:
+                seconds = settings.LAST_KNOWN_GOOD_LATENCY_SECONDS
+                # Only When It is Tighter Than What the Request Has Left
+                if deadline is None or deadline.remaining() > seconds:
+                    deadline = LatencyBudget(deadline.route if deadline else key_name, seconds)
+                    token = current_deadline.set(deadline)
+            try:
+                result = fn(service, *args, **kwargs)
+            except Exception as e:
+                if stored is None or not _is_outage(e):
+                    raise
+                reason = "slow" if deadline is not None and deadline.exceeded else "error"
+                return _serve_stale(key_name, stored, reason, e)
+            finally:
+                if token is not None:
+                    current_deadline.reset(token)
+            now = time.monotonic()
+            if not store.fresh(key, now):
+                store.put(key, orjson.dumps(result), now)
+            return result
+        return wrapper
+    return decorator
+
+
+def _serve_stale(name: str, stored: Tuple[float, bytes], reason: str, error: Exception) -> Any:
+    stored_at, body = stored
+    age = time.monotonic() - stored_at
+    served.inc(name, reason)
+    logger.warning("Serving Last-Known-Good Response", extra = {"source": name, "reason": reason, "age": round(age, 1), "error": str(error)})
+    staleness = current_staleness.get()
+    if staleness is not None:
+        staleness.reason = reason
+        staleness.age = age
+    return orjson.loads(body)
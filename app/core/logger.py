@@ -0,0 +1,145 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.tracing import NOOP_SPAN, current_span
+
+# Set by RequestIdMiddleware -> Every Log Line Written While Handling a Request Carries It
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default = None)
+
+# LogRecord Attributes That are Not Caller-Supplied extra= Fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "trace_id", "suppressed"}
+
+
+class ContextFilter(logging.Filter):
+    """Stamp the Request ID and Trace ID on the Record in the Logging Thread -> Before It Crosses the Queue"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        span = current_span()
+        record.trace_id = span.trace.trace_id if span is not NOOP_SPAN else None
+        return True
+
+
+class ErrorRateLimitFilter(logging.Filter):
+    """
+    Let Through at Most `limit` Warnings / Errors per Message Template per Window
+        - A Failing Dependency Produces One Error per Request -> Without This the Log Becomes the Bottleneck
+        - The Next Record Let Through Reports How Many Were Suppressed
+    """
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.limit <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or now - bucket[0] >= self.window:
+                suppressed = bucket[2] if bucket else 0
+                bucket = self._buckets[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if bucket[1] >= self.limit:
+                bucket[2] += 1
+                return False
+            bucket[1] += 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    # One JSON Object per Line -> Fields Passed With extra= Become Top-Level Keys
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec = "milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "trace_id", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default = str)
+
+
+class TextFormatter(logging.Formatter):
+    # Human-Readable Lines for Local Development -> extra= Fields Appended as key=value
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = {key: value for key, value in record.__dict__.items() if key not in _RESERVED and not key.startswith("_")}
+        for key in ("request_id", "suppressed"):
+            if getattr(record, key, None) is not None:
+                fields[key] = getattr(record, key)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # The Stock prepare() Runs the Full Formatter on the Calling Thread -> Only Resolve the Message Here,
+    # JSON Encoding and the Write Happen on the Listener Thread
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks Hold Frames -> Render Now, the Frames May be Gone by the Time the Listener Runs
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging():
+    """
+    Route the app.* Loggers Through a Queue -> Request Threads Only Enqueue, a Listener Thread Writes
+        - Idempotent, Called From the Lifespan
+    """
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(ErrorRateLimitFilter(settings.LOG_RATE_LIMIT, settings.LOG_RATE_LIMIT_WINDOW_SECONDS))
+
+    logger = logging.getLogger("app")
+    logger.handlers = [handler]
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level = True)
+    _listener.start()
+
+
+def shutdown_logging():
+    # Flushes Whatever is Still Queued
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
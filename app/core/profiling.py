@@ -0,0 +1,320 @@
+"""
+On-Demand Request Profiling
+    - A Sampler Thread Snapshots the Stacks of the Threads Working on a Profiled Request (sys._current_frames)
+      -> Statistical Wall-Clock Profile, Each Sample Also Marked On-CPU When the Thread's CPU Clock Moved
+    - Each Thread Working for a Profiled Request Registers an Anchor Frame -> Only the Frames Below It are Kept
+        Event Loop -> The Middleware's Own Frame, So Samples Count Only While the Request's Coroutine Chain is Running
+        Threadpool -> The bind_thread Wrapper Around Sync Endpoints and io_executor Jobs (Installed by install())
+    - Only Imported When PROFILING_ENABLED is Set -> The Sampler Thread Starts on the First Profile and Parks When Idle
+    - Finished Profiles are Kept in a Bounded In-Memory Store -> Downloaded From /admin/profiles
+"""
+import functools
+import hmac
+import inspect
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from app.core.concurrency import io_executor
+from app.core.config import settings
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default = None)
+
+# Per-Thread CPU Clocks -> Linux / macOS Only, Elsewhere Samples are Wall-Clock Only
+_thread_cpu_clock = getattr(time, "pthread_getcpuclockid", None)
+
+_roots = tuple(os.path.abspath(path) + os.sep for path in sorted(set(sys.path), key = len, reverse = True) if path)
+_labels: Dict[Any, str] = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for root in _roots:
+            if filename.startswith(root):
+                filename = filename[len(root):]
+                break
+        label = _labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+class RequestProfile:
+    """
+    Samples Collected for One Request
+        - stacks -> (Thread, Root Frame, ..., Leaf Frame) -> [Samples, Wall Seconds, CPU Seconds]
+    """
+    def __init__(self, method: str, path: str, trigger: str, anchor, loop_thread: int):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.trigger = trigger
+        self.anchor = anchor
+        self.loop_thread = loop_thread
+        self.stacks: Dict[Tuple[str, ...], List[float]] = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.duration = 0.0
+
+    def add(self, stack: Tuple[str, ...], wall: float, cpu: float):
+        entry = self.stacks.get(stack)
+        if entry is None:
+            entry = self.stacks[stack] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += wall
+        entry[2] += cpu
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": sum(int(entry[0]) for entry in self.stacks.values()),
+            "sampled_wall_ms": round(sum(entry[1] for entry in self.stacks.values()) * 1000, 3),
+            "sampled_cpu_ms": round(sum(entry[2] for entry in self.stacks.values()) * 1000, 3),
+        }
+
+    def functions(self, limit: int = 50) -> List[Dict[str, Any]]:
+        # Self Time -> Leaf Frame Only, Total Time -> Anywhere on the Stack (Counted Once per Sample)
+        own: Dict[str, List[float]] = {}
+        total: Dict[str, List[float]] = {}
+        for stack, (samples, wall, cpu) in self.stacks.items():
+            frames = stack[1:]
+            if not frames:
+                continue
+            for name in set(frames):
+                entry = total.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += samples
+                entry[1] += wall
+                entry[2] += cpu
+            entry = own.setdefault(frames[-1], [0, 0.0, 0.0])
+            entry[0] += samples
+            entry[1] += wall
+            entry[2] += cpu
+        ranked = sorted(total.items(), key = lambda item: item[1][1], reverse = True)[:limit]
+        return [
+            {
+                "function": name,
+                "total_samples": int(values[0]),
+                "total_wall_ms": round(values[1] * 1000, 3),
+                "total_cpu_ms": round(values[2] * 1000, 3),
+                "self_samples": int(own.get(name, (0,))[0]),
+                "self_wall_ms": round(own.get(name, (0, 0.0))[1] * 1000, 3),
+                "self_cpu_ms": round(own.get(name, (0, 0.0, 0.0))[2] * 1000, 3),
+            }
+            for name, values in ranked
+        ]
+
+    def folded(self, cpu: bool = False) -> str:
+        # Collapsed Stacks (flamegraph.pl, speedscope) -> Weighted by Wall or CPU Microseconds
+        index = 2 if cpu else 1
+        lines = [
+            f"{';'.join(part.replace(';', ':') for part in stack)} {round(entry[index] * 1_000_000)}"
+            for stack, entry in self.stacks.items() if entry[index] > 0
+        ]
+        return "\n".join(sorted(lines)) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary(), "interval_ms": settings.PROFILING_INTERVAL_MS, "functions": self.functions()}
+
+
+class _Sampler:
+    """
+    One Daemon Thread Shared by Every Profiled Request
+        - Started on the First Profile, Parked on an Event While Nothing is Being Profiled
+        - Each Tick Reads Every Thread's Current Frame Once and Hands Each Stack to the Profile It Belongs To
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: Dict[str, RequestProfile] = {}
+        self._anchors: Dict[int, Dict[Any, RequestProfile]] = {} # -> Thread ID -> {Anchor Frame: Profile}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cpu: Dict[int, float] = {}
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            self._anchors.setdefault(profile.loop_thread, {})[profile.anchor] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = "profiler", daemon = True)
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.pop(profile.id, None)
+        self.unbind(profile.loop_thread, profile.anchor)
+
+    def bind(self, thread_id: int, anchor, profile: RequestProfile):
+        with self._lock:
+            self._anchors.setdefault(thread_id, {})[anchor] = profile
+
+    def unbind(self, thread_id: int, anchor):
+        with self._lock:
+            anchors = self._anchors.get(thread_id)
+            if anchors is not None:
+                anchors.pop(anchor, None)
+                if not anchors:
+                    del self._anchors[thread_id]
+
+    def active(self) -> int:
+        return len(self._profiles)
+
+    def _run(self):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while True:
+            with self._lock:
+                idle = not self._profiles
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._cpu.clear()
+                self._wake.wait()
+                last = time.perf_counter()
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            with self._lock:
+                active = set(self._profiles)
+                anchors = {thread_id: dict(frames) for thread_id, frames in self._anchors.items()}
+            if active:
+                self._sample(active, anchors, elapsed, own)
+
+    def _cpu_delta(self, thread_id: int) -> Optional[float]:
+        if _thread_cpu_clock is None:
+            return None
+        try:
+            now = time.clock_gettime(_thread_cpu_clock(thread_id))
+        except (OSError, OverflowError):
+            return None
+        previous = self._cpu.get(thread_id)
+        self._cpu[thread_id] = now
+        return None if previous is None else now - previous
+
+    def _sample(self, active, anchors: Dict[int, Dict[Any, RequestProfile]], elapsed: float, own: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            # CPU Clocks are Read for Every Thread -> A Thread Bound Later Starts From a Fresh Baseline
+            cpu = self._cpu_delta(thread_id)
+            thread_anchors = anchors.get(thread_id)
+            if not thread_anchors:
+                continue
+            # On-CPU When the Thread's CPU Clock Advanced by Most of the Interval
+            cpu = min(cpu, elapsed) if cpu is not None and cpu >= elapsed / 2 else 0.0
+            frames = []
+            owner: Optional[RequestProfile] = None
+            # Walk Up From the Leaf Until an Anchor -> Frames Above It Belong to the Server, Not the Request
+            while frame is not None:
+                owner = thread_anchors.get(frame)
+                if owner is not None:
+                    break
+                frames.append(_label(frame.f_code))
+                frame = frame.f_back
+            if owner is not None and owner.id in active and frames:
+                frames.reverse()
+                owner.add((names.get(thread_id, str(thread_id)), *frames), elapsed, cpu)
+
+
+class ProfileStore:
+    """Most Recent Finished Profiles -> Oldest Evicted Beyond max_items"""
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._items[profile.id] = profile
+            while len(self._items) > self.max_items:
+                self._items.popitem(last = False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._items.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._items.values())
+        return [profile.summary() for profile in reversed(items)]
+
+
+sampler = _Sampler(settings.PROFILING_INTERVAL_MS / 1000)
+profiles = ProfileStore(settings.PROFILING_MAX_ARTIFACTS)
+
+
+def start_profile(method: str, path: str, trigger: str, anchor) -> Tuple[RequestProfile, Any]:
+    """Begin Sampling the Calling Request -> anchor is the Caller's Frame on the Event Loop"""
+    profile = RequestProfile(method, path, trigger, anchor, threading.get_ident())
+    token = _active_profile.set(profile)
+    sampler.add(profile)
+    return profile, token
+
+
+def finish_profile(profile: RequestProfile, token):
+    sampler.remove(profile)
+    _active_profile.reset(token)
+    profile.finish()
+    profile.anchor = None
+    profiles.add(profile)
+
+
+def bind_thread(fn: Callable) -> Callable:
+    """Wrap a Sync Callable -> While It Runs for a Profiled Request, Its Thread is Sampled Into That Profile"""
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return fn(*args, **kwargs)
+        thread_id, anchor = threading.get_ident(), sys._getframe()
+        sampler.bind(thread_id, anchor, profile)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.unbind(thread_id, anchor)
+    return bound
+
+
+def install(*routers: APIRouter):
+    """
+    Follow Profiled Requests Into Worker Threads
+        - Sync Endpoints -> Wrapped Before the Routers are Included, So the App's Routes are Built From the Wrapper
+        - io_executor Jobs -> Wrapped When Submitted, Inside the Submitter's Context
+    """
+    for router in routers:
+        for route in router.routes:
+            if isinstance(route, APIRoute) and not inspect.iscoroutinefunction(route.endpoint):
+                route.endpoint = bind_thread(route.endpoint)
+    io_executor.wrap_job = bind_thread
+
+
+def is_admin(headers: Headers) -> bool:
+    # Constant-Time Compare -> No Token Configured Means No Admin Access at All
+    token = settings.PROFILING_ADMIN_TOKEN
+    supplied = headers.get("x-profile-token")
+    return bool(token and supplied and hmac.compare_digest(supplied.encode(), token.encode()))
+
+
+def active_profiles() -> int:
+    return sampler.active()
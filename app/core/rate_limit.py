@@ -0,0 +1,238 @@
+"""
+Token-Bucket Rate Limiting
+    - Each Policy Allows `limit` Requests per `window` Seconds, Refilled Continuously, Bursting up to `burst`
+    - Buckets are Keyed per Client IP or per Authenticated User, Depending on the Policy
+    - memory Backend -> Per-Process Dict, a Decision is a Few Float Operations
+    - redis Backend -> One Atomic Lua Script per Decision, Shared by Every Worker, Fails Open When Redis is Unreachable
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import orjson
+from app.core.config import settings
+from app.core.metrics import registry
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+rate_limited = registry.counter(
+    "eventora_rate_limited_total",
+    "Requests Rejected With 429 by a Rate-Limit Policy",
+    ("policy",)
+)
+rate_limit_errors = registry.counter(
+    "eventora_rate_limit_backend_errors_total",
+    "Rate-Limit Decisions That Failed Open Because the Backend Errored",
+    ("backend",)
+)
+
+
+@dataclass(frozen = True)
+class RateLimitPolicy:
+    name: str
+    limit: int
+    window: float
+    key: str = "ip" # -> ip | user (Falls Back to ip Without a Verifiable Bearer Token)
+    burst: Optional[int] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.window
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    reset_after: float # -> Seconds Until the Bucket is Full Again
+    retry_after: float # -> Seconds Until the Next Token, 0 When Allowed
+
+
+# Route Template -> Policy, the API Prefix is Added at Lookup Time
+DEFAULT_POLICIES = {
+    "POST /auth/login": RateLimitPolicy("login", 10, 60),
+    "POST /auth/register": RateLimitPolicy("register", 5, 600),
+    "POST /auth/forgot-password": RateLimitPolicy("forgot_password", 5, 900),
+    "POST /bookings/checkout": RateLimitPolicy("checkout", 10, 60, key = "user", burst = 5),
+    "POST /events/upload-image": RateLimitPolicy("upload_image", 20, 600),
+}
+
+
+def load_policies(prefix: str, overrides: Dict[str, str]) -> Dict[str, RateLimitPolicy]:
+    """RATE_LIMIT_POLICIES={"login": "20/60"} -> Replaces limit/window of the Named Policy, "0/60" Disables It"""
+    policies = {}
+    for route, policy in DEFAULT_POLICIES.items():
+        override = overrides.get(policy.name)
+        if override:
+            limit, _, window = override.partition("/")
+            policy = RateLimitPolicy(policy.name, int(limit), float(window or policy.window), policy.key, policy.burst)
+        if policy.limit > 0:
+            method, path = route.split(" ", 1)
+            policies[f"{method} {prefix}{path}"] = policy
+    return policies
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def token_subject(token: str) -> Optional[str]:
+    """
+    User ID of a Bearer Token Whose Signature Checks Out Against JWT_SECRET_KEY
+        - A Forged sub Can't Drain Someone Else's Bucket -> Unverifiable Tokens are Keyed by IP Instead
+        - Expiry is Not Checked Here, the Route Still Authenticates the Token
+    """
+    secret = settings.JWT_SECRET_KEY
+    digest = _DIGESTS.get(settings.JWT_ALGORITHM)
+    if not secret or digest is None:
+        return None
+    signing_input, _, signature = token.rpartition(".")
+    try:
+        expected = hmac.new(secret.encode(), signing_input.encode(), digest).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        subject = orjson.loads(_b64decode(signing_input.partition(".")[2])).get("sub")
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return subject if isinstance(subject, str) else None
+
+
+class RateLimitBackend:
+    name = ""
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Decision:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Buckets in a Dict -> [Tokens, Last Refill, Capacity, Refill Rate] (the Last Two Let Eviction Skip the Policy Lookup)
+        - Only Touched From the Event Loop, So No Lock
+        - Past max_keys, Buckets That Have Refilled Completely are Dropped (Same as Never Seen), Then the Oldest
+    """
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[float]] = {}
+
+    def take(self, key: str, policy: RateLimitPolicy, now: float) -> Decision:
+        capacity, rate = policy.capacity, policy.rate
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict(now)
+            bucket = self._buckets[key] = [capacity, now, capacity, rate]
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return Decision(True, int(bucket[0]), (capacity - bucket[0]) / rate, 0.0)
+        return Decision(False, 0, (capacity - bucket[0]) / rate, (1 - bucket[0]) / rate)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Decision:
+        return self.take(key, policy, time.monotonic())
+
+    def _evict(self, now: float):
+        full = [key for key, (tokens, updated, capacity, rate) in self._buckets.items() if tokens + (now - updated) * rate >= capacity]
+        for key in full:
+            del self._buckets[key]
+        excess = len(self._buckets) - self.max_keys + max(1, self.max_keys // 10)
+        if excess > 0:
+            for key in list(self._buckets)[:excess]:
+                del self._buckets[key]
+
+
+# KEYS[1] = Bucket, ARGV = Capacity, Refill Rate per Second -> {Allowed, Tokens Left}
+# Redis' Own Clock -> Every Worker Agrees on Elapsed Time
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Buckets Shared by Every Worker in Redis
+        - Needs the Optional redis Package (pip install redis)
+        - A Redis Error or Timeout Allows the Request -> An Outage Never Takes the API Down With It
+    """
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "ratelimit:", timeout: float = 0.05):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis Needs the redis Package")
+        self.prefix = prefix
+        self._client = redis_asyncio.Redis.from_url(url, socket_timeout = timeout, socket_connect_timeout = timeout)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Decision:
+        capacity, rate = policy.capacity, policy.rate
+        try:
+            allowed, tokens = await self._script(keys = [self.prefix + key], args = [capacity, rate])
+        except Exception as e:
+            rate_limit_errors.inc(self.name)
+            logger.warning("Rate Limit Backend Error: %s", e)
+            return Decision(True, capacity, 0.0, 0.0)
+        tokens = float(tokens)
+        if allowed:
+            return Decision(True, int(tokens), (capacity - tokens) / rate, 0.0)
+        return Decision(False, 0, (capacity - tokens) / rate, (1 - tokens) / rate)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_backend(name: str) -> RateLimitBackend:
+    if name == "memory":
+        return MemoryBackend(settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+    if name == "redis":
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND {name!r} -> memory | redis")
+
+
+def headers(policy: RateLimitPolicy, decision: Decision) -> Dict[str, str]:
+    # IETF RateLimit Header Fields (draft-ietf-httpapi-ratelimit-headers) -> Plus Retry-After on 429
+    values = {
+        "RateLimit-Limit": str(policy.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        "RateLimit-Policy": f"{policy.limit};w={int(policy.window)};burst={policy.capacity}",
+    }
+    if not decision.allowed:
+        values["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return values
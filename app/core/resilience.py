@@ -0,0 +1,279 @@
+"""
+Retries and Circuit Breakers for PostgREST, Storage, Auth and Stripe
+    - Idempotent Reads (PostgREST select / count, Storage download / info / list, Auth user) are Retried on
+      Connection Errors and 502 / 503 / 504 With Full-Jitter Exponential Backoff, Never Past the Request's Deadline
+    - One Breaker per Dependency -> Opens When the Failure Rate Over CIRCUIT_WINDOW_SECONDS Crosses CIRCUIT_FAILURE_RATE,
+      Rejects Calls for CIRCUIT_OPEN_SECONDS, Then Lets a Few Trial Calls Decide Whether to Close Again
+    - Writes are Never Retried Here -> Stripe Writes Already Retry Inside the SDK Under an Idempotency Key
+"""
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+import httpx
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, current_deadline
+from app.core.instrumentation import classify_stripe, classify_supabase
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# (Client, Operation) Pairs Safe to Send Twice
+IDEMPOTENT = {
+    ("postgrest", "select"), ("postgrest", "count"),
+    ("storage", "download"), ("storage", "exists"), ("storage", "info"), ("storage", "list"), ("storage", "public"), ("storage", "sign"),
+    ("auth", "get"),
+}
+RETRY_STATUSES = {502, 503, 504}
+
+retries = registry.counter(
+    "eventora_external_retries_total",
+    "Retried Calls to PostgREST, Storage, Auth and Stripe",
+    ("client", "reason")
+)
+circuit_rejected = registry.counter(
+    "eventora_circuit_rejected_total",
+    "Calls Refused Without Being Sent Because the Dependency's Circuit Was Open",
+    ("client",)
+)
+circuit_transitions = registry.counter(
+    "eventora_circuit_transitions_total",
+    "Circuit Breaker State Changes",
+    ("client", "state")
+)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} Circuit Open, Retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-Rate Breaker Over a Sliding Window of One-Second Buckets
+        - Only Evaluated Once min_calls Calls Were Seen in the Window -> A Single Failure at Night Doesn't Trip It
+        - half_open Admits half_open_calls Trial Calls, All Must Succeed to Close
+        - Every allow() Must be Paired With a record() -> record(None) for a Call That Says Nothing About the
+          Dependency, Which Hands a Trial Slot Back
+        - Trials That Never Report Back Expire After open_seconds, Then a New Round Starts
+    """
+    def __init__(self, name: str, failure_rate: float, min_calls: int, window: float, open_seconds: float, half_open_calls: int):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self._size = max(1, int(window))
+        # Per Bucket -> [Second, Calls, Failures]
+        self._buckets: List[List[int]] = [[0, 0, 0] for _ in range(self._size)]
+        self._opened_at = 0.0
+        self._half_opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str):
+        self.state = state
+        circuit_transitions.inc(self.name, state)
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            logger.warning("Circuit Opened", extra = {"dependency": self.name})
+        elif state == HALF_OPEN:
+            self._half_opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._buckets = [[0, 0, 0] for _ in range(self._size)]
+            logger.info("Circuit Closed", extra = {"dependency": self.name})
+        self._trials = self._trial_successes = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.retry_after() > 0:
+                    return False
+                self._transition(HALF_OPEN)
+            elif self._trials >= self.half_open_calls and time.monotonic() - self._half_opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self._trials < self.half_open_calls:
+                self._trials += 1
+                return True
+            return False
+
+    def record(self, success: Optional[bool]):
+        with self._lock:
+            if success is None:
+                if self.state == HALF_OPEN and self._trials > 0:
+                    self._trials -= 1
+                return
+            if self.state == HALF_OPEN:
+                if not success:
+                    self._transition(OPEN)
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+                return
+            if self.state == OPEN:
+                return
+            second = int(time.monotonic())
+            bucket = self._buckets[second % self._size]
+            if bucket[0] != second:
+                bucket[0], bucket[1], bucket[2] = second, 0, 0
+            bucket[1] += 1
+            if not success:
+                bucket[2] += 1
+                calls = failures = 0
+                for start, count, failed in self._buckets:
+                    if second - start < self._size:
+                        calls += count
+                        failures += failed
+                if calls >= self.min_calls and failures / calls >= self.failure_rate:
+                    self._transition(OPEN)
+
+
+breakers: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(
+        name,
+        settings.CIRCUIT_FAILURE_RATE,
+        settings.CIRCUIT_MIN_CALLS,
+        settings.CIRCUIT_WINDOW_SECONDS,
+        settings.CIRCUIT_OPEN_SECONDS,
+        settings.CIRCUIT_HALF_OPEN_CALLS
+    )
+    for name in ("postgrest", "storage", "auth", "stripe")
+}
+
+registry.gauge(
+    "eventora_circuit_state",
+    "Circuit Breaker State per Dependency -> 0 closed, 1 half_open, 2 open",
+    ("client",),
+    callback = lambda: [((name, ), _STATE_VALUES[breaker.state]) for name, breaker in breakers.items()]
+)
+
+
+def backoff(attempt: int) -> Optional[float]:
+    """Full-Jitter Delay Before Retry Number attempt + 1 -> None When the Deadline Can't Fit Another Try"""
+    delay = random.uniform(0, min(settings.RETRY_MAX_DELAY_SECONDS, settings.RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+    deadline = current_deadline.get()
+    if deadline is not None and deadline.remaining() <= delay:
+        return None
+    return delay
+
+
+def _reject(client: str, breaker: CircuitBreaker):
+    circuit_rejected.inc(client)
+    raise CircuitOpenError(client, breaker.retry_after())
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """
+    httpx Transport Wrapper for the Supabase Clients -> Sits Outside DeadlineTransport, So Every Attempt Gets the
+    Budget That is Left at That Moment
+    """
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        client, _, operation = classify_supabase(request)
+        breaker = breakers.get(client)
+        if breaker is None:
+            return self._transport.handle_request(request)
+        attempts = 1 + (settings.RETRY_MAX_ATTEMPTS if (client, operation) in IDEMPOTENT else 0)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                _reject(client, breaker)
+            last = attempt + 1 >= attempts
+            # Recorded on Every Exit -> None (Neutral) Unless the Attempt Said Something About the Dependency
+            outcome = None
+            try:
+                response = self._transport.handle_request(request)
+            except DeadlineExceeded as e:
+                # Cut Short Mid-Call -> The Dependency Was Slow, Refused Before Sending -> Says Nothing About It
+                if e.during_call:
+                    outcome = False
+                raise
+            except httpx.TransportError:
+                outcome = False
+                delay = None if last else backoff(attempt)
+                if delay is None:
+                    raise
+                retries.inc(client, "connection")
+            else:
+                outcome = response.status_code < 500
+                delay = None if last or response.status_code not in RETRY_STATUSES else backoff(attempt)
+                if delay is None:
+                    return response
+                response.close()
+                retries.inc(client, str(response.status_code))
+            finally:
+                breaker.record(outcome)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self._transport.close()
+
+
+class ResilientStripeClient:
+    """
+    Breaker Around the Stripe SDK's HTTP Client -> The SDK Keeps Doing Its Own Bounded Retries Inside
+        - Connection Errors and 5xx Count as Failures, Card Declines and Other 4xx Don't
+    """
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    def request_with_retries(self, method, url, headers, post_data = None, max_network_retries = None, *, _usage = None):
+        deadline = current_deadline.get()
+        if deadline is not None:
+            deadline.check(f"stripe {method.upper()} {classify_stripe(method, url)[0]}")
+        breaker = breakers["stripe"]
+        if not breaker.allow():
+            _reject("stripe", breaker)
+        outcome = None
+        try:
+            content, status_code, response_headers = self._client.request_with_retries(
+                method, url, headers, post_data, max_network_retries, _usage = _usage
+            )
+            outcome = status_code < 500
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            breaker.record(outcome)
+        return content, status_code, response_headers
+
+
+def install_stripe_resilience():
+    import stripe
+    if isinstance(stripe.default_http_client, ResilientStripeClient):
+        return
+    client = stripe.default_http_client or stripe.new_default_http_client(
+        verify_ssl_certs = stripe.verify_ssl_certs, proxy = stripe.proxy
+    )
+    stripe.default_http_client = ResilientStripeClient(client)
+
+
+def circuit_cause(exc: BaseException) -> Optional[CircuitOpenError]:
+    # Services Re-Raise Upstream Errors as HTTPException -> Walk the Chain for the Open Circuit Underneath
+    seen = 0
+    while exc is not None and seen < 10:
+        if isinstance(exc, CircuitOpenError):
+            return exc
+        exc = exc.__cause__ or exc.__context__
+        seen += 1
+    return None
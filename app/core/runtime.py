@@ -0,0 +1,234 @@
+"""
+Runtime Health of the Process
+    - Event-Loop Lag -> A Task Sleeps for a Fixed Interval and Records How Late It Woke Up
+    - AnyIO Threadpool (Sync Routes and Dependencies) -> Tokens in Use, Tasks Waiting for One and the Queueing Delay
+      (a No-Op Sent Through the Pool Every Interval Waits Behind Whatever is Queued)
+    - io_executor Fan-Out -> Jobs Running and Queued
+    - In-Flight Requests per Route -> Kept by RuntimeMetricsMiddleware
+    - GC Pauses -> gc.callbacks Times Every Collection per Generation
+"""
+import asyncio
+import gc
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import anyio.to_thread
+from app.core.concurrency import io_executor
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+PAUSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+event_loop_lag = registry.histogram(
+    "eventora_event_loop_lag_seconds",
+    "How Late the Event Loop Woke a Task Sleeping for EVENT_LOOP_LAG_INTERVAL_SECONDS",
+    buckets = PAUSE_BUCKETS
+)
+threadpool_queue_delay = registry.histogram(
+    "eventora_threadpool_queue_delay_seconds",
+    "How Long a No-Op Waited for an AnyIO Threadpool Worker",
+    buckets = LATENCY_BUCKETS
+)
+gc_pause = registry.histogram(
+    "eventora_gc_pause_seconds",
+    "Duration of Garbage Collector Runs",
+    ("generation",),
+    PAUSE_BUCKETS
+)
+
+
+class RouteTable:
+    """
+    Route Template for a Request Before the Router Runs -> GET /api/v1/events/{event_id}
+        - Plain Regex Matches Over the App's Routes, Paths Without Parameters are Cached
+    """
+    def __init__(self, routes: Sequence[Any], cache_size: int = 1024):
+        self._routes = [
+            (route.path_regex.match, getattr(route, "methods", None), route.path)
+            for route in routes if hasattr(route, "path_regex")
+        ]
+        self._cache: Dict[Tuple[str, str], str] = {}
+        self._cache_size = cache_size
+
+    def resolve(self, method: str, path: str) -> str:
+        key = (method, path)
+        name = self._cache.get(key)
+        if name is not None:
+            return name
+        name = "unmatched"
+        for match, methods, template in self._routes:
+            if match(path) is not None and (methods is None or method in methods):
+                name = f"{method} {template}"
+                if "{" not in template and len(self._cache) < self._cache_size:
+                    self._cache[key] = name
+                break
+        return name
+
+
+class RuntimeMonitor:
+    """
+    One per Process -> Started and Stopped by the App Lifespan
+        - Gauges Read the Live Values at Scrape Time, the Lag Probe and GC Hook Feed Histograms
+        - snapshot() Backs /health/details
+    """
+    def __init__(self, lag_interval: float, window: int = 120):
+        self.lag_interval = lag_interval
+        self.in_flight: Dict[str, int] = {}
+        self.total_in_flight = 0
+        self.queue_delay = 0.0
+        self.lags: deque = deque(maxlen = window)
+        self.pauses: deque = deque(maxlen = window)
+        self.gc_collections: Dict[int, int] = {}
+        self.started_at: Optional[float] = None
+        self._limiter = None
+        self._tasks: List[asyncio.Task] = []
+        self._probe_started: Optional[float] = None
+        self._gc_started = 0.0
+
+    def start(self):
+        # Called From the Lifespan -> Inside the Event Loop the Threadpool Limiter Belongs To
+        self.started_at = time.time()
+        self._limiter = anyio.to_thread.current_default_thread_limiter()
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._probe_lag(), name = "event-loop-lag"),
+            loop.create_task(self._probe_threadpool(), name = "threadpool-delay"),
+        ]
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    async def stop(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _probe_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - started - self.lag_interval)
+            self.lags.append(lag)
+            event_loop_lag.observe(value = lag)
+            if lag > settings.EVENT_LOOP_LAG_WARN_SECONDS:
+                logger.warning("Event Loop Lagging", extra = {"lag_ms": round(lag * 1000, 1)})
+
+    async def _probe_threadpool(self):
+        while True:
+            self._probe_started = time.perf_counter()
+            await anyio.to_thread.run_sync(_noop)
+            self.queue_delay = time.perf_counter() - self._probe_started
+            self._probe_started = None
+            threadpool_queue_delay.observe(value = self.queue_delay)
+            await asyncio.sleep(self.lag_interval)
+
+    def current_queue_delay(self) -> float:
+        # A Probe Still Waiting Means the Delay is at Least Its Age -> Rises Immediately Under Saturation
+        started = self._probe_started
+        if started is None:
+            return self.queue_delay
+        return max(self.queue_delay, time.perf_counter() - started)
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]):
+        # Runs Inside the Collector on Whichever Thread Triggered It -> Keep It Tiny
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._gc_started
+        generation = info["generation"]
+        self.gc_collections[generation] = self.gc_collections.get(generation, 0) + 1
+        self.pauses.append(pause)
+        gc_pause.observe(str(generation), value = pause)
+
+    # Request Tracking -> Called on the Event Loop Only, So Plain Dict Updates are Safe
+    def request_started(self, route: str):
+        self.in_flight[route] = self.in_flight.get(route, 0) + 1
+        self.total_in_flight += 1
+
+    def request_finished(self, route: str):
+        self.in_flight[route] -= 1
+        self.total_in_flight -= 1
+
+    def threadpool(self) -> Dict[str, int]:
+        if self._limiter is None:
+            return {"limit": 0, "in_use": 0, "queued": 0}
+        stats = self._limiter.statistics()
+        return {"limit": int(stats.total_tokens), "in_use": stats.borrowed_tokens, "queued": stats.tasks_waiting}
+
+    def io_pool(self) -> Dict[str, int]:
+        queued = io_executor.queued()
+        return {"limit": io_executor._max_workers, "in_use": io_executor.pending() - queued, "queued": queued}
+
+    def snapshot(self) -> Dict[str, Any]:
+        lags = list(self.lags)
+        pauses = list(self.pauses)
+        threadpool = self.threadpool()
+        lag_max = max(lags, default = 0.0)
+        problems = []
+        if lag_max > settings.EVENT_LOOP_LAG_WARN_SECONDS:
+            problems.append("event_loop_lag")
+        if threadpool["queued"] > 0:
+            problems.append("threadpool_saturated")
+        return {
+            "status": "degraded" if problems else "healthy",
+            "problems": problems,
+            "uptime_seconds": round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            "event_loop_lag_ms": {
+                "last": round(lags[-1] * 1000, 3) if lags else 0.0,
+                "max": round(lag_max * 1000, 3),
+                "window_seconds": round(len(lags) * self.lag_interval, 1),
+            },
+            "threadpool": {**threadpool, "queue_delay_ms": round(self.current_queue_delay() * 1000, 3)},
+            "io_executor": self.io_pool(),
+            "in_flight": {route: count for route, count in sorted(self.in_flight.items()) if count},
+            "gc": {
+                "collections": {str(generation): count for generation, count in sorted(self.gc_collections.items())},
+                "last_pause_ms": round(pauses[-1] * 1000, 3) if pauses else 0.0,
+                "max_pause_ms": round(max(pauses, default = 0.0) * 1000, 3),
+            },
+        }
+
+
+def _noop():
+    pass
+
+
+monitor = RuntimeMonitor(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS)
+
+
+def _pool_samples(pool: Dict[str, int]) -> Iterable[Tuple[Tuple[str, ...], float]]:
+    return [((state,), pool[state]) for state in ("limit", "in_use", "queued")]
+
+
+def _in_flight_samples() -> List[Tuple[Tuple[str, ...], float]]:
+    return [((route,), count) for route, count in list(monitor.in_flight.items())]
+
+
+registry.gauge(
+    "eventora_threadpool_workers",
+    "AnyIO Threadpool Running Sync Routes -> limit, in_use and queued (Waiting for a Worker)",
+    ("state",),
+    callback = lambda: _pool_samples(monitor.threadpool())
+)
+registry.gauge(
+    "eventora_io_executor_jobs",
+    "External Call Fan-Out Pool -> limit, in_use and queued",
+    ("state",),
+    callback = lambda: _pool_samples(monitor.io_pool())
+)
+registry.gauge(
+    "eventora_requests_in_flight",
+    "Requests Being Handled per Route Template",
+    ("route",),
+    callback = _in_flight_samples
+)
@@ -0,0 +1,290 @@
+import logging
+import functools
+import importlib
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SpanExporter:
+    """Receives Finished Spans in Batches on the Export Thread -> Subclass and Point TRACING_EXPORTER at a Factory"""
+    def export(self, spans: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class ConsoleExporter(SpanExporter):
+    # One JSON Object per Line on Stdout -> Works Without Any Collector
+    def export(self, spans: List[Dict[str, Any]]):
+        sys.stdout.write("".join(json.dumps(span, default = str) + "\n" for span in spans))
+        sys.stdout.flush()
+
+
+class FileExporter(SpanExporter):
+    # JSON Lines Appended to a Local File -> Inspect With jq, or Load Into Any Trace Viewer That Reads JSONL
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding = "utf-8")
+
+    def export(self, spans: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(span, default = str) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self):
+        self._file.close()
+
+
+def load_exporter(name: str) -> Optional[SpanExporter]:
+    """console | file | package.module:factory -> None When Tracing is Disabled"""
+    if not name:
+        return None
+    if name == "console":
+        return ConsoleExporter()
+    if name == "file":
+        return FileExporter(settings.TRACING_FILE_PATH)
+    module_name, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)()
+
+
+class _ExportQueue:
+    """
+    Finished Spans are Handed to a Background Thread -> Exporting Never Blocks a Request
+        - The Queue is Bounded, Spans are Dropped (and Counted) When the Exporter Falls Behind
+    """
+    def __init__(self, exporter: SpanExporter, max_size: int):
+        self.exporter = exporter
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(max_size)
+        self._thread = threading.Thread(target = self._run, name = "trace-export", daemon = True)
+        self._thread.start()
+
+    def put(self, spans: List[Dict[str, Any]]):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            # Drain Whatever Else is Waiting -> One Write per Burst
+            try:
+                while True:
+                    more = self._queue.get_nowait()
+                    if more is None:
+                        self._queue.put(None)
+                        break
+                    batch.extend(more)
+            except queue.Empty:
+                pass
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                logger.error("Trace Export Error: %s", e)
+
+    def shutdown(self, timeout: float = 5.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.exporter.shutdown()
+
+
+_export: Optional[_ExportQueue] = None
+
+
+class Trace:
+    __slots__ = ("trace_id", "root", "spans", "done")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.root: Optional["Span"] = None
+        self.spans: List[Dict[str, Any]] = []
+        self.done = False
+
+
+class Span:
+    """
+    One Timed Operation Within a Trace
+        - Used as a Context Manager -> Child Spans Started Inside It Take It as Their Parent
+        - The Trace is Exported When Its Root Span Ends
+    """
+    __slots__ = ("trace", "name", "span_id", "parent_id", "attributes", "error", "_start_time", "_started", "_token")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._start_time = time.time()
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"[:200]
+        self.end()
+        return False
+
+    def end(self, error: Optional[str] = None):
+        if error is not None and self.error is None:
+            self.error = error
+        record = {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self._start_time,
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+        trace = self.trace
+        if trace.done:
+            # Background Work That Outlived Its Request -> Exported on Its Own
+            if _export is not None:
+                _export.put([record])
+            return
+        trace.spans.append(record)
+        if self is trace.root:
+            trace.done = True
+            if _export is not None:
+                _export.put(trace.spans)
+
+
+class _NoopSpan:
+    # Returned When There is No Sampled Trace -> Tracing Costs a Context Variable Lookup
+    __slots__ = ()
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def end(self, error: Optional[str] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default = None)
+
+
+_HEX = frozenset("0123456789abcdef")
+
+
+def _parse_traceparent(header: Optional[str]):
+    # W3C Trace Context -> version-trace_id-parent_id-flags, Lowercase Hex, All-Zero IDs and Version ff are Invalid
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[0]) != 2 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    if not _HEX.issuperset("".join(parts)) or parts[0] == "ff":
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(int(parts[3], 16) & 1)
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes) -> Any:
+    """
+    Start a Root Span -> Continues the Upstream Trace ID When a Valid traceparent is Sent
+        - Sampled at TRACING_SAMPLE_RATE -> Any Client Can Set the Sampled Flag, So It is Ignored by Default
+        - TRACING_TRUST_TRACEPARENT_SAMPLED Follows the Caller's Decision Instead (Behind a Gateway That Sets It)
+        - Returns NOOP_SPAN When Tracing is Off or the Trace Isn't Sampled
+    """
+    if _export is None:
+        return NOOP_SPAN
+    parent = _parse_traceparent(traceparent)
+    if parent is not None and settings.TRACING_TRUST_TRACEPARENT_SAMPLED:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id = parent[:2] if parent is not None else (os.urandom(16).hex(), None)
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    if not sampled:
+        return NOOP_SPAN
+    trace = Trace(trace_id)
+    # The Parent of a Root Span is Remote When It Continues an Upstream Trace
+    trace.root = Span(trace, name, parent_id, attributes)
+    return trace.root
+
+
+def span(name: str, **attributes) -> Any:
+    """Child Span of the Current Span -> NOOP_SPAN Outside a Sampled Trace"""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def background_span(name: str, **attributes) -> Any:
+    # Background Jobs -> Child of the Current Span When Started From a Request, Otherwise a New Sampled Trace
+    if _current_span.get() is not None:
+        return span(name, **attributes)
+    return start_trace(name, **attributes)
+
+
+def current_span() -> Any:
+    return _current_span.get() or NOOP_SPAN
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator -> Run the Function in a Child Span Named After It (e.g. BookingService.create_checkout_session)"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def configure_tracing():
+    global _export
+    if _export is not None:
+        return
+    exporter = load_exporter(settings.TRACING_EXPORTER)
+    if exporter is not None:
+        _export = _ExportQueue(exporter, settings.TRACING_QUEUE_SIZE)
+
+
+def shutdown_tracing():
+    global _export
+    if _export is not None:
+        _export.shutdown()
+        _export = None
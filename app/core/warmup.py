@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, get_args, get_origin
+from uuid import uuid4
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from app.core.concurrency import io_executor
+from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.responses import adapters
+from app.core.tracing import background_span
+from app.schemas.booking import BookingDetailResponse
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.event import EventResponse
+from app.schemas.event_category import CategoryResponse
+from app.utils.image_processing import get_process_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _sample_payloads() -> Dict[type, Dict[str, Any]]:
+    # Representative Payloads -> Every Nested Model and Field Type Gets Exercised Once
+    now = datetime.now(timezone.utc).isoformat()
+    event_id, user_id = str(uuid4()), str(uuid4())
+    return {
+        CategoryResponse: {"id": str(uuid4()), "name": "Warm-Up", "created_at": now},
+        EventResponse: {
+            "id": event_id, "title": "Warm-Up", "description": None, "location": "Online",
+            "event_date": now, "event_end_date": now, "event_status": "published", "image_url": None,
+            "max_slots": 1, "is_paid": True, "currency": "myr", "ticket_price": 10.0,
+            "created_by": user_id, "created_at": now
+        },
+        BookingDetailResponse: {
+            "id": str(uuid4()), "event_id": event_id, "user_id": user_id, "amount_total": 1000,
+            "currency": "myr", "payment_status": "paid", "payment_method": "card", "created_at": now,
+            "stripe_session_id": None,
+            "event": {"title": "Warm-Up", "location": "Online", "event_date": now, "image_url": None},
+            "profile": {"full_name": "Warm-Up", "email": "warmup@example.com"}
+        },
+        DashboardResponse: {
+            "stats": {"total_revenue": 10.0, "total_tickets_sold": 1, "total_events_active": 1, "currency": "MYR"},
+            "granularity": "day",
+            "sales_chart": [{"date": now[:10], "bucket_start": now, "daily_revenue": 10.0, "tickets_sold": 1}],
+            "top_events": [{"event_title": "Warm-Up", "revenue": 10.0, "tickets_sold": 1, "occupancy_rate": 100.0}],
+            "recent_sales": [{
+                "booking_id": str(uuid4()), "event_title": "Warm-Up", "buyer_name": "Warm-Up",
+                "buyer_email": "warmup@example.com", "amount": 10.0, "original_amount": 10.0,
+                "original_currency": "MYR", "created_at": now
+            }]
+        }
+    }
+
+
+class Warmup:
+    """
+    Startup Warm-Up Run on a Background Thread After the Lifespan Starts
+        - Opens Pooled Connections to PostgREST, Storage and Auth
+        - Preloads the Categories Cache and the First Page of Events
+        - Serializes Sample Responses Through the TypedJSONResponse Adapters and the Route Fields FastAPI Still Uses
+        - Starts the Image Process Pool Workers
+        - ready is Set Once Every Step Has Run -> Failed Steps are Reported, Not Retried
+    """
+    def __init__(self, app: FastAPI, services: ServiceContainer):
+        self.app = app
+        self.services = services
+        self.ready = threading.Event()
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.duration: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if not settings.WARMUP_ENABLED:
+            self.ready.set()
+            return
+        self._thread = threading.Thread(target = self.run, name = "warmup", daemon = True)
+        self._thread.start()
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            with background_span("warmup"):
+                self._step("connections", self._open_connections)
+                self._step("categories", lambda: self.services.category_service.get_all_categories())
+                self._step("events", lambda: self.services.event_service.list_events(1, settings.WARMUP_EVENT_PAGE_SIZE))
+                self._step("serialization", self._exercise_serialization)
+                self._step("image_workers", self._start_image_workers)
+        finally:
+            self.duration = time.perf_counter() - started
+            self.ready.set()
+            logger.info("Warm-Up Finished in %.2fs", self.duration, extra = {"steps": self.steps})
+
+    def _step(self, name: str, job: Callable[[], Any]):
+        started = time.perf_counter()
+        try:
+            job()
+            self.steps[name] = {"ok": True}
+        except Exception as e:
+            self.steps[name] = {"ok": False, "error": str(e)[:200]}
+        self.steps[name]["seconds"] = round(time.perf_counter() - started, 3)
+
+    # Concurrent Requests -> Each Holds a Connection, So the Pools Keep That Many Alive Afterwards
+    def _open_connections(self):
+        client, service_client = self.services.client, self.services.service_client
+        jobs = []
+        for _ in range(max(1, settings.WARMUP_CONNECTIONS)):
+            jobs.append(lambda: client.table("event_categories").select("id").limit(1).execute())
+            jobs.append(lambda: service_client.table("event").select("id").limit(1).execute())
+        jobs.append(lambda: service_client.storage.from_(settings.EVENT_IMAGE_BUCKET).list(None, {"limit": 1}))
+        # Token Checks Go to the Auth Server on Every Authenticated Request
+        jobs.append(lambda: client.auth._http_client.get(f"{client.auth_url}/health", headers = {"apikey": client.supabase_key}))
+        futures = [io_executor.submit(job) for job in jobs]
+        wait(futures)
+        errors = [str(future.exception()) for future in futures if future.exception()]
+        if errors:
+            raise RuntimeError(f"{len(errors)} of {len(futures)} Warm-Up Requests Failed: {errors[0]}")
+
+    # One Task per Worker -> The Pool Starts Them All, So the First Upload Doesn't Wait on the Interpreter Start-Up
+    def _start_image_workers(self):
+        pool = get_process_pool()
+        for future in [pool.submit(os.getpid) for _ in range(settings.IMAGE_PROCESS_WORKERS)]:
+            future.result(timeout = settings.IMAGE_PROCESS_TIMEOUT_SECONDS)
+
+    def _exercise_serialization(self):
+        samples = _sample_payloads()
+        for model, payload in samples.items():
+            jsonable_encoder(model.model_validate(payload))
+        # The Adapters Behind TypedJSONResponse -> The Exact Validate and Encode Path of Those Routes
+        for response_type, adapter in adapters.items():
+            listed = get_origin(response_type) is list
+            payload = samples.get(get_args(response_type)[0] if listed else response_type)
+            if payload is not None:
+                adapter.dump_json(adapter.validate_python([payload] if listed else payload, from_attributes = True))
+        # Routes Returning Plain Data Still Go Through Their Response Field -> Those Bypassed by an Adapter are Skipped
+        for route in self.app.routes:
+            if isinstance(route, APIRoute) and route.response_field is not None and route.response_model in samples \
+                    and route.response_model not in adapters:
+                value = route.response_field.validate(samples[route.response_model], {}, loc = ("response",))[0]
+                route.response_field.serialize(value, mode = "json")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready.is_set(),
+            "seconds": round(self.duration, 3) if self.duration is not None else None,
+            "steps": self.steps
+        }
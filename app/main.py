@@ -1,24 +1,168 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.routes import auth, profiles, events, event_categories, event_participants, bookings, dashboard
+from app.core.background import PeriodicWorker
+from app.core.container import ServiceContainer
+from app.core.deadline import install_stripe_deadlines
+from app.core.instrumentation import instrument_stripe
+from app.core.logger import configure_logging, shutdown_logging
+from app.core.metrics import registry
+from app.core.tracing import configure_tracing, shutdown_tracing
+from app.core.warmup import Warmup
+from app.core.rate_limit import create_backend
+from app.core.resilience import CircuitOpenError, circuit_cause, install_stripe_resilience
+from app.core.responses import FastJSONResponse
+from app.core.runtime import monitor
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.last_known_good import LastKnownGoodMiddleware
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.runtime import RuntimeMetricsMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.utils.image_processing import shutdown_process_pool, start_process_pool
+from app.api.routes import admin, auth, profiles, events, event_categories, event_participants, bookings, dashboard
 from datetime import datetime
+import math
 import uvicorn
 
+# Rate-Limit Buckets -> Per Process (memory) or Shared by Every Worker (redis), Closed by the Lifespan
+rate_limit_backend = create_backend(settings.RATE_LIMIT_BACKEND) if settings.RATE_LIMIT_ENABLED else None
+
+# Application Lifespan -> Build the Service Container, Start and Stop the Background Workers
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients and Services are Created on First Use -> Startup Doesn't Wait on Client Construction
+    configure_logging()
+    configure_tracing()
+    services = ServiceContainer()
+    if settings.DEADLINES_ENABLED:
+        install_stripe_deadlines()
+    if settings.METRICS_ENABLED or settings.TRACING_EXPORTER:
+        instrument_stripe()
+    if settings.RESILIENCE_ENABLED:
+        install_stripe_resilience()
+    app.state.services = services
+    start_process_pool()
+    if settings.RUNTIME_MONITOR_ENABLED:
+        monitor.start()
+    workers = []
+    if settings.STRIPE_OUTBOX_WORKER_ENABLED:
+        workers.append(PeriodicWorker("stripe-outbox", settings.STRIPE_OUTBOX_POLL_SECONDS, lambda: services.stripe_sync_service.process_batch()))
+    if settings.STORAGE_GC_WORKER_ENABLED:
+        workers.append(PeriodicWorker("storage-gc", settings.STORAGE_GC_POLL_SECONDS, lambda: services.storage_gc_service.run_once()))
+    if settings.IMAGE_VARIANT_WORKER_ENABLED:
+        workers.append(PeriodicWorker("image-variants", settings.IMAGE_VARIANT_POLL_SECONDS, lambda: services.image_variant_service.process_batch()))
+    for worker in workers:
+        worker.start()
+    app.state.workers = workers
+    # Warm Up in the Background -> /ready Reports Ready Once It Finishes
+    app.state.warmup = Warmup(app, services)
+    app.state.warmup.start()
+    yield
+    for worker in workers:
+        worker.stop()
+    await monitor.stop()
+    if rate_limit_backend is not None:
+        await rate_limit_backend.close()
+    services.close()
+    shutdown_process_pool()
+    shutdown_tracing()
+    shutdown_logging()
+
 # Initialize FastAPI Instance
 app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
-# CORS Middleware
+# Open Circuit -> 503 With Retry-After, Also When a Service Wrapped the Error in Its Own 400 / 500
+def circuit_open_response(error: CircuitOpenError) -> JSONResponse:
+    return JSONResponse(
+        {"detail": f"Upstream Service Temporarily Unavailable ({error.name}), Retry Later"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+@app.exception_handler(HTTPException)
+async def upstream_http_exception_handler(request: Request, exc: HTTPException):
+    error = circuit_cause(exc)
+    if error is not None:
+        return circuit_open_response(error)
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return circuit_open_response(exc)
+
+# Server-Timing Header -> Per-Request Breakdown of PostgREST, Storage, Auth and Stripe Calls
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# On-Demand Profiling -> Not Even Imported Unless PROFILING_ENABLED, So It Costs Nothing When Off
+if settings.PROFILING_ENABLED:
+    from app.core import profiling
+    from app.middleware.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+    profiling.install(auth.router, profiles.router, events.router, event_categories.router, bookings.router, dashboard.router)
+
+# Request Tracing -> Root Span per Request, No-Op Unless TRACING_EXPORTER is Set
+app.add_middleware(TracingMiddleware)
+
+# Last-Known-Good -> Marks Responses Served From the Stored Copy While Supabase is Failing or Slow
+if settings.LAST_KNOWN_GOOD_ENABLED:
+    app.add_middleware(LastKnownGoodMiddleware)
+
+# Deadlines -> Per-Route Budget Capping Every Outbound Call, 504 Once It is Spent
+if settings.DEADLINES_ENABLED:
+    app.add_middleware(DeadlineMiddleware)
+
+# Request ID -> Correlates Every Log Line of a Request, Echoed in X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
+# Load Shedding -> Fast 503 for Lower-Priority Routes While the Threadpool is Backed Up
+if settings.RUNTIME_MONITOR_ENABLED and settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        max_in_flight=settings.LOAD_SHED_MAX_IN_FLIGHT,
+        queue_delay=settings.LOAD_SHED_QUEUE_DELAY_SECONDS,
+        retry_after_max=settings.LOAD_SHED_RETRY_AFTER_MAX_SECONDS,
+    )
+
+# Rate Limiting -> Token Buckets per IP or User on Login, Register, Password Reset, Checkout and Uploads
+if rate_limit_backend is not None:
+    app.add_middleware(RateLimitMiddleware, backend=rate_limit_backend)
+
+# In-Flight Requests per Route -> Counted Before Routing, Outside Everything but Compression
+if settings.RUNTIME_MONITOR_ENABLED:
+    app.add_middleware(RuntimeMetricsMiddleware)
+
+# Response Compression -> Wraps Everything but CORS
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.GZIP_COMPRESSLEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
+# CORS Middleware -> Added Last So It is Outermost, Answers Preflights Itself and Also Labels the 429 / 503 / 504
+# That Rate Limiting, Load Shedding and Deadlines Send Without Reaching the App -> Otherwise the Browser Can't Read Them
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy"],
 )
 
 # Include Routers
@@ -29,6 +173,7 @@ app.include_router(event_categories.router, prefix=f"{settings.API_V1_PREFIX}/ca
 # app.include_router(event_participants.router, prefix=f"{settings.API_V1_PREFIX}/event-participants", tags=["Event Participants"])
 app.include_router(bookings.router, prefix=f"{settings.API_V1_PREFIX}/bookings", tags=["Bookings"])
 app.include_router(dashboard.router, prefix=f"{settings.API_V1_PREFIX}/dashboard", tags=["Dashboard"])
+app.include_router(admin.router, prefix="/admin", include_in_schema=False)
 
 # Testing Routes
 @app.get("/")
@@ -46,4 +191,26 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/health/details", include_in_schema=False)
+async def health_details(request: Request):
+    # Runtime Health -> Event-Loop Lag, Threadpool Saturation, In-Flight Requests and GC Pauses
+    if not settings.RUNTIME_MONITOR_ENABLED:
+        return Response(status_code = status.HTTP_404_NOT_FOUND)
+    body = monitor.snapshot()
+    body["warmup"] = request.app.state.warmup.status()
+    body["timestamp"] = datetime.now().isoformat()
+    return body
+
+@app.get("/ready")
+async def readiness_check(request: Request):
+    # Readiness -> 503 Until the Startup Warm-Up Has Finished
+    warmup = request.app.state.warmup
+    body = {"status": "ready" if warmup.ready.is_set() else "warming_up", "warmup": warmup.status()}
+    return JSONResponse(body, status_code = status.HTTP_200_OK if warmup.ready.is_set() else status.HTTP_503_SERVICE_UNAVAILABLE)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Prometheus Scrape Endpoint -> External Call Latency, Errors and Payload Sizes
+    if not settings.METRICS_ENABLED:
+        return Response(status_code = status.HTTP_404_NOT_FOUND)
+    return Response(registry.render(), media_type = registry.content_type)
@@ -0,0 +1,67 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.deadline import Deadline, current_deadline, deadline_overrun, load_budgets
+from app.core.runtime import RouteTable
+
+
+class DeadlineMiddleware:
+    """
+    Start Each Request's Deadline -> Budget From DEADLINE_BUDGETS by Route, Else DEADLINE_DEFAULT_SECONDS
+        - Time Spent Queued for the Threadpool Counts, So a Request That Waited Too Long Fails on Its First Call
+        - Once the Budget Was Spent on an Outbound Call, the Response is Replaced by a 504 -> Routes Wrap Errors in
+          500s, Which Would Hide the Cause
+        - Requests Finishing Past Their Budget are Recorded in eventora_deadline_overrun_seconds
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.budgets = load_budgets(settings.API_V1_PREFIX, settings.DEADLINE_BUDGETS)
+        self.default = settings.DEADLINE_DEFAULT_SECONDS
+        self._routes = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = scope.get("route_template")
+        if route is None:
+            if self._routes is None:
+                self._routes = RouteTable(scope["app"].router.routes)
+            route = self._routes.resolve(scope["method"], scope["path"])
+        deadline = Deadline(route, self.budgets.get(route, self.default))
+        token = current_deadline.set(deadline)
+        started = False
+        replaced = False
+
+        async def send_or_replace(message: Message) -> None:
+            nonlocal started, replaced
+            if message["type"] == "http.response.start":
+                started = True
+                if deadline.exceeded and message["status"] >= 500:
+                    replaced = True
+                    await self._timeout_response(deadline)(scope, receive, send)
+                    return
+            if replaced:
+                # Body of the Response That Was Swapped Out
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_or_replace)
+        except Exception:
+            if not deadline.exceeded or started:
+                raise
+            await self._timeout_response(deadline)(scope, receive, send)
+        finally:
+            current_deadline.reset(token)
+            overrun = -deadline.remaining()
+            if overrun > 0:
+                deadline_overrun.observe(route, value = overrun)
+
+    @staticmethod
+    def _timeout_response(deadline: Deadline) -> JSONResponse:
+        return JSONResponse(
+            {"detail": f"Request Deadline of {deadline.budget:g}s Exceeded Waiting on an Upstream Service"},
+            status_code = 504
+        )
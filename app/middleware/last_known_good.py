@@ -0,0 +1,32 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.last_known_good import Staleness, current_staleness
+
+
+class LastKnownGoodMiddleware:
+    """
+    Give Each Request a Staleness Marker -> Set Here So It Reaches the Threadpool, Filled In by @last_known_good
+        - A Response Built From a Stored Copy Gets X-Last-Known-Good (error | slow) and Age in Seconds
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        staleness = Staleness()
+        token = current_staleness.set(staleness)
+
+        async def send_with_staleness(message: Message) -> None:
+            if message["type"] == "http.response.start" and staleness.reason is not None:
+                headers = MutableHeaders(scope = message)
+                headers.append("X-Last-Known-Good", staleness.reason)
+                headers.append("Age", str(int(staleness.age)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_staleness)
+        finally:
+            current_staleness.reset(token)
@@ -0,0 +1,49 @@
+import random
+import sys
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.profiling import active_profiles, finish_profile, is_admin, start_profile
+
+
+class ProfilingMiddleware:
+    """
+    Profile a Request on Demand
+        - Requests Carrying X-Profile-Token (PROFILING_ADMIN_TOKEN) are Always Profiled,
+          Others at PROFILING_SAMPLE_RATE While Fewer Than PROFILING_MAX_CONCURRENT are Running
+        - Profiled Responses Carry the Profile ID in X-Profile-Id -> Download It From /admin/profiles/{id}
+        - Only Installed When PROFILING_ENABLED is Set -> Unprofiled Requests Pay a Header Lookup and a Random Draw
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/admin/"):
+            await self.app(scope, receive, send)
+            return
+
+        if is_admin(Headers(scope = scope)):
+            trigger = "header"
+        elif settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE \
+                and active_profiles() < settings.PROFILING_MAX_CONCURRENT:
+            trigger = "sampled"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        # This Coroutine's Frame -> Event-Loop Samples Count Only While It is on the Stack
+        profile, token = start_profile(scope["method"], scope["path"], trigger, sys._getframe())
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope = message).append("X-Profile-Id", profile.id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                profile.route = f"{scope['method']} {route.path}"
+            finish_profile(profile, token)
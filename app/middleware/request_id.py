@@ -0,0 +1,32 @@
+from uuid import uuid4
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.logger import request_id
+
+
+class RequestIdMiddleware:
+    """
+    Tag Every Request With an ID -> Reused From X-Request-ID When the Proxy Sends One
+        - Stored in a Context Variable So Every Log Line of the Request Carries It
+        - Echoed Back in the X-Request-ID Response Header
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        value = Headers(scope = scope).get("x-request-id") or uuid4().hex
+        token = request_id.set(value[:128])
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope = message).append("X-Request-ID", request_id.get())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
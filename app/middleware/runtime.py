@@ -0,0 +1,28 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.runtime import RouteTable, monitor
+
+
+class RuntimeMetricsMiddleware:
+    """
+    Count In-Flight Requests per Route Template
+        - The Route is Resolved Before the Router Runs, So Requests Still Waiting for a Threadpool Worker are Counted
+        - The Resolved Template is Left in scope["route_template"] for Middleware Further In
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._routes = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._routes is None:
+            # Built on the First Request -> Every Router is Included by Then
+            self._routes = RouteTable(scope["app"].router.routes)
+        route = scope["route_template"] = self._routes.resolve(scope["method"], scope["path"])
+        monitor.request_started(route)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.request_finished(route)
@@ -0,0 +1,49 @@
+import time
+from typing import Dict, List, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.instrumentation import request_calls
+
+
+def server_timing(calls: List[Tuple[str, str, str, float]], total: float) -> str:
+    # One Entry per (Client, Target, Operation) -> Concurrent Calls Add Up, So the Sum Can Exceed the Total
+    grouped: Dict[Tuple[str, str, str], List[float]] = {}
+    for client, target, operation, seconds in calls:
+        grouped.setdefault((client, target, operation), []).append(seconds)
+    entries = []
+    for (client, target, operation), durations in grouped.items():
+        name = "-".join(part for part in (client, target, operation) if part and part != "-")
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        entries.append(f'{name};dur={sum(durations) * 1000:.1f};desc="{len(durations)} call(s)"')
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    Collect the External Calls Made While Handling a Request
+        - Adds a Server-Timing Header Breaking Them Down per (Client, Target, Operation)
+        - The Calls are Recorded by the Instrumented Supabase / Stripe Clients
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        calls: List[Tuple[str, str, str, float]] = []
+        token = request_calls.set(calls)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope = message)
+                headers.append("Server-Timing", server_timing(calls, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_calls.reset(token)
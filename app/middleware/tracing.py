@@ -0,0 +1,42 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.tracing import NOOP_SPAN, start_trace
+
+
+class TracingMiddleware:
+    """
+    Start a Root Span per Request
+        - Continues the Caller's Trace ID When a W3C traceparent Header is Sent, Sampled Locally at TRACING_SAMPLE_RATE
+        - The Span is Renamed to the Matched Route Template (GET /api/v1/events/{event_id}) Once Routing is Done
+        - Sampled Responses Carry the Trace ID in X-Trace-Id
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = start_trace(
+            f"{scope['method']} {scope['path']}",
+            Headers(scope = scope).get("traceparent"),
+            **{"http.method": scope["method"], "http.path": scope["path"]}
+        )
+        if root is NOOP_SPAN:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                MutableHeaders(scope = message).append("X-Trace-Id", root.trace.trace_id)
+            await send(message)
+
+        with root:
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
@@ -1,10 +1,11 @@
 from pydantic import BaseModel
-from typing import List, Optional 
+from typing import Dict, List, Optional 
 from uuid import UUID
 from datetime import datetime, date
 
 class SalesChartData(BaseModel):
     date: date
+    bucket_start: datetime
     daily_revenue: float
     tickets_sold: int
 
@@ -13,6 +14,7 @@ class EventPerformance(BaseModel):
     revenue: float
     tickets_sold: int
     occupancy_rate: float
+    unconverted_revenue: Dict[str, float] = {} # -> Original Amounts per Currency Left Out of revenue (No FX Rate)
 
 class RecentSale(BaseModel):
     booking_id: UUID
@@ -20,15 +22,21 @@ class RecentSale(BaseModel):
     buyer_name: str
     buyer_email: str
     amount: float
+    original_amount: Optional[float] = None
+    original_currency: Optional[str] = None
+    converted: bool = True # -> False When No FX Rate Exists, amount is Then in original_currency
     created_at: datetime
 
 class DashboardStats(BaseModel):
     total_revenue: float
     total_tickets_sold: int
     total_events_active: int
+    currency: str = "MYR"
+    unconverted_revenue: Dict[str, float] = {} # -> Original Amounts per Currency Left Out of total_revenue (No FX Rate)
 
 class DashboardResponse(BaseModel):
     stats: DashboardStats
+    granularity: str = "day"
     sales_chart: List[SalesChartData]
     top_events: List[EventPerformance]
     recent_sales: List[RecentSale]
\ No newline at end of file
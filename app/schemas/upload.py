@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+class SignedUploadRequest(BaseModel):
+    content_type: str
+
+class SignedUploadResponse(BaseModel):
+    signed_url: str
+    token: str
+    bucket: str
+    path: str
+    expires_in: int
+
+class UploadCompleteRequest(BaseModel):
+    path: str
+
+class UploadResult(BaseModel):
+    url: str
+    path: Optional[str] = None
+    variants: Dict[str, str] = {}
\ No newline at end of file
@@ -1,17 +1,21 @@
+import logging
 from fastapi import HTTPException, status
 from app.schemas.auth import UserPasswordUpdate, UserRegister, TokenResponse, UserLogin
+from supabase import Client
 from app.core.database import SupabaseClient
 from app.core.config import settings
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from gotrue.errors import AuthApiError
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 
+logger = logging.getLogger(__name__)
+
 class AuthService:
     """Service for handling authentication operations"""
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
-        self.supabase_admin = SupabaseClient.get_service_client()
+    def __init__(self, supabase: Optional[Client] = None, supabase_admin: Optional[Client] = None):
+        self.supabase = supabase or SupabaseClient.get_client()
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
     
     # New User Registration Function 
     def register_user(self, user_data: UserRegister) -> TokenResponse:
@@ -75,7 +79,7 @@ class AuthService:
                 detail = e.message
             )
         except Exception as e:
-            print(f"Registration Failed: {e}")
+            logger.error("Registration Failed: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = "An Unexcepted Error Occured During Registration"
@@ -113,7 +117,7 @@ class AuthService:
                     "updated_at": datetime.now(timezone.utc).isoformat()
                 }).eq("id", response.user.id).execute()
             except Exception as e:
-                print(f"Failed to Updated Profile updated_at: {e}")
+                logger.warning("Failed to Update Profile updated_at: %s", e, extra = {"user_id": response.user.id})
             
             # 3.1 Fetch Profile Detail
             profile_data = {}
@@ -127,7 +131,7 @@ class AuthService:
                 )
                 profile_data = profile_result.data
             except Exception as e:
-                print(f"Warning: Profile Fetch Failed For User {response.user.id}: {e}")
+                logger.warning("Profile Fetch Failed: %s", e, extra = {"user_id": response.user.id})
             
             user_info = {
                 "id": response.user.id,
@@ -149,7 +153,7 @@ class AuthService:
         except AuthApiError as e:
             # Handle Supabase Specific Auth Error
             msg = str(e).lower() 
-            print(msg)
+            logger.info("Login Rejected: %s", msg)
             if "invalid_grant" in msg or "invalid login" in msg:
              raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -169,7 +173,7 @@ class AuthService:
             raise e
         except Exception as e:
             # Catch-all for unexpected server errors
-            print(f"Login System Error: {e}") 
+            logger.error("Login System Error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An unexpected error occurred during login."
@@ -371,7 +375,7 @@ class AuthService:
                 "success": True
             }
         except Exception as e:
-            print(f"Password Reset Request Error: {e}")
+            logger.error("Password Reset Request Error: %s", e)
             return {
                 "message": "If An Account with That Email Exists, A Password Reset Link Has Been Sent.",
                 "success": True
@@ -1,23 +1,40 @@
+import logging
 import stripe
 from fastapi import HTTPException, status, Request
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta, timezone
+from supabase import Client
 from app.core.database import SupabaseClient
 from app.core.config import settings
+from app.core.tracing import current_span, traced
 from app.schemas.booking import BookingCreateSchema
+from app.utils.currency import to_minor_units
 from app.services.event_participant_service import EventParticipantService # -> Helper Service
+from app.services.stripe_sync_service import StripeSyncService # -> Helper Service
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    stripe.api_base = settings.STRIPE_API_BASE
+
+logger = logging.getLogger(__name__)
 
 class BookingService:
     # Initliaze the Service Needed for Booking API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
-        self.supabase_admin = SupabaseClient.get_service_client()
-        self.event_participant_service = EventParticipantService()
+    def __init__(
+        self,
+        supabase: Optional[Client] = None,
+        supabase_admin: Optional[Client] = None,
+        event_participant_service: Optional[EventParticipantService] = None,
+        stripe_sync: Optional[StripeSyncService] = None
+    ):
+        self.supabase = supabase or SupabaseClient.get_client()
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
+        self.event_participant_service = event_participant_service or EventParticipantService(self.supabase)
+        self.stripe_sync = stripe_sync or StripeSyncService(self.supabase_admin)
         self.table = "bookings"
 
     # Helper Function to Fullfill the Data in the Bookings Table
+    @traced()
     def _fulfill_booking(self, session):
         # 1. Using .get() Everywhere to Prevent the App From Crashing If Data is Missing
         booking_id = session.get("metadata", {}).get("booking_id")
@@ -25,13 +42,13 @@ class BookingService:
         event_id = session.get("metadata", {}).get("event_id")
 
         if not booking_id:
-            print(f"Webhook Received Without Booking ID")
+            logger.warning("Webhook Received Without Booking ID")
             return
 
         # 2. Idempotency Check -> Checking the DB Before Doing Any Work
         current_booking = self.supabase_admin.table(self.table).select("payment_status").eq("id",booking_id).execute()
         if current_booking.data and current_booking.data[0]["payment_status"] == "paid":
-            print(f"Booking {booking_id} is Already Fulfilled. Skipping")
+            logger.info("Booking is Already Fulfilled. Skipping", extra = {"booking_id": booking_id})
             return
 
         # 3. Price Sync and Table Update
@@ -46,6 +63,7 @@ class BookingService:
         self.event_participant_service.create_participant(user_id, event_id)
 
     # Initiate the Checkout Session - For Single Ticket ***
+    @traced()
     def create_checkout_session(self, user_id: str, user_email: str, payload: BookingCreateSchema):
         try:
             # 1. Fetch the Event Detail First
@@ -82,6 +100,7 @@ class BookingService:
                                 )
             pending_count = pending_response.count or 0
             total_held = confirmed_count + pending_count
+            current_span().set_attribute("tickets_held", total_held)
             if total_held + 1 > event["max_slots"]:
                 raise HTTPException(
                     status_code = status.HTTP_400_BAD_REQUEST,
@@ -109,13 +128,11 @@ class BookingService:
                 }
 
             # 4. Handle the Paid Event
-            if not event.get("stripe_price_id"):
-                raise HTTPException(
-                    status_code = status.HTTP_400_BAD_REQUEST,
-                    detail = "Stripe Price Configuration Missing for This Event"
-                )
+            # 4.0 Stripe Prices are Synced by the Outbox Worker -> Only Wait If the Latest Edit Isn't Synced Yet
+            if not event.get("stripe_price_id") or self.stripe_sync.has_pending_sync(payload.event_id):
+                event = self.stripe_sync.wait_for_price(payload.event_id)
             # 4.1 Create the Pending Booking in the Bookings Table
-            amount_cents = int(event["ticket_price"] * 100)
+            amount_cents = to_minor_units(event["ticket_price"], event.get("currency") or "myr") # -> Zero-Decimal Currencies Have No Cents
             booking_response = self.supabase_admin.table(self.table).insert({
                 "user_id": user_id,
                 "event_id": payload.event_id,
@@ -155,7 +172,7 @@ class BookingService:
             self.supabase_admin.table(self.table).update({
                 "stripe_session_id": session.id
             }).eq("id", booking_id).execute()
-            print(session.id)
+            logger.info("Checkout Session Created", extra = {"booking_id": booking_id, "stripe_session_id": session.id})
             return {
                 "booking_id": booking_id,
                 "checkout_url": session.url,
@@ -165,7 +182,7 @@ class BookingService:
         except HTTPException as e:
             raise e
         except Exception as e:
-            print(f"Booking Error: {e}")
+            logger.error("Booking Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Booking Fail: {str(e)}"
@@ -269,6 +286,6 @@ class BookingService:
                 "status": None
             }       
         except Exception as e:
-            print(f"Check Booking Status Error: {e}")
+            logger.error("Check Booking Status Error: %s", e)
             # Fail safe: assume they haven't booked so they aren't blocked unnecessarily
             return {"has_booked": False}
\ No newline at end of file
@@ -1,70 +1,181 @@
+import logging
 from fastapi import HTTPException, status
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict, Counter
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from supabase import Client
 from app.core.database import SupabaseClient
+from app.core.config import settings
+from app.core.tracing import traced
+from app.utils.currency import FxRateNotFound, fx_rates, normalize_currency, to_major_units
+from app.utils.time_buckets import (
+    BUCKET_PREFIX_LENGTH,
+    DEFAULT_CHART_WINDOW,
+    MAX_CHART_BUCKETS,
+    bucket_bookings,
+    count_buckets,
+    floor_to_bucket,
+    next_bucket
+)
+
+logger = logging.getLogger(__name__)
 
 class DashboardService:
     # Initiate the Service Needed in Dashboard API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
-        self.supabase_admin = SupabaseClient.get_service_client()
+    def __init__(self, supabase: Optional[Client] = None, supabase_admin: Optional[Client] = None):
+        self.supabase = supabase or SupabaseClient.get_client()
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
 
-    def _empty_dashboard(self):
+    def _empty_dashboard(self, granularity: str = "day", currency: str = settings.DEFAULT_REPORTING_CURRENCY):
         return {
-            "stats": {"total_revenue": 0, "total_tickets_sold": 0, "total_events_active": 0},
+            "stats": {"total_revenue": 0, "total_tickets_sold": 0, "total_events_active": 0, "currency": currency},
+            "granularity": granularity,
             "sales_chart": [],
             "top_events": [],
             "recent_sales": []
         }
-    
-    # Perform the Dashboard Data Calculation
-    def get_organizer_dashboard(self, user_id: str) -> Dict[str, Any]:
+
+    # Resolve the Chart Window -> Both Ends Aligned to the Bucket Start
+    def _resolve_chart_window(
+        self,
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        granularity: str
+    ) -> Tuple[datetime, datetime]:
+        if granularity not in BUCKET_PREFIX_LENGTH:
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Granularity Must Be One of hour, day, week, month"
+            )
+        # Naive Datetimes From the Query String are Treated as UTC
+        if date_to is None:
+            date_to = datetime.now(timezone.utc)
+        elif date_to.tzinfo is None:
+            date_to = date_to.replace(tzinfo = timezone.utc)
+        if date_from is None:
+            date_from = date_to - DEFAULT_CHART_WINDOW[granularity]
+        elif date_from.tzinfo is None:
+            date_from = date_from.replace(tzinfo = timezone.utc)
+
+        if date_from > date_to:
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "The 'from' Date Must Be Before the 'to' Date"
+            )
+        first_bucket, last_bucket = floor_to_bucket(date_from, granularity), floor_to_bucket(date_to, granularity)
+        if count_buckets(first_bucket, last_bucket, granularity) > MAX_CHART_BUCKETS:
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = f"Chart Range Too Large, Maximum {MAX_CHART_BUCKETS} Points Per Request"
+            )
+        return first_bucket, last_bucket
+
+    # Currency Helper Function -> Minor Units in the Booking Currency to the Reporting Currency
+    # None When Either Side Has No FX Rate -> The Caller Reports the Amount as Unconverted Instead of Failing
+    def _to_reporting(self, amount: int, currency: Optional[str], reporting_currency: str) -> Optional[float]:
+        if not amount:
+            return 0.0
         try:
-            # 1. Retrieve the Event Information
-            event_response = self.supabase.table("event").select("id, title, max_slots").eq("created_by", user_id).execute()
-            if not event_response.data:
-                return self._empty_dashboard()
+            return fx_rates.convert_minor(amount, normalize_currency(currency), reporting_currency)
+        except FxRateNotFound as e:
+            if e.currency == normalize_currency(reporting_currency):
+                raise
+            logger.warning("Dashboard Amount Left Unconverted: %s", e)
+            return None
 
-            my_events = event_response.data
-            my_event_ids = [e["id"] for e in my_events]
-            event_map = {e["id"]: e for e in my_events} # -> Quick Look Up by ID
+    # Unconverted Minor Units per Currency -> Major Units for the Response
+    def _unconverted(self, amounts: Dict[str, int]) -> Dict[str, float]:
+        return {currency: to_major_units(amount, currency) for currency, amount in sorted(amounts.items())}
 
-            # 2. Retrieve All Paid Bookings
-            booking_response = self.supabase.table("bookings").select("*, profile(full_name, email)").in_("event_id", my_event_ids).eq("payment_status", "paid").order("created_at", desc = True).execute()
-            bookings = booking_response.data or []
+    # Build the Sales Chart -> Every Bucket in the Window, Including the Empty Ones
+    def _build_sales_chart(
+        self,
+        buckets: Dict[Tuple[datetime, str], Tuple[int, int]],
+        first_bucket: datetime,
+        last_bucket: datetime,
+        granularity: str,
+        reporting_currency: str
+    ) -> List[Dict[str, Any]]:
+        # Fold the Per-Currency Buckets -> One Conversion Per (Bucket, Currency) Pair
+        totals: Dict[datetime, List[float]] = {}
+        for (start, currency), (amount, tickets) in buckets.items():
+            if start < first_bucket or start > last_bucket:
+                continue
+            slot = totals.setdefault(start, [0.0, 0])
+            # Unconverted Amounts are Reported in the Stats, Not Mixed Into the Chart
+            slot[0] += self._to_reporting(amount, currency, reporting_currency) or 0.0
+            slot[1] += tickets
 
-            # 3. Calculate the Stats & LeaderBoard Data
-            total_revenue = 0.0
-            total_tickets = len(bookings)
+        sales_chart = []
+        current = first_bucket
+        while current <= last_bucket:
+            revenue, tickets = totals.get(current, (0.0, 0))
+            sales_chart.append({
+                "date": current.date(),
+                "bucket_start": current,
+                "daily_revenue": round(revenue, 2),
+                "tickets_sold": tickets
+            })
+            current = next_bucket(current, granularity)
+        return sales_chart
 
-            # 3.1 Aggregators
-            event_revenue = defaultdict[Any, float](float)
-            event_tickets = Counter[Any]()
-            daily_stats = defaultdict(lambda: {"revenue": 0.0, "tickets": 0})
+    # Perform the Dashboard Data Calculation
+    @traced()
+    def get_organizer_dashboard(
+        self,
+        user_id: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        granularity: str = "day",
+        event_id: Optional[str] = None,
+        currency: Optional[str] = None
+    ) -> Dict[str, Any]:
+        try:
+            # 0. Validate the Chart Window Before Touching the Database
+            first_bucket, last_bucket = self._resolve_chart_window(date_from, date_to, granularity)
+            reporting_currency = normalize_currency(currency)
 
-            for b in bookings:
-                amount = b["amount_total"] / 100.0 # -> Convert to MYR
-                clean_date_str = b["created_at"].replace('Z', '+00:00')
-                created_date = datetime.fromisoformat(clean_date_str).date()
-                eid = b["event_id"]
+            # 1. Retrieve the Event Information -> Optionally Narrowed to a Single Event
+            event_query = self.supabase.table("event").select("id, title, max_slots").eq("created_by", user_id)
+            if event_id:
+                event_query = event_query.eq("id", event_id)
+            event_response = event_query.execute()
+            if not event_response.data:
+                return self._empty_dashboard(granularity, reporting_currency)
 
-                # Global Stats
-                total_revenue += amount
+            my_events = event_response.data
+            my_event_ids = [e["id"] for e in my_events]
+            event_map = {e["id"]: e for e in my_events} # -> Quick Look Up by ID
 
-                # Per Event Stats
-                event_revenue[eid] += amount
-                event_tickets[eid] += 1
+            # 2. Paid Totals per (Event, Currency), Summed in SQL -> One Row per Pair, However Many Bookings
+            totals_response = self.supabase.rpc("organizer_booking_totals", {"event_ids": my_event_ids}).execute()
+            booking_totals = totals_response.data or []
 
-                # Time Series
-                daily_stats[created_date]["revenue"] += amount
-                daily_stats[created_date]["tickets"] += 1
+            # 3. Calculate the Stats & LeaderBoard Data -> Convert Each (Event, Currency) Group Once
+            total_tickets = 0
+            event_tickets = Counter()
+            event_revenue = defaultdict(float)
+            event_unconverted: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            total_unconverted: Dict[str, int] = defaultdict(int)
+            for row in booking_totals:
+                eid, booking_currency, amount = row["event_id"], row.get("currency"), row["amount_total"]
+                total_tickets += row["tickets"]
+                event_tickets[eid] += row["tickets"]
+                converted = self._to_reporting(amount, booking_currency, reporting_currency)
+                if converted is None:
+                    # No FX Rate for This Currency -> Keep the Original Amount, Flagged, Out of the Totals
+                    booking_currency = normalize_currency(booking_currency)
+                    event_unconverted[eid][booking_currency] += amount
+                    total_unconverted[booking_currency] += amount
+                    continue
+                event_revenue[eid] += converted
+            total_revenue = round(sum(event_revenue.values()), 2)
 
-            # 4. Top Event 
+            # 4. Top Event
             top_events = []
             for eid, event_data in event_map.items():
                 tickets = event_tickets[eid]
-                revenue = event_revenue[eid]
+                revenue = round(event_revenue[eid], 2)
                 max_slots = event_data["max_slots"]
 
                 # Occupancy Rate Calculation
@@ -74,34 +185,51 @@ class DashboardService:
                     "event_title": event_data["title"],
                     "revenue": revenue,
                     "tickets_sold": tickets,
-                    "occupancy_rate": round(occupancy , 1)
+                    "occupancy_rate": round(occupancy , 1),
+                    "unconverted_revenue": self._unconverted(event_unconverted.get(eid, {}))
                 })
 
             # Sort By Revenue
             top_events.sort(key = lambda x: x["revenue"], reverse = True)
 
-            # 5. Build Sales Chart
-            sales_chart = []
-            today = datetime.now(timezone.utc).date()
-            for i in range(29, -1, -1):
-                d = today - timedelta(days = i)
-                stat = daily_stats.get(d, {"revenue": 0.0, "tickets": 0})
-                sales_chart.append({
-                    "date": d,
-                    "daily_revenue": stat["revenue"],
-                    "tickets_sold": stat["tickets"]
-                })
+            # 5. Build Sales Chart -> Only the Paid Bookings Inside the Chart Window are Fetched
+            chart_response = (
+                self.supabase.table("bookings")
+                .select("amount_total, currency, created_at")
+                .in_("event_id", my_event_ids)
+                .eq("payment_status", "paid")
+                .gte("created_at", first_bucket.isoformat())
+                .lt("created_at", next_bucket(last_bucket, granularity).isoformat())
+                .execute()
+            )
+            buckets = bucket_bookings(chart_response.data or [], granularity)
+            sales_chart = self._build_sales_chart(buckets, first_bucket, last_bucket, granularity, reporting_currency)
 
-            # 6. Build Recent Sales List
+            # 6. Build Recent Sales List -> Only the Latest 10 Rows Need the Buyer Profile
+            recent_response = (
+                self.supabase.table("bookings")
+                .select("id, event_id, amount_total, currency, created_at, profile(full_name, email)")
+                .in_("event_id", my_event_ids)
+                .eq("payment_status", "paid")
+                .order("created_at", desc = True)
+                .limit(10)
+                .execute()
+            )
             recent_sales = []
-            for b in bookings[:10]:
+            for b in recent_response.data or []:
                 profile = b.get("profile") or {}
+                original_currency = normalize_currency(b.get("currency"))
+                original_amount = to_major_units(b["amount_total"], original_currency)
+                amount = self._to_reporting(b["amount_total"], b.get("currency"), reporting_currency)
                 recent_sales.append({
                     "booking_id": b["id"],
                     "event_title": event_map[b["event_id"]]["title"],
                     "buyer_name": profile.get("full_name") or "Unknown",
                     "buyer_email": profile.get("email") or "Hidden",
-                    "amount": b["amount_total"] / 100.0,
+                    "amount": original_amount if amount is None else amount,
+                    "original_amount": original_amount,
+                    "original_currency": original_currency,
+                    "converted": amount is not None,
                     "created_at": b["created_at"]
                 })
 
@@ -109,15 +237,26 @@ class DashboardService:
                 "stats": {
                     "total_revenue": total_revenue,
                     "total_tickets_sold": total_tickets,
-                    "total_events_active": len(my_events)
+                    "total_events_active": len(my_events),
+                    "currency": reporting_currency,
+                    "unconverted_revenue": self._unconverted(total_unconverted)
                 },
+                "granularity": granularity,
                 "sales_chart": sales_chart,
                 "top_events": top_events[:5], # Return top 5 best sellers
                 "recent_sales": recent_sales
             }
 
+        except HTTPException:
+            raise
+        except FxRateNotFound as e:
+            # Only Reached When the Reporting Currency Itself Has No Rate -> Nothing Could Be Converted
+            raise HTTPException(
+                status_code = status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail = f"Analytics Fail: {str(e)}"
+            )
         except Exception as e:
-            print("Dashboard Error: {e}")
+            logger.error("Dashboard Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Analytics Fail: {str(e)}"
@@ -1,15 +1,28 @@
-from typing import List, Dict, Any
+import logging
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import HTTPException, status
+from supabase import Client
 from app.core.database import SupabaseClient
+from app.core.config import settings
+from app.core.last_known_good import last_known_good
+
+logger = logging.getLogger(__name__)
 
 class CategoryService:
     # Initialize the Service Needed in the Category API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
+    def __init__(self, supabase: Optional[Client] = None):
+        self.supabase = supabase or SupabaseClient.get_client()
         self.table = "event_categories"
+        # (Loaded At, Categories) -> Categories Rarely Change, So Reads are Served From Memory Within the Window
+        self._cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
 
     # Get All Event Categories -> Move the Other Category to the End
+    @last_known_good()
     def get_all_categories(self) -> List[Dict[str, Any]]:
+        cached = self._cache
+        if cached and time.monotonic() - cached[0] < settings.CATEGORY_CACHE_SECONDS:
+            return cached[1]
         try:
             # Fetch Data Sorted Alphabetically by Name From event_categories Table
             response = self.supabase.table(self.table).select("*").order("name").execute()
@@ -30,9 +43,11 @@ class CategoryService:
                 else:
                     regular_categories.append(item)
             # Return the Combine List
-            return regular_categories + other_categories
+            categories = regular_categories + other_categories
+            self._cache = (time.monotonic(), categories)
+            return categories
         except Exception as e:
-            print(f"Category Service Error: {e}")
+            logger.error("Category Service Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Category Service Error: {str(e)}"
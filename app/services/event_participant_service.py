@@ -1,11 +1,15 @@
+import logging
 from fastapi import HTTPException, status
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from supabase import Client
 from app.core.database import SupabaseClient
 
+logger = logging.getLogger(__name__)
+
 class EventParticipantService: 
     # Initialize the Service Needed to be Used in Event Participant API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
+    def __init__(self, supabase: Optional[Client] = None):
+        self.supabase = supabase or SupabaseClient.get_client()
         self.table = "event_participants"
         
     def create_participant(self, user_id: str, event_id: str) -> Dict[str, Any]:
@@ -27,7 +31,7 @@ class EventParticipantService:
 
             return response.data[0]
         except Exception as e:
-            print(f"Error Participant Error: {e}")
+            logger.error("Create Participant Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Event Registration Failed: {str(e)}"
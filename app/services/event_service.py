@@ -1,85 +1,69 @@
-import stripe
+import logging
+from uuid import uuid4
 from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, UploadFile, status
+from supabase import Client
 from app.core.database import SupabaseClient
-from app.core.config import settings
+from app.core.last_known_good import last_known_good
+from app.core.tracing import traced
 from app.schemas.event import EventUpdateSchema
-from app.utils.storage import StorageService
+from app.utils.storage import StorageService, variant_url
 from collections import Counter
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
+logger = logging.getLogger(__name__)
 
 class EventService:
     # Initialize the Service Needed in the Event API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
-        self.supabase_admin = SupabaseClient.get_service_client()
-        self.storage = StorageService()
-        self.table = "event"
-
-    # Storage Path Helper Function -> Extracts the Relative Path From a Supabase Public URL
-    def _extract_path_from_url(
+    def __init__(
         self,
-        url: str
-    ) -> Optional[str]:
-        try:
-            bucket_name = settings.EVENT_IMAGE_BUCKET
-            # URL: https://.../storage/v1/object/public/events_bucket/folder/image.png
-            if bucket_name in url:
-                parts = url.split(f"/{bucket_name}/")
-                if len(parts) > 1:
-                    return parts[1]
-            return None
-        except Exception:
-            return None
-
-    # Stripe Helper Function -> Used to Create the Product and Price in Stripe and Return Their IDs
-    def _ensure_stripe_product(
-        self, 
-        title: str, 
-        description: str, 
-        price: float, 
-        currency: str
+        supabase: Optional[Client] = None,
+        supabase_admin: Optional[Client] = None,
+        storage: Optional[StorageService] = None
     ):
-        try:
-            # 1. Create the Product
-            product = stripe.Product.create(name = title, description = description or "")
-            # 2. Create the Product Price
-            unit_amount = int(price * 100) # Due to Stripe Expects the Amount in Cents
-            price_obj = stripe.Price.create(
-                unit_amount = unit_amount,
-                currency = currency.lower(),
-                product = product.id
-            )
-            # 3. Return Both IDs
-            return product.id, price_obj.id
-        except Exception as e:
-            print(f"Stripe Error: {e}")
-            raise HTTPException(
-                status_code = status.HTTP_400_BAD_REQUEST,
-                detail = f"Stripe Error: {str(e)}"
-            )
+        self.supabase = supabase or SupabaseClient.get_client()
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
+        self.storage = storage or StorageService(self.supabase_admin)
+        self.table = "event"
 
     # Event Create Function
+    @traced()
     def create_event(
         self, 
         user_id: str, 
         event_data: dict, 
-        image_file: UploadFile
+        image_file: Optional[UploadFile] = None,
+        image_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Event Create Flow ->
-            1. Insert Event -> Get Event ID
-            2. Upload Image Using Event ID
-            3. Create Stripe Product -> If the Event is Paid
-            4. Update Event with Image URL and Stripe Product and Price ID
-            5. Map the Event to Corresponding Category
+            1. Generate the Event ID Up Front
+            2. Upload Image -> Stored Under Its Content Hash, Reused If the Same Bytes Were Uploaded Before
+               -> Or Finalize an Image the Client Already Uploaded Through a Signed Upload URL
+            3. Insert the Complete Event Row with Image URL and Map It to Its Category in One Transaction
+               -> The Database Trigger Records the Stripe Outbox Row in the Same Transaction for Paid Events
         """
-        # Initialize the Rollback ID
-        created_event_id = None
+        # Initialize the Rollback State
+        upload_result = None
         try: 
-            # 1. Prepare the Initial Payload
-            initial_payload = {
+            # 1. Generate the Event ID -> The Row is Written Once, Together With the Image URL
+            event_id = str(uuid4())
+
+            # 2. Upload Image to the Supabase Bucket Storage
+            if image_path:
+                upload_result = self.storage.complete_event_image_upload(user_id, image_path)
+            elif image_file:
+                upload_result = self.storage.upload_event_image(image_file)
+            else:
+                raise HTTPException(
+                    status_code = status.HTTP_400_BAD_REQUEST,
+                    detail = "Event Image is Required"
+                )
+
+            # 3. Insert the Complete Payload and the Category Mapping Through One Database Function
+            #    Either Both Rows Exist or Neither Does -> No Zombie Event to Delete If the Mapping Fails
+            #    Stripe Product and Price are Created by the Outbox Worker -> The Request Doesn't Wait on Stripe
+            payload = {
+                "id": event_id,
                 "title": event_data["title"],
                 "description": event_data["description"],
                 "location": event_data["location"],
@@ -90,76 +74,61 @@ class EventService:
                 "ticket_price": event_data.get("ticket_price", 0),
                 "currency": event_data.get("currency", "MYR"),
                 "event_status": event_data.get("event_status", "published"),
-                "created_by": user_id
+                "created_by": user_id,
+                "image_url": upload_result["url"] or ""
             }
-
-            # 2. Insert the Initial Payload to the Event Table to Get the Event ID
-            insert_response = self.supabase.table(self.table).insert(initial_payload).execute()
+            insert_response = self.supabase.rpc("create_event_with_category", {
+                "payload": payload,
+                "category_id": event_data.get("category_id") or None
+            }).execute()
             if not insert_response or len(insert_response.data) == 0: 
                 raise HTTPException(
                     status_code = status.HTTP_400_BAD_REQUEST,
                     detail = "Fail to Initialize the Event"
                 )
-            # 2.1 Retrieve the Event ID
-            created_event = insert_response.data[0]
-            created_event_id = created_event["id"]
-
-            # 3. Perform External Action
-            # 3.1 Upload Image to the Supabase Bucket Storage
-            upload_result = self.storage.upload_event_image(image_file, created_event_id)
-            image_url = upload_result["url"]
-            # 3.2 Generate the Stripe ID If the Event Requires Payment
-            stripe_product_id = None
-            stripe_price_id = None
-
-            if event_data.get("is_paid") and event_data.get("ticket_price", 0) > 0:
-                stripe_product_id, stripe_price_id = self._ensure_stripe_product(
-                    title = event_data["title"],
-                    description = event_data["description"],
-                    price = event_data["ticket_price"],
-                    currency = event_data.get("currency", "MYR")
-                )
-
-            # 4. Update the Event with New Data
-            updated_payload = {
-                "image_url": image_url or "",
-                "stripe_product_id": stripe_product_id or "",
-                "stripe_price_id": stripe_price_id or ""
-            }
-
-            update_response = (
-                self.supabase.table(self.table).update(updated_payload).eq("id", created_event_id).execute()
-            )
-
-            if not update_response.data:
-                raise HTTPException(
-                    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail = "Failed to Update Event"
-                )
-
-            final_event = update_response.data[0]
-
-            # 5. Map the Event to the Corresponding Category
-            category_id = event_data["category_id"]
-            if category_id:
-                self.supabase.table("event_category_map").insert({
-                    "event_id": created_event_id,
-                    "category_id": category_id
-                }).execute()
-
-            return final_event
+            return insert_response.data[0]
+        except HTTPException:
+            # Rejected Input (Missing Image, Not an Image, Too Large) Keeps Its Own Status
+            self._rollback_create(upload_result)
+            raise
         except Exception as e:
-            # If Image Upload or Stripe Fail, Delete the Zombie Event Row
-            if created_event_id: 
-                print(f"Error Occured. Rolling Back Event {created_event_id}...")
-                self.supabase.table(self.table).delete().eq("id", created_event_id).execute()
-            print(f"Create Event Fail: {e}")
+            self._rollback_create(upload_result)
+            logger.error("Create Event Fail: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Create Event Fail: {str(e)}"
             )
 
+    # If Any Step Fail, Schedule the Uploaded Image for Collection
+    #    The Event Row and Its Mapping are Written in One Transaction -> Nothing in the Database to Undo
+    def _rollback_create(self, upload_result: Optional[dict]):
+        if upload_result:
+            self.storage.delete_event_image(upload_result["path"])
+
+    # Link a Directly Uploaded Image to an Existing Event
+    @traced()
+    def attach_uploaded_image(
+        self,
+        event_id: str,
+        user_id: str,
+        image_path: str
+    ) -> Dict[str, Any]:
+        # 1. Check the Ownership Before Touching Storage
+        response = self.supabase.table(self.table).select("id").eq("id", event_id).eq("created_by", user_id).execute()
+        if not response.data:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "Event Not Found"
+            )
+        # 2. Verify the Uploaded Object -> Its Variants are Generated by the Image Variant Worker
+        upload_result = self.storage.complete_event_image_upload(user_id, image_path)
+        # 3. Link the Image -> The Update Also Removes the Previous Image
+        self.update_event(event_id, user_id, EventUpdateSchema(image_url = upload_result["url"]))
+        return upload_result
+
     # Get the Event List
+    @last_known_good()
+    @traced()
     def list_events(
         self, 
         page: int = 1, 
@@ -214,6 +183,10 @@ class EventService:
                 # 5.4 Attach the count to each item
                 for item in items:
                     item["current_bookings"] = booking_counts[item["id"]]
+
+                    # The Listing Grid Only Needs the Card-Size Banner -> Keep the Original for Detail Views
+                    item["image_original_url"] = item.get("image_url")
+                    item["image_url"] = variant_url(item.get("image_url"), "card")
                     
                     # (Existing logic) Clean up category map
                     if category_id:
@@ -226,13 +199,15 @@ class EventService:
                 "size": size
             }
         except Exception as e:
-            print(f"List Events Error: {e}")
+            logger.error("List Events Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = "Failed to Fetch Event"
             )
 
     # Get the Event by Event ID
+    @last_known_good()
+    @traced()
     def get_event(
         self, 
         event_id: str
@@ -257,8 +232,10 @@ class EventService:
             else:
                 event["organizer"] = {"full_name": "Unknown Organizer"}
             return event
+        except HTTPException:
+            raise
         except Exception as e:
-            print(f"Get Even Error: {e}")
+            logger.error("Get Event Error: %s", e, extra = {"event_id": event_id})
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Failed to Get Event {str(e)}"
@@ -287,28 +264,10 @@ class EventService:
                     detail = "Cannot Delete Event, There Are Active Bookings Associate With It."
                 )
             
-            # 1.2 Retreive the Needed Data
-            event = response.data[0]
-            stripe_product_id = event.get("stripe_product_id")
-            stripe_price_id = event.get("stripe_price_id")
-            image_url = event.get("image_url")
-
-            # 2. Archieve Stripe Product and Price - Note: Need to Remove Price First
-            try:
-                if stripe_price_id: 
-                    stripe.Price.modify(stripe_price_id, active = False)
-                if stripe_product_id:
-                    stripe.Product.modify(stripe_product_id, active = False)
-            except Exception as e:
-                print(f"Stripe Cleanup Warning: {e}")
+            # 2. Stripe Product and Price are Archived by the Outbox Worker -> The Delete Trigger Records Them
+            #    The Image is Collected by the Storage GC Worker -> The Delete Trigger Records It Too
 
-            # 3. Delete the Image In Supabase Bucket Storage 
-            if image_url:
-                file_path = self._extract_path_from_url(image_url)
-                if file_path:
-                    self.storage.delete_event_image(file_path)
-
-            # 4. Delete Database Record 
+            # 3. Delete Database Record 
             self.supabase_admin.table(self.table).delete().eq("id", event_id).execute()
             
             return {
@@ -317,7 +276,7 @@ class EventService:
         except HTTPException as e:
             raise e
         except Exception as e:
-            print(f"Delete Event Error: {e}")
+            logger.error("Delete Event Error: %s", e, extra = {"event_id": event_id})
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = f"Delete Event Error: {str(e)}"
@@ -332,12 +291,12 @@ class EventService:
     ) -> Dict[str, Any]:
         """
         Scneraio Needed to Be Considered:
-            1. Update the Image URL -> Need to Delete the Old File and Link the New File to the Updated Image URL
+            1. Update the Image URL -> Link the New File, the Old File is Collected Later by the Storage GC Worker
             2. Update the Category -> Remove the Original Row in the Event Category Map Table and Insert the New One
             3. Price Update:
-                3.1 Is Paid to Free -> Archieve the Price and Product in Stripe -> Update the Data
-                3.2 Free to Paid -> Create the New Price and Product in Stripe -> Update the Data
-                3.3 Price or Currency Change -> Achieve the Old Price -> Create the New Price and Associate to the Product -> Update the Data
+                3.1 Is Paid to Free -> Reset the Ticket Price -> Stripe Artifacts are Archived by the Outbox Worker
+                3.2 Free to Paid -> Stripe Product and Price are Created by the Outbox Worker
+                3.3 Price or Currency Change -> The Outbox Worker Archives the Old Price and Creates the New One
         """
         try:
             # 1. Fetch the Old Data -> We Need the Current State to Determine What is Changed
@@ -354,20 +313,7 @@ class EventService:
             # 1.3 Convert the Pydantic Model to Dict, and Ignoring the Fields The User Didn't Send
             updates = payload.model_dump(exclude_unset=True)
 
-            # 2. Handle the Image URL Update
-            if "image_url" in updates:
-                new_url = updates["image_url"]
-                old_url = old_event.get("image_url")
-                # 2.1 If URL Changed, Delete the Old File From Storage
-                if old_url and new_url != old_url:
-                    try:
-                        # 2.2 Get the File Path
-                        old_file_path = self._extract_path_from_url(old_url)
-                        if old_file_path:
-                            # 2.3 Delete the File in the Bucket Storage
-                            self.storage.delete_event_image(old_file_path)
-                    except Exception as e:
-                        print(f"Image Cleanup Warning: {e}")
+            # 2. Image URL Update -> The Update Trigger Records the Old File for the Storage GC Worker
 
             # 3. Handle the Category Update
             category_changed = False
@@ -390,94 +336,11 @@ class EventService:
                 category_changed = True
             
             # 4. Handle Stripe State Transitions
-            if "is_paid" in updates or "ticket_price" in updates or "currency" in updates or "title" in updates or "description" in updates:
-                # 4.1.1 Resolve Current State
-                new_is_paid = updates.get("is_paid", old_event["is_paid"])
-                new_ticket_price = updates.get("ticket_price", old_event.get("ticket_price", 0))
-                new_currency = updates.get("currency", old_event.get("currency", "MYR"))
-                old_is_paid = old_event["is_paid"]
-
-                current_title = updates.get("title", old_event["title"])
-                current_desc = updates.get("description", old_event["description"])
-
-                # 4.1.2 Detect Changes
-                price_changed = new_ticket_price != old_event.get("ticket_price")
-                currency_changed = new_currency != old_event.get("currency")
+            #    The Update Trigger Records an Outbox Row and the Worker Creates, Re-Prices or Archives in Stripe
+            #    Switching to Free Only Needs the Price Reset Here
+            if updates.get("is_paid") is False:
+                updates["ticket_price"] = 0
 
-                text_changed = (
-                    updates.get("title") is not None and updates["title"] != old_event["title"]
-                ) or (
-                    updates.get("description") is not None and updates["description"] != old_event["description"]
-                ) 
-
-                # 4.2 Scenario 1 - Paid -> Free
-                if old_is_paid and not new_is_paid:
-                    # 4.2.1 Archieve Old Stripe Artifacts
-                    try: 
-                        if old_event.get("stripe_price_id"):
-                            stripe.Price.modify(old_event.get("stripe_price_id"), active = False)
-                        if old_event.get("stripe_product_id"):
-                            stripe.Product.modify(old_event.get("stripe_product_id"), active = False)
-                    except Exception as e:
-                        print(f"Stripe Archieving Warning: {e}")
-                    # 4.2.1 Update the updates Dict
-                    updates.update({
-                        "stripe_price_id": None,
-                        "stripe_product_id": None,
-                        "ticket_price": 0,
-                        "is_paid": False
-                    })
-                # 4.3 Scenario 2 - Free -> Paid
-                elif not old_is_paid and new_is_paid:
-                    # 4.3.1 Create the New Price and Product in the Stripe
-                    prod_id, price_id = self._ensure_stripe_product(
-                        title = current_title,
-                        description = current_desc,
-                        price = new_ticket_price,
-                        currency = new_currency
-                    )
-                    # 4.3.2 Update the updates Dict
-                    updates.update({
-                        "stripe_price_id": price_id,
-                        "stripe_product_id": prod_id,
-                        "ticket_price": new_ticket_price,
-                        "is_paid": True
-                    })
-                # 4.4 Scenario 3 - Price Changed
-                elif old_is_paid and new_is_paid:
-                    # 4.4.1 Retrieve the Product ID
-                    prod_id = old_event["stripe_product_id"]
-                    # 4.4.2 Handle Price and Currency Changed
-                    if price_changed or currency_changed:
-                        # 4.4.2.1 Archieve the Old Product Price First
-                        if old_event.get("stripe_price_id"):
-                            try:
-                                stripe.Price.modify(old_event["stripe_price_id"], active=False)
-                            except Exception as e:
-                                print(f"Stripe Price Archieving Fail: {e}")
-                            if prod_id:
-                                # Add the New Created Price to the Current Product
-                                try: 
-                                    new_price_obj = stripe.Price.create(
-                                        product = prod_id,
-                                        unit_amount = int(new_ticket_price*100),
-                                        currency = new_currency.lower()
-                                    )
-                                    updates["stripe_price_id"] = new_price_obj.id
-                                except Exception as e:
-                                    print(f"Stripe Price Creation Fail: {e}")
-                                    # Fallback Function
-                                    p_id, pr_id = self._ensure_stripe_product(current_title, current_desc, new_ticket_price, new_currency)
-                                    updates["stripe_product_id"] = p_id
-                                    updates["stripe_price_id"] = pr_id
-                                    prod_id = p_id
-                    # 4.4.3 Handle the Text Changed
-                    if text_changed and prod_id:
-                        try:
-                            stripe.Product.modify(prod_id, name = current_title, description = current_desc or "")
-                        except Exception as e:
-                            print(f"Stripe Meta Data Update Warning: {e}")
-                    
             # 5. Execute Event Table Update
             if updates:
                 response = self.supabase.table(self.table).update(updates).eq("id", event_id).execute()
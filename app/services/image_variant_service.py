@@ -0,0 +1,100 @@
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from supabase import Client
+from app.core.database import SupabaseClient
+from app.core.config import settings
+from app.utils.image_processing import InvalidImageError
+from app.utils.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+
+class ImageVariantService:
+    """
+    Generate the Variants of Directly Uploaded Images Through the image_variant_jobs Table
+        - Completing a Direct Upload Only Checks the Object's Metadata and Magic Bytes, Then Records a Job Here
+        - The Background Worker Claims Due Jobs, Downloads the Original Through the Storage Client and Uploads the Variants
+        - Failed Jobs are Retried With Exponential Backoff, Images That Don't Decode are Marked Dead Right Away
+    """
+    def __init__(self, supabase_admin: Optional[Client] = None, storage: Optional[StorageService] = None):
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
+        self.storage = storage or StorageService(self.supabase_admin)
+        self.table = "image_variant_jobs"
+
+    # Claim a Batch of Due Jobs -> Pushing next_attempt_at Forward Acts as a Lease Between Workers
+    def _claim_batch(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        due_response = (
+            self.supabase_admin.table(self.table)
+            .select("id")
+            .eq("status", "pending")
+            .lte("next_attempt_at", now.isoformat())
+            .order("id")
+            .limit(settings.IMAGE_VARIANT_BATCH_SIZE)
+            .execute()
+        )
+        due_ids = [row["id"] for row in due_response.data or []]
+        if not due_ids:
+            return []
+        # Only Jobs Still Due are Updated -> Jobs Another Worker Claimed in Between are Skipped
+        lease_until = now + timedelta(seconds = settings.IMAGE_VARIANT_LEASE_SECONDS)
+        claim_response = (
+            self.supabase_admin.table(self.table)
+            .update({"next_attempt_at": lease_until.isoformat()})
+            .in_("id", due_ids)
+            .eq("status", "pending")
+            .lte("next_attempt_at", now.isoformat())
+            .execute()
+        )
+        return sorted(claim_response.data or [], key = lambda row: row["id"])
+
+    # Process One Batch -> Return True If the Batch Was Full and More Jobs May Be Waiting
+    def process_batch(self) -> bool:
+        rows = self._claim_batch()
+        if not rows:
+            return False
+
+        done_ids = []
+        for row in rows:
+            try:
+                self.storage.generate_variants(row["bucket"], row["path"], row["variants"])
+                done_ids.append(row["id"])
+            except FileNotFoundError:
+                # Collected or Replaced Before the Job Ran -> Nothing Left to Build
+                done_ids.append(row["id"])
+            except (InvalidImageError, HTTPException) as e:
+                # Passed the Magic-Byte Check but Doesn't Decode (or Grew Past the Cap) -> Retrying Won't Help
+                logger.warning("Image Variant Job Rejected: %s", e, extra = {"bucket": row["bucket"], "path": row["path"]})
+                self._fail(row, e, dead = True)
+            except Exception as e:
+                logger.error("Image Variant Error: %s", e, extra = {"bucket": row["bucket"], "path": row["path"]})
+                self._fail(row, e)
+
+        if done_ids:
+            self.supabase_admin.table(self.table).update({
+                "status": "done",
+                "processed_at": datetime.now(timezone.utc).isoformat(),
+                "last_error": None
+            }).in_("id", done_ids).execute()
+        return len(rows) >= settings.IMAGE_VARIANT_BATCH_SIZE
+
+    # Retry Helper Function -> Exponential Backoff With Full Jitter
+    def _fail(self, row: Dict[str, Any], error: Exception, dead: bool = False):
+        attempts = row.get("attempts", 0) + 1
+        if dead or attempts >= settings.IMAGE_VARIANT_MAX_ATTEMPTS:
+            update = {"status": "dead", "attempts": attempts, "last_error": str(error)[:1000]}
+        else:
+            backoff = min(
+                settings.IMAGE_VARIANT_MAX_BACKOFF_SECONDS,
+                settings.IMAGE_VARIANT_BACKOFF_SECONDS * (2 ** attempts)
+            )
+            next_attempt = datetime.now(timezone.utc) + timedelta(seconds = random.uniform(backoff / 2, backoff))
+            update = {"attempts": attempts, "next_attempt_at": next_attempt.isoformat(), "last_error": str(error)[:1000]}
+        try:
+            self.supabase_admin.table(self.table).update(update).eq("id", row["id"]).execute()
+        except Exception as e:
+            # The Lease Expires On Its Own -> The Job Will Be Picked Up Again
+            logger.warning("Image Variant Retry Scheduling Failed: %s", e)
@@ -1,17 +1,27 @@
+import logging
 from fastapi import HTTPException, status, UploadFile
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
+from supabase import Client
 from app.core.database import SupabaseClient
+from app.core.last_known_good import last_known_good
 from app.schemas.profile import ProfileResponse, ProfileUpdate  
 from app.utils.storage import StorageService
 
+logger = logging.getLogger(__name__)
+
 class ProfileService:
     # Initiate the Service Needed in Profile API
-    def __init__(self):
-        self.supabase = SupabaseClient.get_client()
-        self.supabase_admin = SupabaseClient.get_service_client()
+    def __init__(
+        self,
+        supabase: Optional[Client] = None,
+        supabase_admin: Optional[Client] = None,
+        storage: Optional[StorageService] = None
+    ):
+        self.supabase = supabase or SupabaseClient.get_client()
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
         self.table = "profile"
-        self.storage = StorageService()
+        self.storage = storage or StorageService(self.supabase_admin)
 
     # Get the Profile Detail
     def get_profile(self, user_id: str) -> Dict[str, Any]:
@@ -63,13 +73,23 @@ class ProfileService:
     
 
     # Get Public Profile
+    @last_known_good()
     def get_public_profile(self, user_id: str) -> Dict[str, Any]:
         try: 
             profile_response = self.supabase.table(self.table).select("full_name, email, bio, avatar_url").eq("id", user_id).execute()
-            return profile_response.data[0]
         except Exception as e:
+            # Malformed ID (Postgres 22P02) is Still Not Found -> Anything Else is Supabase Failing
+            if getattr(e, "code", None) != "22P02":
+                logger.error("Get Public Profile Error: %s", e, extra = {"user_id": user_id})
+                raise HTTPException(
+                    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail = "Failed to Fetch Profile"
+                )
+            profile_response = None
+        if not profile_response or not profile_response.data:
             raise HTTPException(
                 status_code = status.HTTP_404_NOT_FOUND,
                 detail = "User Not Found"
             )
+        return profile_response.data[0]
             
\ No newline at end of file
@@ -0,0 +1,212 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from postgrest.types import ReturnMethod
+from supabase import Client
+from app.core.database import SupabaseClient
+from app.core.config import settings
+from app.utils.image_processing import AVATAR_VARIANTS, EVENT_IMAGE_VARIANTS
+from app.utils.storage import ORIGINAL_NAME, path_from_url, variant_path
+
+# Storage API Limit on Objects per Remove Call
+REMOVE_CHUNK_SIZE = 1000
+# Paths per Reference Lookup -> Keeps the PostgREST Query String Short
+LOOKUP_CHUNK_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class StorageGcService:
+    """
+    Delete Storage Objects Nothing References, Off the Request Path
+        - Candidates Come From Database Triggers (Replaced or Deleted Images) and the API (Rollbacks, Rejected Uploads)
+        - Candidates are Only Collected After a Grace Period, and References are Re-Checked Right Before Each Remove
+        - Reusing a Stored Image (Upload Dedup) Drops Its Candidate -> The Grace Period Starts Over
+        - A Periodic Sweep Diffs the Bucket Listings Against the Table URLs -> Leaks Nothing Recorded are Recorded as
+          Candidates, Never Deleted by the Sweep Itself, So They Go Through the Same Grace Period and Re-Check
+    """
+    def __init__(self, supabase_admin: Optional[Client] = None):
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
+        self.table = "storage_gc_candidates"
+        # Bucket -> (Table, Column Holding the Public URL, Folder to Sweep, Variants Stored Next to Each Original)
+        self.buckets: Dict[str, Tuple[str, str, str, Dict[str, int]]] = {
+            settings.EVENT_IMAGE_BUCKET: ("event", "image_url", settings.EVENT_IMAGE_FOLDER, EVENT_IMAGE_VARIANTS),
+            settings.AVATAR_BUCKET: ("profile", "avatar_url", "", AVATAR_VARIANTS)
+        }
+        self._last_sweep = 0.0
+
+    # Worker Job -> Collect a Batch of Candidates, Then Sweep When the Interval Has Passed
+    def run_once(self) -> bool:
+        has_more = self.collect_candidates()
+        if time.monotonic() - self._last_sweep >= settings.STORAGE_GC_SWEEP_SECONDS:
+            self._last_sweep = time.monotonic()
+            for bucket in self.buckets:
+                try:
+                    found = self.sweep(bucket)
+                    if found:
+                        logger.info("Storage GC Sweep Found %s Orphaned Objects", found, extra = {"bucket": bucket})
+                except Exception as e:
+                    logger.error("Storage GC Sweep Error: %s", e, extra = {"bucket": bucket})
+        return has_more
+
+    # Process One Batch of Recorded Candidates -> Return True If the Batch Was Full and More May Be Waiting
+    def collect_candidates(self) -> bool:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds = settings.STORAGE_GC_GRACE_SECONDS)
+        response = (
+            self.supabase_admin.table(self.table)
+            .select("id, bucket, path")
+            .lte("created_at", cutoff.isoformat())
+            .order("created_at")
+            .limit(settings.STORAGE_GC_BATCH_SIZE)
+            .execute()
+        )
+        rows = response.data or []
+        if not rows:
+            return False
+
+        rows_by_bucket: Dict[str, List[Dict]] = {}
+        for row in rows:
+            rows_by_bucket.setdefault(row["bucket"], []).append(row)
+
+        done_ids = []
+        failed = False
+        for bucket, bucket_rows in rows_by_bucket.items():
+            # Unknown Bucket -> Not Ours to Delete From, Just Drop the Candidates
+            if bucket in self.buckets:
+                try:
+                    paths = sorted({row["path"] for row in bucket_rows})
+                    # Re-Check Each Chunk Right Before Its Remove -> A Link Saved or a Reuse Meanwhile Still Saves the Object
+                    for chunk in _chunks(paths, LOOKUP_CHUNK_SIZE):
+                        pending = self._pending_paths(bucket, chunk)
+                        referenced = self._referenced_paths(bucket, pending)
+                        self._delete_objects(bucket, [path for path in pending if path not in referenced])
+                except Exception as e:
+                    # Keep the Candidates -> Retried on the Next Poll
+                    logger.error("Storage GC Error: %s", e, extra = {"bucket": bucket})
+                    failed = True
+                    continue
+            done_ids.extend(row["id"] for row in bucket_rows)
+
+        for ids in _chunks(done_ids, LOOKUP_CHUNK_SIZE * 4):
+            self.supabase_admin.table(self.table).delete().in_("id", ids).execute()
+        return len(rows) >= settings.STORAGE_GC_BATCH_SIZE and not failed
+
+    # Which of These Paths are Still Queued -> A Reuse Cancels the Candidate After This Batch Was Read
+    def _pending_paths(self, bucket: str, paths: List[str]) -> List[str]:
+        response = self.supabase_admin.table(self.table).select("path").eq("bucket", bucket).in_("path", paths).execute()
+        pending = {row["path"] for row in response.data or []}
+        return [path for path in paths if path in pending]
+
+    # Reference Helper Function -> Which of These Paths Does a Row Still Point At
+    def _referenced_paths(self, bucket: str, paths: List[str]) -> Set[str]:
+        table, column, _, _ = self.buckets[bucket]
+        storage = self.supabase_admin.storage.from_(bucket)
+        referenced = set()
+        for chunk in _chunks(paths, LOOKUP_CHUNK_SIZE):
+            urls = []
+            for path in chunk:
+                url = storage.get_public_url(path)
+                # Older Rows Were Saved With a Trailing "?" by Earlier Client Versions
+                urls.extend([url, f"{url}?"])
+            response = self.supabase_admin.table(table).select(column).in_(column, urls).execute()
+            for row in response.data or []:
+                path = path_from_url(row[column], bucket)
+                if path:
+                    referenced.add(path)
+        return referenced
+
+    # Delete the Originals and Their Variants -> Large Batched Remove Calls
+    def _delete_objects(self, bucket: str, paths: List[str]):
+        _, _, _, variants = self.buckets[bucket]
+        objects = []
+        for path in paths:
+            objects.append(path)
+            objects.extend(variant_path(path, name) for name in variants if variant_path(path, name) != path)
+        storage = self.supabase_admin.storage.from_(bucket)
+        for chunk in _chunks(objects, REMOVE_CHUNK_SIZE):
+            storage.remove(chunk)
+
+    # Every Path the Table Currently References in the Bucket
+    # Keyset Pages on id -> Rows Deleted Between Pages Can't Shift Later Rows Past the Cursor Like an Offset Would
+    def _all_referenced_paths(self, bucket: str) -> Set[str]:
+        table, column, _, _ = self.buckets[bucket]
+        page_size = settings.STORAGE_GC_LIST_PAGE_SIZE
+        referenced = set()
+        last_id = None
+        while True:
+            query = self.supabase_admin.table(table).select(f"id, {column}").not_.is_(column, "null")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.order("id").limit(page_size).execute().data or []
+            for row in rows:
+                path = path_from_url(row[column], bucket)
+                if path:
+                    referenced.add(path)
+            if len(rows) < page_size:
+                return referenced
+            last_id = rows[-1]["id"]
+
+    # Walk the Bucket Folder by Folder -> Yields (Folder, Files) With Paged Listings
+    def _walk(self, bucket: str, prefix: str) -> Iterator[Tuple[str, List[Dict]]]:
+        storage = self.supabase_admin.storage.from_(bucket)
+        page_size = settings.STORAGE_GC_LIST_PAGE_SIZE
+        pending = [prefix]
+        while pending:
+            folder = pending.pop()
+            files = []
+            offset = 0
+            while True:
+                page = storage.list(folder or None, {
+                    "limit": page_size,
+                    "offset": offset,
+                    "sortBy": {"column": "name", "order": "asc"}
+                })
+                for item in page:
+                    name = item["name"]
+                    if item.get("id") is None:
+                        # Folders Have No Object ID
+                        pending.append(f"{folder}/{name}" if folder else name)
+                    elif not name.startswith("."):
+                        files.append(item)
+                if len(page) < page_size:
+                    break
+                offset += page_size
+            if files:
+                yield folder, files
+
+    # Diff the Bucket Listing Against the Table -> Record Objects Older Than the Grace Period That Nothing References
+    # The Reference Snapshot Only Filters -> The Walk Can Take Long, So collect_candidates Decides Right Before Removing
+    def sweep(self, bucket: str) -> int:
+        _, _, prefix, _ = self.buckets[bucket]
+        referenced = self._all_referenced_paths(bucket)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds = settings.STORAGE_GC_GRACE_SECONDS)
+
+        orphans = set()
+        for folder, files in self._walk(bucket, prefix):
+            # Variants Belong to the Original in the Same Folder -> Recorded (and Removed) Together With It
+            original = next((item for item in files if item["name"].startswith(f"{ORIGINAL_NAME}.")), None)
+            for item in files:
+                path = f"{folder}/{item['name']}" if folder else item["name"]
+                owner = (f"{folder}/{original['name']}" if folder else original["name"]) if original else path
+                if owner in referenced or owner in orphans:
+                    continue
+                created_at = (original or item).get("created_at")
+                if not created_at or datetime.fromisoformat(created_at.replace("Z", "+00:00")) > cutoff:
+                    continue
+                orphans.add(owner)
+
+        # Already Recorded Paths Keep Their Original Time -> Repeated Sweeps Don't Push Collection Back
+        for chunk in _chunks(sorted(orphans), REMOVE_CHUNK_SIZE):
+            self.supabase_admin.table(self.table).upsert(
+                [{"bucket": bucket, "path": path} for path in chunk],
+                on_conflict = "bucket,path",
+                ignore_duplicates = True,
+                returning = ReturnMethod.minimal
+            ).execute()
+        return len(orphans)
@@ -0,0 +1,219 @@
+import logging
+import random
+import time
+import stripe
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+from fastapi import HTTPException, status
+from supabase import Client
+from app.core.database import SupabaseClient
+from app.core.config import settings
+from app.core.tracing import traced
+from app.utils.currency import to_minor_units
+
+stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    stripe.api_base = settings.STRIPE_API_BASE
+
+logger = logging.getLogger(__name__)
+
+class StripeSyncService:
+    """
+    Reconcile Stripe Products and Prices With the Event Table Through the stripe_outbox Table
+        - Database Triggers Record an Outbox Row Whenever an Event's Stripe-Relevant Columns Change
+        - The Background Worker Claims Pending Rows in Batches and Makes Stripe Match the Current Event Row
+        - Failed Rows are Retried With Exponential Backoff and Marked Dead After the Attempt Limit
+    """
+    def __init__(self, supabase_admin: Optional[Client] = None):
+        self.supabase_admin = supabase_admin or SupabaseClient.get_service_client()
+        self.table = "stripe_outbox"
+
+    # Claim a Batch of Due Rows -> Pushing next_attempt_at Forward Acts as a Lease Between Workers
+    def _claim_batch(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        due_response = (
+            self.supabase_admin.table(self.table)
+            .select("id")
+            .eq("status", "pending")
+            .lte("next_attempt_at", now.isoformat())
+            .order("id")
+            .limit(settings.STRIPE_OUTBOX_BATCH_SIZE)
+            .execute()
+        )
+        due_ids = [row["id"] for row in due_response.data or []]
+        if not due_ids:
+            return []
+        # Only Rows Still Due are Updated -> Rows Another Worker Claimed in Between are Skipped
+        lease_until = now + timedelta(seconds = settings.STRIPE_OUTBOX_LEASE_SECONDS)
+        claim_response = (
+            self.supabase_admin.table(self.table)
+            .update({"next_attempt_at": lease_until.isoformat()})
+            .in_("id", due_ids)
+            .eq("status", "pending")
+            .lte("next_attempt_at", now.isoformat())
+            .execute()
+        )
+        return sorted(claim_response.data or [], key = lambda row: row["id"])
+
+    # Process One Batch -> Return True If the Batch Was Full and More Rows May Be Waiting
+    def process_batch(self) -> bool:
+        rows = self._claim_batch()
+        if not rows:
+            return False
+
+        # Collapse Rows Per Event -> Several Edits in a Row Only Need One Reconciliation
+        rows_by_event = defaultdict(list)
+        for row in rows:
+            rows_by_event[row["event_id"]].append(row)
+
+        done_ids = []
+        for event_id, event_rows in rows_by_event.items():
+            try:
+                self._reconcile_event(event_id, event_rows)
+                done_ids.extend(row["id"] for row in event_rows)
+            except Exception as e:
+                logger.error("Stripe Sync Error: %s", e, extra = {"event_id": event_id})
+                for row in event_rows:
+                    self._schedule_retry(row, e)
+
+        if done_ids:
+            self.supabase_admin.table(self.table).update({
+                "status": "done",
+                "processed_at": datetime.now(timezone.utc).isoformat(),
+                "last_error": None
+            }).in_("id", done_ids).execute()
+        return len(rows) >= settings.STRIPE_OUTBOX_BATCH_SIZE
+
+    # Retry Helper Function -> Exponential Backoff With Full Jitter
+    def _schedule_retry(self, row: Dict[str, Any], error: Exception):
+        attempts = row.get("attempts", 0) + 1
+        if attempts >= settings.STRIPE_OUTBOX_MAX_ATTEMPTS:
+            update = {"status": "dead", "attempts": attempts, "last_error": str(error)[:1000]}
+        else:
+            backoff = min(
+                settings.STRIPE_OUTBOX_MAX_BACKOFF_SECONDS,
+                settings.STRIPE_OUTBOX_BACKOFF_SECONDS * (2 ** attempts)
+            )
+            next_attempt = datetime.now(timezone.utc) + timedelta(seconds = random.uniform(backoff / 2, backoff))
+            update = {"attempts": attempts, "next_attempt_at": next_attempt.isoformat(), "last_error": str(error)[:1000]}
+        try:
+            self.supabase_admin.table(self.table).update(update).eq("id", row["id"]).execute()
+        except Exception as e:
+            # The Lease Expires On Its Own -> The Row Will Be Picked Up Again
+            logger.warning("Stripe Outbox Retry Scheduling Failed: %s", e)
+
+    # Bring Stripe in Line With the Event Row
+    def _reconcile_event(self, event_id: str, rows: List[Dict[str, Any]]):
+        # 1. Archive Artifacts of Deleted Events -> The Row is Gone, So the IDs Come From the Outbox Payload
+        for row in rows:
+            if row["operation"] == "archive":
+                payload = row.get("payload") or {}
+                self._archive(payload.get("stripe_product_id"), payload.get("stripe_price_id"))
+        if not any(row["operation"] == "sync" for row in rows):
+            return
+
+        # 2. Read the Current Event State -> Always Reconcile Against the Latest Row, Not the Outbox Snapshot
+        event_response = (
+            self.supabase_admin.table("event")
+            .select("id, title, description, is_paid, ticket_price, currency, stripe_product_id, stripe_price_id")
+            .eq("id", event_id)
+            .execute()
+        )
+        if not event_response.data:
+            return # -> Deleted Since, the Delete Trigger Enqueued Its Own Archive Row
+        event = event_response.data[0]
+        product_id = event.get("stripe_product_id") or None
+        price_id = event.get("stripe_price_id") or None
+        # Idempotency Key Scoped to the Newest Outbox Row -> Retries Never Duplicate Stripe Objects
+        idempotency_prefix = f"event-{event_id}-outbox-{rows[-1]['id']}"
+
+        # 3. Scenario 1 - Free Event -> Archive Whatever Still Exists
+        if not event.get("is_paid") or not event.get("ticket_price"):
+            if product_id or price_id:
+                self._archive(product_id, price_id)
+                self._save_ids(event_id, None, None)
+            return
+
+        # 4. Scenario 2 - Paid Event -> Ensure the Product With the Current Text
+        title = event["title"]
+        description = event.get("description") or ""
+        if product_id:
+            stripe.Product.modify(product_id, name = title, description = description, active = True)
+        else:
+            product = stripe.Product.create(
+                name = title,
+                description = description,
+                idempotency_key = f"{idempotency_prefix}-product"
+            )
+            product_id = product.id
+
+        # 5. Ensure the Price Matches -> Stripe Prices are Immutable, So a Change Means a New Price
+        currency = (event.get("currency") or "myr").lower()
+        unit_amount = to_minor_units(event["ticket_price"], currency)
+        if price_id:
+            price = stripe.Price.retrieve(price_id)
+            if not (price.active and price.unit_amount == unit_amount and price.currency == currency and price.product == product_id):
+                stripe.Price.modify(price_id, active = False)
+                price_id = None
+        if not price_id:
+            price = stripe.Price.create(
+                product = product_id,
+                unit_amount = unit_amount,
+                currency = currency,
+                idempotency_key = f"{idempotency_prefix}-price"
+            )
+            price_id = price.id
+
+        if product_id != (event.get("stripe_product_id") or None) or price_id != (event.get("stripe_price_id") or None):
+            if not self._save_ids(event_id, product_id, price_id):
+                # Deleted While Syncing -> Its Archive Row Only Knew the Old IDs, So Nothing Else Would Reclaim These
+                logger.info("Event Deleted During Stripe Sync, Archiving New Objects", extra = {"event_id": event_id})
+                self._archive(product_id, price_id)
+
+    def _archive(self, product_id: Optional[str], price_id: Optional[str]):
+        # Need to Archive the Price Before the Product
+        if price_id:
+            stripe.Price.modify(price_id, active = False)
+        if product_id:
+            stripe.Product.modify(product_id, active = False)
+
+    def _save_ids(self, event_id: str, product_id: Optional[str], price_id: Optional[str]) -> bool:
+        # Only the stripe_* Columns are Written -> The Outbox Trigger Doesn't Fire Again
+        # False When No Row Matched -> The Event Was Deleted in the Meantime
+        response = self.supabase_admin.table("event").update({
+            "stripe_product_id": product_id,
+            "stripe_price_id": price_id
+        }).eq("id", event_id).execute()
+        return bool(response.data)
+
+    # Check Whether the Event's Stripe Price Reflects Its Latest Edit
+    def has_pending_sync(self, event_id: str) -> bool:
+        response = (
+            self.supabase_admin.table(self.table)
+            .select("id")
+            .eq("event_id", event_id)
+            .eq("status", "pending")
+            .limit(1)
+            .execute()
+        )
+        return bool(response.data)
+
+    # Block Until the Event Has an Up-to-Date Stripe Price -> Only Used by Checkout on Freshly Edited Events
+    @traced()
+    def wait_for_price(self, event_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        deadline = time.monotonic() + (settings.STRIPE_PRICE_WAIT_SECONDS if timeout is None else timeout)
+        delay = 0.1
+        while True:
+            if not self.has_pending_sync(event_id):
+                event_response = self.supabase_admin.table("event").select("*").eq("id", event_id).execute()
+                if event_response.data and event_response.data[0].get("stripe_price_id"):
+                    return event_response.data[0]
+            if time.monotonic() + delay > deadline:
+                raise HTTPException(
+                    status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail = "Ticket Pricing is Still Being Prepared, Please Try Again Shortly",
+                    headers = {"Retry-After": "5"}
+                )
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import logging
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from app.core.config import settings
+
+# Stripe Amounts are Integers in the Currency's Smallest Unit
+# https://docs.stripe.com/currencies#zero-decimal
+ZERO_DECIMAL_CURRENCIES = frozenset({
+    "BIF", "CLP", "DJF", "GNF", "JPY", "KMF", "KRW", "MGA",
+    "PYG", "RWF", "UGX", "VND", "VUV", "XAF", "XOF", "XPF"
+})
+THREE_DECIMAL_CURRENCIES = frozenset({"BHD", "JOD", "KWD", "OMR", "TND"})
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_currency(currency: Optional[str], default: Optional[str] = None) -> str:
+    # Event and Booking Rows Store Both "myr" and "MYR" -> Compare in Upper Case
+    return (currency or default or settings.DEFAULT_REPORTING_CURRENCY).strip().upper()
+
+
+def currency_exponent(currency: str) -> int:
+    code = normalize_currency(currency)
+    if code in ZERO_DECIMAL_CURRENCIES:
+        return 0
+    if code in THREE_DECIMAL_CURRENCIES:
+        return 3
+    return 2
+
+
+def to_minor_units(amount: float, currency: str) -> int:
+    # 12.34 MYR -> 1234, 1500 JPY -> 1500 (Round Instead of Truncate to Avoid 19.99 -> 1998)
+    exponent = currency_exponent(currency)
+    if exponent == 3:
+        # Stripe Only Accepts Three-Decimal Amounts Ending in 0 -> 5.126 KWD -> 5130
+        return int(round(amount * 100)) * 10
+    return int(round(amount * 10 ** exponent))
+
+
+def to_major_units(amount: int, currency: str) -> float:
+    return amount / 10 ** currency_exponent(currency)
+
+
+class FxRateNotFound(Exception):
+    """Raised When the FX Table Has No Rate for a Currency"""
+    def __init__(self, currency: str):
+        super().__init__(f"No FX Rate Available for {currency}")
+        self.currency = currency
+
+
+class FxRateTable:
+    """
+    In-Memory Cache of the Locally Stored FX Rate File
+        - The File Holds Rates Quoted Against a Single Base Currency: {"base": "USD", "rates": {"MYR": 4.2, ...}}
+        - The Cache is Reloaded Lazily Once the Refresh Interval Passed and the File Changed
+    """
+    def __init__(self, path: str, refresh_seconds: int):
+        # Relative Paths are Resolved Against the Project Root -> Independent of the Working Directory
+        resolved = Path(path)
+        if not resolved.is_absolute():
+            resolved = Path(__file__).resolve().parents[2] / resolved
+        self.path = str(resolved)
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._base = "USD"
+        self._rates: Dict[str, float] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime == self._mtime:
+            return
+        with open(self.path, "r", encoding = "utf-8") as f:
+            data = json.load(f)
+        base = normalize_currency(data["base"])
+        rates = {normalize_currency(code): float(rate) for code, rate in data["rates"].items()}
+        rates[base] = 1.0
+        self._base, self._rates, self._mtime = base, rates, mtime
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if self._mtime is not None and now - self._checked_at < self.refresh_seconds:
+                return
+            try:
+                self._load()
+            except Exception as e:
+                # Keep Serving the Previous Table If the File is Temporarily Unreadable
+                if self._mtime is None:
+                    raise
+                logger.warning("FX Rate Reload Failed: %s", e)
+            self._checked_at = now
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        # Cross Rate Through the Base Currency
+        source, target = normalize_currency(from_currency), normalize_currency(to_currency)
+        if source == target:
+            return 1.0
+        self._refresh()
+        rates = self._rates
+        if source not in rates:
+            raise FxRateNotFound(source)
+        if target not in rates:
+            raise FxRateNotFound(target)
+        return rates[target] / rates[source]
+
+    def convert_minor(self, amount: int, from_currency: str, to_currency: str) -> float:
+        # Minor Units in the Source Currency -> Major Units in the Target Currency
+        converted = to_major_units(amount, from_currency) * self.rate(from_currency, to_currency)
+        return round(converted, currency_exponent(to_currency))
+
+
+# Initialize the Shared FX Table -> The File is Only Read on First Use
+fx_rates = FxRateTable(settings.FX_RATES_PATH, settings.FX_RATES_REFRESH_SECONDS)
\ No newline at end of file
@@ -1,86 +1,373 @@
+import logging
+import httpx
+from contextlib import contextmanager
 from uuid import uuid4
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, Optional, Union
 from fastapi import UploadFile, HTTPException, status
+from supabase import Client
 from app.core.database import SupabaseClient
 from app.core.config import settings
+from app.core.concurrency import io_executor
+from app.core.tracing import traced
+from app.utils.image_processing import (
+    AVATAR_VARIANTS,
+    EVENT_IMAGE_VARIANTS,
+    VARIANT_CONTENT_TYPE,
+    VARIANT_FORMAT,
+    InvalidImageError,
+    process_image
+)
+from app.utils.uploads import ALLOWED_IMAGE_TYPES, SNIFF_BYTES, SpooledUpload, sniff_image_type, spool_chunks, spool_upload
+from postgrest.types import ReturnMethod
+from storage3.exceptions import StorageApiError
 from storage3.utils import StorageException
 
+# Every Image Lives in Its Own Folder, Named by Content Hash -> {folder}/{sha256}/original.{ext} Next to {folder}/{sha256}/{variant}.webp
+ORIGINAL_NAME = "original"
+
+# Supabase Signed Upload URLs are Valid for Two Hours (Not Configurable on the Storage API)
+SIGNED_UPLOAD_URL_TTL_SECONDS = 2 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def variant_path(path: str, variant: str) -> str:
+    # Storage Path of a Variant -> Older Uploads Without Variants Keep Their Own Path
+    folder, _, filename = path.rpartition("/")
+    if not filename.startswith(f"{ORIGINAL_NAME}."):
+        return path
+    return f"{folder}/{variant}.{VARIANT_FORMAT}"
+
+
+def variant_url(url: str, variant: str) -> str:
+    # Public URL of a Variant -> Derived From the Original's URL Without Another Storage Call
+    if not url:
+        return url
+    base, _, query = url.partition("?")
+    resolved = variant_path(base, variant)
+    return f"{resolved}?{query}" if query else resolved
+
+
+def _is_not_found(error: StorageException) -> bool:
+    # The Storage API Answers a Missing Object With HTTP 400 and statusCode "404" in the Body
+    return isinstance(error, StorageApiError) and str(error.status) in ("400", "404")
+
+
+def path_from_url(url: str, bucket: str) -> Optional[str]:
+    # Public URL -> Path Inside the Bucket -> https://.../storage/v1/object/public/{bucket}/{path}
+    if not url or f"/{bucket}/" not in url:
+        return None
+    return url.split(f"/{bucket}/", 1)[1].partition("?")[0] or None
+
+
 class StorageService:
     # Service for Handling Supabase Bucket Storage
-    def __init__(self):
-        self.supabase = SupabaseClient.get_service_client()
+    def __init__(self, supabase: Optional[Client] = None):
+        self.supabase = supabase or SupabaseClient.get_service_client()
         self.event_bucket = settings.EVENT_IMAGE_BUCKET
         self.event_folder = settings.EVENT_IMAGE_FOLDER
         self.avatar_bucket = settings.AVATAR_BUCKET
 
-    # Generic Upload File to Handle Multiple Supabase Bucket Storage File Upload
-    def _generic_upload(self, file: UploadFile, bucket: str, folder_path: str) -> dict:
-        # Check the File Content Type is Image or Not
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code = status.HTTP_400_BAD_REQUEST,
-                detail = "Only Image Files are Allowed to Upload"
-            )    
+    # Upload a Single Object to the Bucket -> A File Path is Streamed From Disk by the HTTP Client
+    def _put_object(self, bucket: str, path: str, data: Union[bytes, str], content_type: str):
+        storage = self.supabase.storage.from_(bucket)
+        file_options = {"content_type": content_type, "upsert": "true"}
+        if isinstance(data, bytes):
+            storage.upload(path = path, file = data, file_options = file_options)
+            return
+        # storage3 Would Open a Path Itself and Never Close It -> Pass a Handle That is Closed Here
+        with open(data, "rb") as file:
+            storage.upload(path = path, file = file, file_options = file_options)
+
+    # Upload the Variants Next to Their Original Concurrently
+    def _put_variants(self, bucket: str, path: str, variant_data: Dict[str, bytes]):
+        uploads = [
+            io_executor.submit(self._put_object, bucket, variant_path(path, name), data, VARIANT_CONTENT_TYPE)
+            for name, data in variant_data.items()
+        ]
+        for future in uploads:
+            future.result()
+
+    # Stream an Object Through the Storage Client's HTTP Client -> Authenticated, So Private Buckets Work, and Sent
+    # Through the Same Deadline, Retry and Breaker Transports as Every Other Storage Call (storage3 Only Downloads Whole)
+    @contextmanager
+    def _stream_object(self, bucket: str, path: str, headers: Optional[Dict[str, str]] = None) -> Iterator[httpx.Response]:
+        storage = self.supabase.storage.from_(bucket)
+        url = storage._base_url.joinpath("object", bucket, *path.split("/"))
+        with storage._client.stream("GET", str(url), headers = {**storage._headers, **(headers or {})}) as response:
+            if response.status_code in (status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND):
+                raise FileNotFoundError(path)
+            response.raise_for_status()
+            yield response
+
+    # First Bytes of an Object -> Ranged Read, Stops Early If the Server Ignores the Range
+    def _read_head(self, bucket: str, path: str) -> bytes:
+        head = b""
+        with self._stream_object(bucket, path, {"Range": f"bytes=0-{SNIFF_BYTES - 1}"}) as response:
+            for chunk in response.iter_bytes():
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    break
+        return head[:SNIFF_BYTES]
+
+    # Content Address Helper Function -> A Missing Object (404) Comes Back as an Error From the Storage API
+    def _object_exists(self, bucket: str, path: str) -> bool:
         try:
-            # Read File Content 
-            bytes_data = file.file.read()
-            # Get the File Etension
-            extension = file.filename.split(".")[-1]
-            # Contract the File Path
-            path = f"{folder_path}/{uuid4()}.{extension}"
-            # Upload the FIle to the Supabase Bucket Storage
-            response = self.supabase.storage.from_(bucket).upload(
-                path = path,
-                file = bytes_data,
-                file_options = {"content_type": file.content_type, "upsert": "true"}
-            )
+            return self.supabase.storage.from_(bucket).exists(path)
+        except StorageException:
+            return False
+
+    # Process a Spooled Upload and Store the Results Under Its Content Hash
+    @traced("StorageService.store_upload")
+    def _store_upload(
+        self,
+        upload: SpooledUpload,
+        bucket: str,
+        folder_path: str,
+        variants: Dict[str, int]
+    ) -> dict:
+        # Same Bytes -> Same Path -> Re-Uploading a Banner Reuses the Stored Object and Its Variants
+        path = f"{folder_path}/{upload.sha256}/{ORIGINAL_NAME}.{upload.extension}"
+        try:
+            storage = self.supabase.storage.from_(bucket)
+            # Already Stored -> Skip Processing and Uploading
+            if not self._object_exists(bucket, path):
+                # Decode and Resize in the Process Pool -> Also Rejects Files That Aren't Really Images
+                variant_data = process_image(upload.path, variants)
+                # Upload the Variants to the Supabase Bucket Storage Concurrently
+                self._put_variants(bucket, path, variant_data)
+                # The Original Goes Last -> If It Exists, Its Variants are Complete
+                self._put_object(bucket, path, upload.path, upload.content_type)
+            # The Object May Have Been Queued for Deletion Before This Reuse -> Cancel So Its Grace Period Starts Over
+            self._cancel_delete(bucket, path)
             # Get Public URL
-            public_url = self.supabase.storage.from_(bucket).get_public_url(path)
+            public_url = storage.get_public_url(path)
 
             return {
                 "url": public_url,
-                "path": path
+                "path": path,
+                "variants": {name: variant_url(public_url, name) for name in variants}
             }
+        except InvalidImageError as e:
+            logger.warning("Image Decode Error: %s", e)
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "The Uploaded File is Not a Valid Image"
+            )
+        except FutureTimeoutError:
+            raise HTTPException(
+                status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail = "Image Processing Timed Out"
+            )
         except StorageException as e:
-            print(f"Storage API Error: {e}")
+            logger.error("Storage API Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = "Storage Upload Failed"
             )
         except Exception as e:
-            print(f"Upload Error: {e}")
+            logger.error("Upload Error: %s", e)
             raise HTTPException(
                 status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail = "An Unexpected Error Occured During Upload"
             )
 
+    # Generic Upload File to Handle Multiple Supabase Bucket Storage File Upload
+    def _generic_upload(self, file: UploadFile, bucket: str, folder_path: str, variants: Dict[str, int]) -> dict:
+        # Copy the Upload to Disk in Chunks -> Enforces the Size Cap, Checks the Magic Bytes and Hashes the Content
+        with spool_upload(file) as upload:
+            return self._store_upload(upload, bucket, folder_path, variants)
+
 
-    # Upload the Event Image
-    def upload_event_image(self, file: UploadFile, event_id: str) -> dict:
-        return self._generic_upload(file, self.event_bucket, f"{self.event_folder}/{event_id}")
+    # Upload the Event Image -> Shared Across Events, So the Path Doesn't Include the Event ID
+    def upload_event_image(self, file: UploadFile) -> dict:
+        return self._generic_upload(file, self.event_bucket, self.event_folder, EVENT_IMAGE_VARIANTS)
 
     # Upload the Profile Avatar
-    def upload_avatar(self, file: UploadFile, user_id: str) -> str:
-        result = self._generic_upload(file, self.avatar_bucket, f"{user_id}")
-        return result["url"]
+    def upload_avatar(self, file: UploadFile, user_id: str) -> dict:
+        result = self._generic_upload(file, self.avatar_bucket, f"{user_id}", AVATAR_VARIANTS)
+        return {
+            "url": result["url"],
+            "variants": result["variants"]
+        }
+
+
+    # Direct Upload Helper Function -> Issue a Signed URL So the Client Uploads Straight to the Bucket
+    def _generic_signed_upload(self, bucket: str, folder_path: str, content_type: str) -> dict:
+        extension = ALLOWED_IMAGE_TYPES.get(content_type)
+        if not extension:
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Only JPEG, PNG, GIF and WebP Images are Allowed to Upload"
+            )
+        path = f"{folder_path}/{uuid4()}/{ORIGINAL_NAME}.{extension}"
+        try:
+            signed = self.supabase.storage.from_(bucket).create_signed_upload_url(path)
+        except StorageException as e:
+            logger.error("Storage API Error: %s", e)
+            raise HTTPException(
+                status_code = status.HTTP_502_BAD_GATEWAY,
+                detail = "Failed to Create the Upload URL"
+            )
+        return {
+            "signed_url": signed["signed_url"],
+            "token": signed["token"],
+            "bucket": bucket,
+            "path": path,
+            "expires_in": SIGNED_UPLOAD_URL_TTL_SECONDS
+        }
+
+    # Direct Upload Helper Function -> Verify the Uploaded Object in Place, Its Variants are Generated in the Background
+    @traced("StorageService.complete_upload")
+    def _generic_complete_upload(
+        self,
+        bucket: str,
+        staging_path: str,
+        path: str,
+        variants: Dict[str, int]
+    ) -> dict:
+        # 1. The Path Must Be One This User Was Issued -> Stops Linking Somebody Else's Object
+        _, _, filename = path.rpartition("/")
+        if not path.startswith(f"{staging_path}/") or ".." in path or not filename.startswith(f"{ORIGINAL_NAME}."):
+            raise HTTPException(
+                status_code = status.HTTP_403_FORBIDDEN,
+                detail = "Upload Path Does Not Belong to This User"
+            )
+        # 2. Read the Stored Size and Content Type, Then Only the Magic Bytes -> The Object Itself Isn't Downloaded
+        storage = self.supabase.storage.from_(bucket)
+        try:
+            info = storage.info(path)
+            head = self._read_head(bucket, path)
+        except (FileNotFoundError, StorageException) as e:
+            if isinstance(e, StorageException) and not _is_not_found(e):
+                logger.warning("Storage Info Error: %s", e)
+                raise HTTPException(
+                    status_code = status.HTTP_502_BAD_GATEWAY,
+                    detail = "Failed to Verify the Uploaded Object"
+                )
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "Uploaded Object Not Found"
+            )
+        except httpx.HTTPError as e:
+            logger.warning("Storage Download Error: %s", e)
+            raise HTTPException(
+                status_code = status.HTTP_502_BAD_GATEWAY,
+                detail = "Failed to Verify the Uploaded Object"
+            )
+        # 3. Same Size Cap and Magic-Byte Check as Multipart Uploads, and the Type Must Match the One the URL Was Issued For
+        metadata = info.get("metadata") or {}
+        size = info.get("size") or metadata.get("size") or 0
+        content_type = info.get("content_type") or metadata.get("mimetype")
+        detected = sniff_image_type(head)
+        error = None
+        if not size:
+            error = HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Uploaded File is Empty"
+            )
+        elif size > settings.UPLOAD_MAX_BYTES:
+            error = HTTPException(
+                status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail = f"Image Exceeds the {settings.UPLOAD_MAX_BYTES / (1024 * 1024):.1f} MB Upload Limit"
+            )
+        elif detected is None:
+            error = HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Only JPEG, PNG, GIF and WebP Images are Allowed to Upload"
+            )
+        elif not filename.endswith(f".{detected[1]}") or (content_type and content_type != detected[0]):
+            error = HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Uploaded File Type Does Not Match the Requested Type"
+            )
+        if error is not None:
+            # Don't Keep Objects That Failed Validation
+            self._schedule_delete(bucket, path)
+            raise error
+        # 4. Queue the Variants -> The Image Variant Worker Decodes the Image and Uploads Them Shortly After
+        self._enqueue_variants(bucket, path, variants)
+        public_url = storage.get_public_url(path)
+        return {
+            "url": public_url,
+            "path": path,
+            "variants": {name: variant_url(public_url, name) for name in variants}
+        }
+
+    # Queue Variant Generation for the Image Variant Worker -> Completing the Same Upload Twice Queues It Once
+    def _enqueue_variants(self, bucket: str, path: str, variants: Dict[str, int]):
+        self.supabase.table("image_variant_jobs").upsert(
+            {"bucket": bucket, "path": path, "variants": variants},
+            on_conflict = "bucket,path",
+            ignore_duplicates = True,
+            returning = ReturnMethod.minimal
+        ).execute()
+
+    # Build and Upload the Variants of a Stored Original -> Run by the Image Variant Worker, Off the Request Path
+    #   FileNotFoundError -> The Object is Gone, InvalidImageError / HTTPException -> It Never Will Decode
+    @traced("StorageService.generate_variants")
+    def generate_variants(self, bucket: str, path: str, variants: Dict[str, int]):
+        try:
+            with self._stream_object(bucket, path) as response:
+                upload = spool_chunks(response.iter_bytes(settings.UPLOAD_CHUNK_SIZE))
+            with upload:
+                variant_data = process_image(upload.path, variants)
+        except (InvalidImageError, HTTPException):
+            # Don't Keep Objects That Failed Validation
+            self._schedule_delete(bucket, path)
+            raise
+        self._put_variants(bucket, path, variant_data)
+
+    # Event Image Direct Upload -> Staged Under the Organizer's Folder Until Verified
+    def create_event_image_upload_url(self, user_id: str, content_type: str) -> dict:
+        return self._generic_signed_upload(self.event_bucket, f"{self.event_folder}/uploads/{user_id}", content_type)
+
+    def complete_event_image_upload(self, user_id: str, path: str) -> dict:
+        return self._generic_complete_upload(
+            self.event_bucket, f"{self.event_folder}/uploads/{user_id}", path, EVENT_IMAGE_VARIANTS
+        )
+
+    # Avatar Direct Upload
+    def create_avatar_upload_url(self, user_id: str, content_type: str) -> dict:
+        return self._generic_signed_upload(self.avatar_bucket, f"{user_id}", content_type)
 
+    def complete_avatar_upload(self, user_id: str, path: str) -> dict:
+        result = self._generic_complete_upload(self.avatar_bucket, f"{user_id}", path, AVATAR_VARIANTS)
+        return {
+            "url": result["url"],
+            "variants": result["variants"]
+        }
 
-    # Generic Delete File to Handle Multiple Supabase Bucket Storage Delete Operation
-    def _generic_delete(self, bucket: str, path: str) -> bool:
-        # Delete a File From Storage -> Return TRUE If Success Else Return Fasle
+
+    # Deferred Delete -> Record the Object for the Storage GC Worker Instead of Deleting It Inline
+    def _schedule_delete(self, bucket: str, path: str) -> bool:
+        # Return TRUE If Recorded Else Return False -> Missed Objects are Still Found by the Periodic Sweep
         if not path:
             return False
         try:
-            # Supabase Function to Remove File
-            self.supabase.storage.from_(bucket).remove([path])
+            self.supabase.table("storage_gc_candidates").upsert(
+                {"bucket": bucket, "path": path},
+                on_conflict = "bucket,path",
+                ignore_duplicates = True,
+                returning = ReturnMethod.minimal
+            ).execute()
             return True
         except Exception as e:
-            print(f"Warning: Failed to Delete File {path}: {e}")
+            logger.warning("Failed to Schedule Delete: %s", e, extra = {"bucket": bucket, "path": path})
             return False
 
-    # Delete the Event Image
+    # Withdraw a Pending Delete -> Failure Only Logged, the GC Worker Re-Checks References Before Removing Anyway
+    def _cancel_delete(self, bucket: str, path: str):
+        try:
+            self.supabase.table("storage_gc_candidates").delete(returning = ReturnMethod.minimal).eq("bucket", bucket).eq("path", path).execute()
+        except Exception as e:
+            logger.warning("Failed to Cancel Scheduled Delete: %s", e, extra = {"bucket": bucket, "path": path})
+
+    # Delete the Event Image -> Removed Later by the GC Worker If No Event References It
     def delete_event_image(self, path: str) -> bool:
-        return self._generic_delete(self.event_bucket, path)
+        return self._schedule_delete(self.event_bucket, path)
 
-    # Delete the Avatar Image
+    # Delete the Avatar Image -> Removed Later by the GC Worker If No Profile References It
     def delete_avatar_image(self, path: str) -> bool:
-        return self._generic_delete(self.avatar_bucket, path)
+        return self._schedule_delete(self.avatar_bucket, path)
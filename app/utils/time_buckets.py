@@ -0,0 +1,85 @@
+from typing import Dict, Any, List, Tuple
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+# Sales Chart Granularity -> Length of the ISO Timestamp Prefix That Identifies the Bucket
+#   "2024-05-01T13:45:12.123+00:00"[:13] -> "2024-05-01T13" (Hour)
+#   "2024-05-01T13:45:12.123+00:00"[:10] -> "2024-05-01"    (Day / Week)
+#   "2024-05-01T13:45:12.123+00:00"[:7]  -> "2024-05"       (Month)
+BUCKET_PREFIX_LENGTH = {"hour": 13, "day": 10, "week": 10, "month": 7}
+
+# Default Chart Window When the Caller Doesn't Send the "from" Parameter
+DEFAULT_CHART_WINDOW = {
+    "hour": timedelta(hours = 48),
+    "day": timedelta(days = 30),
+    "week": timedelta(weeks = 12),
+    "month": timedelta(days = 365)
+}
+
+# Upper Bound of Chart Points -> Prevent Hourly Charts Over Several Years
+MAX_CHART_BUCKETS = 1000
+
+
+def floor_to_bucket(moment: datetime, granularity: str) -> datetime:
+    # Align a UTC Datetime to the Start of Its Bucket
+    moment = moment.astimezone(timezone.utc)
+    if granularity == "hour":
+        return moment.replace(minute = 0, second = 0, microsecond = 0)
+    start_of_day = moment.replace(hour = 0, minute = 0, second = 0, microsecond = 0)
+    if granularity == "week":
+        return start_of_day - timedelta(days = start_of_day.weekday()) # -> ISO Week Starts on Monday
+    if granularity == "month":
+        return start_of_day.replace(day = 1)
+    return start_of_day
+
+
+def next_bucket(start: datetime, granularity: str) -> datetime:
+    # Step to the Start of the Following Bucket
+    if granularity == "hour":
+        return start + timedelta(hours = 1)
+    if granularity == "week":
+        return start + timedelta(weeks = 1)
+    if granularity == "month":
+        return start.replace(year = start.year + 1, month = 1) if start.month == 12 else start.replace(month = start.month + 1)
+    return start + timedelta(days = 1)
+
+
+def count_buckets(first: datetime, last: datetime, granularity: str) -> int:
+    # Chart Points From first to last Inclusive (Both Aligned) -> Checked Before Anything is Queried
+    if granularity == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    step = {"hour": timedelta(hours = 1), "week": timedelta(weeks = 1)}.get(granularity, timedelta(days = 1))
+    return (last - first) // step + 1
+
+
+def _parse_bucket_key(key: str, granularity: str) -> datetime:
+    # Only Called Once Per Distinct Prefix -> Not Once Per Booking
+    year, month = int(key[0:4]), int(key[5:7])
+    day = int(key[8:10]) if len(key) >= 10 else 1
+    hour = int(key[11:13]) if len(key) >= 13 else 0
+    return floor_to_bucket(datetime(year, month, day, hour, tzinfo = timezone.utc), granularity)
+
+
+def bucket_bookings(bookings: List[Dict[str, Any]], granularity: str) -> Dict[Tuple[datetime, str], Tuple[int, int]]:
+    """
+    Group Bookings Into Time Buckets -> {(bucket_start, currency): (amount_total, tickets)}
+        1. Slice the ISO Timestamp Prefix (PostgREST Returns timestamptz in UTC)
+        2. Count (Prefix, Currency, Amount) Triples in C -> Ticket Prices Only Take a Few Distinct Values
+        3. Parse Each Distinct Prefix Once and Merge Into the Bucket Start
+    Amounts Stay in the Booking Currency's Minor Units -> Conversion Happens Once Per Bucket
+    """
+    prefix_length = BUCKET_PREFIX_LENGTH[granularity]
+    keys = [b["created_at"][:prefix_length] for b in bookings]
+    currencies = [b.get("currency") for b in bookings]
+    amounts = [b["amount_total"] for b in bookings]
+    triple_counts = Counter(zip(keys, currencies, amounts))
+
+    bucket_starts: Dict[str, datetime] = {}
+    buckets: Dict[Tuple[datetime, str], Tuple[int, int]] = {}
+    for (key, currency, amount), tickets in triple_counts.items():
+        start = bucket_starts.get(key)
+        if start is None:
+            start = bucket_starts[key] = _parse_bucket_key(key, granularity)
+        total, count = buckets.get((start, currency), (0, 0))
+        buckets[(start, currency)] = (total + amount * tickets, count + tickets)
+    return buckets
\ No newline at end of file
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import tempfile
+from typing import Iterable, Optional, Tuple
+from fastapi import UploadFile, HTTPException, status
+from app.core.config import settings
+
+# Content Types Accepted by the Image Pipeline -> Extension Used in the Storage Path
+ALLOWED_IMAGE_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp"
+}
+
+# Enough Leading Bytes to Tell Every Allowed Format Apart
+SNIFF_BYTES = 16
+
+# Magic Bytes -> (Content Type, Extension) -> Only Formats the Image Pipeline Can Decode
+def sniff_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg", "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png", "png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif", "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return None
+
+
+class SpooledUpload:
+    """
+    An Upload Copied to a Temporary File in Fixed-Size Chunks
+        - Memory Stays Bounded by the Chunk Size, Whatever the Upload Size
+        - The Real Type Comes From the Magic Bytes, Not the Client's Content-Type or Filename
+        - The SHA-256 Digest is Computed While Copying -> Used as the Content Address in Storage
+    """
+    def __init__(self, path: str, size: int, content_type: str, extension: str, sha256: str):
+        self.path = path
+        self.size = size
+        self.content_type = content_type
+        self.extension = extension
+        self.sha256 = sha256
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def spool_chunks(chunks: Iterable[bytes], max_bytes: Optional[int] = None) -> SpooledUpload:
+    # Copy Any Chunk Stream to a Temporary File -> Shared by Multipart Uploads and Direct-Upload Verification
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    fd, path = tempfile.mkstemp(prefix = "eventora-upload-", dir = settings.UPLOAD_TEMP_DIR)
+    try:
+        size = 0
+        detected = None
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                # Sniff the First Chunk Before Writing Anything Else
+                if size == 0:
+                    detected = sniff_image_type(chunk[:SNIFF_BYTES])
+                    if detected is None:
+                        raise HTTPException(
+                            status_code = status.HTTP_400_BAD_REQUEST,
+                            detail = "Only JPEG, PNG, GIF and WebP Images are Allowed to Upload"
+                        )
+                size += len(chunk)
+                # Stop Reading as Soon as the Cap is Crossed
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail = f"Image Exceeds the {max_bytes / (1024 * 1024):.1f} MB Upload Limit"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        if detected is None:
+            raise HTTPException(
+                status_code = status.HTTP_400_BAD_REQUEST,
+                detail = "Uploaded File is Empty"
+            )
+        return SpooledUpload(path, size, *detected, digest.hexdigest())
+    except BaseException:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def spool_upload(file: UploadFile, max_bytes: Optional[int] = None) -> SpooledUpload:
+    chunk_size = settings.UPLOAD_CHUNK_SIZE
+    return spool_chunks(iter(lambda: file.file.read(chunk_size), b""), max_bytes)
\ No newline at end of file
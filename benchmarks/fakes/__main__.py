@@ -0,0 +1,54 @@
+"""
+Run the Fake Supabase + Stripe Backends Standalone
+
+Seeds Synthetic Data, Prints the Environment That Points the App at the Fakes, Then Serves
+Until Interrupted. Latency Can be Changed Later With PUT /__fakes__/latency.
+
+Usage:
+    python -m benchmarks.fakes --port 54321 --latency-ms 5 --jitter-ms 10
+    export $(python -m benchmarks.fakes --print-env) && uvicorn app.main:app
+"""
+import argparse
+import time
+from benchmarks.fakes.app import FakeBackends
+from benchmarks.fakes.common import FakeState, Latency
+from benchmarks.fakes.seed import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 54321)
+    parser.add_argument("--latency-ms", type = float, default = 0.0, help = "Base Delay Added to Every Backend Call")
+    parser.add_argument("--jitter-ms", type = float, default = 0.0, help = "Uniform Random Delay on Top of the Base")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "Fraction of Backend Calls Failing With 503")
+    parser.add_argument("--organizers", type = int, default = 20)
+    parser.add_argument("--buyers", type = int, default = 500)
+    parser.add_argument("--events-per-organizer", type = int, default = 10)
+    parser.add_argument("--bookings", type = int, default = 20000)
+    parser.add_argument("--seed", type = int, default = 42, help = "Same Seed -> Same IDs, Users and Bookings")
+    parser.add_argument("--print-env", action = "store_true", help = "Only Print the Environment and Exit")
+    args = parser.parse_args()
+
+    backends = FakeBackends(FakeState(), args.host, args.port)
+    if args.print_env:
+        print("\n".join(f"{key}={value}" for key, value in backends.env().items()))
+        return
+
+    for backend in backends.state.latency:
+        backends.state.latency[backend] = Latency(args.latency_ms, args.jitter_ms, args.error_rate)
+    summary = seed(backends.state, args.organizers, args.buyers, args.events_per_organizer, args.bookings, args.seed)
+    backends.start()
+    print(f"Fake Backends Listening on {backends.url}")
+    print(f"Seeded {len(summary.event_ids)} Events, {len(summary.buyers)} Buyers, {summary.bookings:,} Bookings")
+    for key, value in backends.env().items():
+        print(f"{key}={value}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        backends.stop()
+
+
+if __name__ == "__main__":
+    main()
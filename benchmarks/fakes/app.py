@@ -0,0 +1,108 @@
+"""
+One ASGI App Serving Every Fake Under the Real URL Layout
+    - /rest/v1 (PostgREST), /storage/v1, /auth/v1 -> SUPABASE_URL Points at the Root
+    - /v1 (Stripe) -> STRIPE_API_BASE Points at the Root
+    - /__fakes__/latency Reads or Replaces the Injected Latency While a Benchmark Runs
+"""
+import socket
+import threading
+import time
+from typing import Dict, Optional
+import uvicorn
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.fakes import auth, postgrest, storage, stripe_mock
+from benchmarks.fakes.common import JWT_SECRET, STRIPE_SECRET_KEY, WEBHOOK_SECRET, FakeState, Latency, LatencyMiddleware, json_response, read_json
+
+
+def create_app(state: FakeState) -> Starlette:
+    async def latency(request: Request) -> Response:
+        if request.method == "PUT":
+            # {"postgrest": {"base_ms": 5, "jitter_ms": 10, "error_rate": 0.01}, ...} -> Unlisted Backends Keep Theirs
+            for backend, values in (await read_json(request) or {}).items():
+                if backend not in state.latency:
+                    return json_response({"message": f"Unknown Backend {backend}"}, 400)
+                state.latency[backend] = Latency(**values)
+        return json_response({backend: vars(value) for backend, value in state.latency.items()})
+
+    async def stats(request: Request) -> Response:
+        return json_response({
+            "calls": state.calls,
+            "tables": {name: len(found.rows) for name, found in state.tables.items()},
+            "objects": len(state.objects),
+            "users": len(state.users),
+            "stripe_objects": len(state.stripe),
+        })
+
+    routes = [
+        Route("/__fakes__/latency", latency, methods = ["GET", "PUT"]),
+        Route("/__fakes__/stats", stats, methods = ["GET"]),
+        *postgrest.make_routes(state),
+        *storage.make_routes(state),
+        *auth.make_routes(state),
+        *stripe_mock.make_routes(state),
+    ]
+    return Starlette(routes = routes, middleware = [Middleware(LatencyMiddleware, state = state)])
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class FakeBackends:
+    """
+    Run the Fakes on a Real Socket in a Background Thread
+        - A Real Socket Keeps the App's HTTP Client, Connection Pool and Serialization in the Measured Path
+        - Port 0 Picks a Free Port
+    """
+    def __init__(self, state: Optional[FakeState] = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = state or FakeState()
+        self.host = host
+        self.port = port or _free_port(host)
+        self._server = uvicorn.Server(uvicorn.Config(
+            create_app(self.state), host = self.host, port = self.port, log_level = "warning", access_log = False, lifespan = "off"
+        ))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        # Settings Read These -> Export Them Before the App is Imported
+        return {
+            "SUPABASE_URL": self.url,
+            "SUPABASE_KEY": auth.api_key("anon"),
+            "SUPABASE_SERVICE_ROLE_KEY": auth.api_key("service_role"),
+            "JWT_SECRET_KEY": JWT_SECRET,
+            "STRIPE_SECRET_KEY": STRIPE_SECRET_KEY,
+            "STRIPE_API_BASE": self.url,
+            "STRIPE_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        }
+
+    def start(self, timeout: float = 10.0) -> "FakeBackends":
+        self._thread = threading.Thread(target = self._server.run, name = "fake-backends", daemon = True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Fake Backends Failed to Start on {self.url}")
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> "FakeBackends":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
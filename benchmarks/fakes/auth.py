@@ -0,0 +1,176 @@
+"""
+In-Memory Supabase Auth (GoTrue) Subset
+    - Sign-Up Auto-Confirms the Email and Creates the profile Row -> What the Database Trigger Does Upstream
+    - Access Tokens are Real HS256 JWTs Signed With JWT_SECRET, so Anything That Decodes Them Keeps Working
+    - GET /user Verifies the Token and Looks the User Up -> Same Round Trip get_current_user Makes per Request
+"""
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from jose import JWTError, jwt
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.fakes.common import JWT_SECRET, FakeState, json_response, now_iso, read_json
+from benchmarks.fakes.postgrest import table
+
+ACCESS_TOKEN_SECONDS = 3600
+
+
+def api_key(role: str) -> str:
+    # The anon / service_role Keys the App Sends as apikey -> Long-Lived JWTs Like the Real Ones
+    return jwt.encode({"iss": "supabase", "role": role, "iat": 0, "exp": 4102444800}, JWT_SECRET, algorithm = "HS256")
+
+
+def error(status_code: int, code: str, message: str) -> Response:
+    return json_response({"code": status_code, "error_code": code, "msg": message}, status_code)
+
+
+def create_user(state: FakeState, email: str, password: str, full_name: str = "", user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Register a Confirmed User and Its Profile -> Shared With the Seeder"""
+    timestamp = now_iso()
+    user = {
+        "id": user_id or str(uuid4()),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "email_confirmed_at": timestamp,
+        "confirmed_at": timestamp,
+        "phone": "",
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "user_metadata": {"full_name": full_name},
+        "identities": [],
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "last_sign_in_at": None,
+        "password": password,
+        "refresh_tokens": [],
+    }
+    state.users[user["id"]] = user
+    profiles = table(state, "profile")
+    if user["id"] not in profiles.by_id:
+        profiles.insert({"id": user["id"], "email": email, "full_name": full_name, "created_at": timestamp, "updated_at": timestamp})
+    return user
+
+
+def public_user(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in user.items() if key not in ("password", "refresh_tokens")}
+
+
+def issue_session(user: Dict[str, Any]) -> Dict[str, Any]:
+    now = int(time.time())
+    access_token = jwt.encode({
+        "sub": user["id"],
+        "email": user["email"],
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iat": now,
+        "exp": now + ACCESS_TOKEN_SECONDS,
+        "session_id": str(uuid4()),
+    }, JWT_SECRET, algorithm = "HS256")
+    refresh_token = uuid4().hex
+    user["refresh_tokens"].append(refresh_token)
+    user["last_sign_in_at"] = now_iso()
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_SECONDS,
+        "expires_at": now + ACCESS_TOKEN_SECONDS,
+        "refresh_token": refresh_token,
+        "user": public_user(user),
+    }
+
+
+def user_from_token(state: FakeState, request: Request) -> Optional[Dict[str, Any]]:
+    header = request.headers.get("authorization", "")
+    if not header.lower().startswith("bearer "):
+        return None
+    try:
+        claims = jwt.decode(header[7:], JWT_SECRET, algorithms = ["HS256"], audience = "authenticated")
+    except JWTError:
+        return None
+    return state.users.get(claims.get("sub"))
+
+
+def make_routes(state: FakeState) -> List[Route]:
+    by_email = lambda email: next((user for user in state.users.values() if user["email"] == email), None)
+
+    async def signup(request: Request) -> Response:
+        body = await read_json(request) or {}
+        email, password = body.get("email"), body.get("password")
+        if not email or not password:
+            return error(422, "validation_failed", "Signup requires a valid password")
+        if by_email(email) is not None:
+            return error(422, "user_already_exists", "User already registered")
+        user = create_user(state, email, password, (body.get("data") or {}).get("full_name", ""))
+        return json_response(issue_session(user))
+
+    async def token(request: Request) -> Response:
+        body = await read_json(request) or {}
+        grant_type = request.query_params.get("grant_type")
+        if grant_type == "password":
+            user = by_email(body.get("email"))
+            if user is None or user["password"] != body.get("password"):
+                return error(400, "invalid_credentials", "Invalid login credentials")
+            return json_response(issue_session(user))
+        if grant_type == "refresh_token":
+            refresh_token = body.get("refresh_token")
+            user = next((user for user in state.users.values() if refresh_token in user["refresh_tokens"]), None)
+            if user is None:
+                return error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+            user["refresh_tokens"].remove(refresh_token)
+            return json_response(issue_session(user))
+        return error(400, "unsupported_grant_type", "unsupported_grant_type")
+
+    async def get_user(request: Request) -> Response:
+        user = user_from_token(state, request)
+        if user is None:
+            return error(403, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+        return json_response(public_user(user))
+
+    async def update_user(request: Request) -> Response:
+        user = user_from_token(state, request)
+        if user is None:
+            return error(403, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+        return json_response(public_user(_apply(user, await read_json(request) or {})))
+
+    async def admin_update_user(request: Request) -> Response:
+        user = state.users.get(request.path_params["user_id"])
+        if user is None:
+            return error(404, "user_not_found", "User not found")
+        return json_response(public_user(_apply(user, await read_json(request) or {})))
+
+    async def recover(request: Request) -> Response:
+        return json_response({})
+
+    async def logout(request: Request) -> Response:
+        user = user_from_token(state, request)
+        if user is not None:
+            user["refresh_tokens"].clear()
+        return Response(status_code = 204)
+
+    async def health(request: Request) -> Response:
+        return json_response({"version": "fake", "name": "GoTrue", "description": "Eventora Fake Auth"})
+
+    return [
+        Route("/auth/v1/signup", signup, methods = ["POST"]),
+        Route("/auth/v1/token", token, methods = ["POST"]),
+        Route("/auth/v1/user", get_user, methods = ["GET"]),
+        Route("/auth/v1/user", update_user, methods = ["PUT"]),
+        Route("/auth/v1/admin/users/{user_id}", admin_update_user, methods = ["PUT"]),
+        Route("/auth/v1/recover", recover, methods = ["POST"]),
+        Route("/auth/v1/logout", logout, methods = ["POST"]),
+        Route("/auth/v1/health", health, methods = ["GET"]),
+    ]
+
+
+def _apply(user: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    if changes.get("password"):
+        user["password"] = changes["password"]
+    if changes.get("email"):
+        user["email"] = changes["email"]
+    metadata = changes.get("data") or changes.get("user_metadata")
+    if metadata:
+        user["user_metadata"].update(metadata)
+    user["updated_at"] = now_iso()
+    return user
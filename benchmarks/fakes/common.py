@@ -0,0 +1,90 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import orjson
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Signs the Fake Auth Tokens and API Keys -> Not a Secret, Only Used Against the Fakes
+JWT_SECRET = "eventora-fake-jwt-secret-for-local-benchmarks-only"
+WEBHOOK_SECRET = "whsec_eventora_fake"
+STRIPE_SECRET_KEY = "sk_test_eventora_fake"
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(orjson.dumps(content), status_code = status_code, headers = headers, media_type = "application/json")
+
+
+@dataclass
+class Latency:
+    """
+    Injected Delay (and Failures) for One Fake Backend
+        - Each Call Sleeps base_ms + uniform(0, jitter_ms)
+        - error_rate of the Calls Fail With a 503 Before Touching the Data
+    """
+    base_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    def delay(self) -> float:
+        return (self.base_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)) / 1000
+
+    def fails(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+@dataclass
+class FakeState:
+    """Everything the Fakes Hold in Memory -> Shared So Auth Sign-Ups Create Profiles and Checkout Sees Seeded Prices"""
+    tables: Dict[str, Any] = field(default_factory = dict)
+    objects: Dict[Any, Any] = field(default_factory = dict)
+    users: Dict[str, Dict[str, Any]] = field(default_factory = dict)
+    stripe: Dict[str, Dict[str, Any]] = field(default_factory = dict)
+    latency: Dict[str, Latency] = field(default_factory = lambda: {
+        "postgrest": Latency(), "storage": Latency(), "auth": Latency(), "stripe": Latency()
+    })
+    calls: Dict[str, int] = field(default_factory = dict)
+
+
+# Path Prefix -> Backend Name, for Latency Injection and Call Counting
+BACKEND_PREFIXES = (("/rest/", "postgrest"), ("/storage/", "storage"), ("/auth/", "auth"), ("/v1/", "stripe"))
+
+
+class LatencyMiddleware:
+    """Delay or Fail Each Call According to Its Backend's Latency Settings -> Adjustable at Runtime via /__fakes__/latency"""
+    def __init__(self, app: ASGIApp, state: FakeState):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        backend = next((name for prefix, name in BACKEND_PREFIXES if scope["path"].startswith(prefix)), None)
+        if backend is not None:
+            self.state.calls[backend] = self.state.calls.get(backend, 0) + 1
+            latency = self.state.latency[backend]
+            delay = latency.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if latency.fails():
+                response = json_response({"message": f"Injected {backend} Failure", "code": "FAKE503"}, 503)
+                await response(scope, receive, send)
+                return
+        try:
+            await self.app(scope, receive, send)
+        except ClientDisconnect:
+            # The App Gave Up While the Call Was Delayed (Its Deadline Ran Out) -> Nothing Left to Answer
+            pass
+
+
+async def read_json(request: Request) -> Any:
+    body = await request.body()
+    return orjson.loads(body) if body else None
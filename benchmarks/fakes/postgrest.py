@@ -0,0 +1,447 @@
+"""
+In-Memory PostgREST Subset
+    - Tables are Lists of Dicts, Created on First Use -> Any Table Name Works, Even the Worker Tables
+    - select With Nested Embeds (rel(...), rel!inner(...), alias:col), Filters on Own and Embedded Columns,
+      order / limit / offset, count=exact, HEAD, single(), insert / upsert / update / delete
+    - rpc() Only for the Functions in FUNCTIONS, Reimplemented in Python
+    - No RLS and No Triggers -> The Stripe Outbox and Storage GC Tables Stay Empty Unless a Test Fills Them
+"""
+import itertools
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.fakes.common import FakeState, json_response, now_iso, read_json
+
+# (Table, Embedded Name) -> (Local Column, Target Table, Target Column, To-Many)
+RELATIONS: Dict[Tuple[str, str], Tuple[str, str, str, bool]] = {
+    ("bookings", "event"): ("event_id", "event", "id", False),
+    ("bookings", "profile"): ("user_id", "profile", "id", False),
+    ("event", "profile"): ("created_by", "profile", "id", False),
+    ("event", "bookings"): ("id", "bookings", "event_id", True),
+    ("event", "event_category_map"): ("id", "event_category_map", "event_id", True),
+    ("event", "event_participants"): ("id", "event_participants", "event_id", True),
+    ("event_category_map", "event"): ("event_id", "event", "id", False),
+    ("event_category_map", "event_categories"): ("category_id", "event_categories", "id", False),
+    ("event_participants", "event"): ("event_id", "event", "id", False),
+    ("event_participants", "profile"): ("user_id", "profile", "id", False),
+}
+
+# Unique Constraints Other Than the Primary Key -> Used for on_conflict and 23505 Errors
+UNIQUE: Dict[str, List[Tuple[str, ...]]] = {
+    "event_participants": [("user_id", "event_id")],
+    "event_category_map": [("event_id", "category_id")],
+    "storage_gc_candidates": [("bucket", "path")],
+    "image_variant_jobs": [("bucket", "path")],
+}
+
+# Tables With bigserial Primary Keys -> Everything Else Gets a UUID
+SERIAL_TABLES = {"stripe_outbox", "storage_gc_candidates", "image_variant_jobs"}
+
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "event": {"event_status": "published", "stripe_product_id": None, "stripe_price_id": None, "description": None},
+    "bookings": {"payment_status": "pending", "stripe_session_id": None, "payment_method": None, "currency": "myr"},
+    "profile": {"bio": None, "avatar_url": None},
+    "stripe_outbox": {"status": "pending", "attempts": 0, "last_error": None, "locked_until": None},
+    # Due Right Away, Like the now() Default Upstream
+    "image_variant_jobs": {"status": "pending", "attempts": 0, "last_error": None, "next_attempt_at": "1970-01-01T00:00:00+00:00"},
+}
+
+# Operators the Route Handlers Understand -> Anything Else is a 400 Like an Unknown Operator Upstream
+OPERATORS = {"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "in", "is"}
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def error(status_code: int, code: str, message: str, details: Optional[str] = None) -> Response:
+    return json_response({"code": code, "message": message, "details": details, "hint": None}, status_code)
+
+
+class Table:
+    """
+    Rows in Insertion Order Plus Lazily Built Hash Indexes
+        - eq / in Filters and Embeds Look Rows Up by Column Value Instead of Scanning -> The Fake Stays Cheaper Than the App
+        - Indexes are Keyed by the Text Form of the Value, the Way Filter Values Arrive in the Query String
+    """
+    __slots__ = ("name", "rows", "by_id", "_serial", "_indexes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: List[Dict[str, Any]] = []
+        self.by_id: Dict[Any, Dict[str, Any]] = {}
+        self._serial = itertools.count(1)
+        self._indexes: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if "id" not in row or row["id"] is None:
+            row["id"] = next(self._serial) if self.name in SERIAL_TABLES else str(uuid4())
+        for key, value in DEFAULTS.get(self.name, {}).items():
+            row.setdefault(key, value)
+        row.setdefault("created_at", now_iso())
+        self.rows.append(row)
+        self.by_id[row["id"]] = row
+        for column, index in self._indexes.items():
+            index.setdefault(_text(row.get(column)), []).append(row)
+        return row
+
+    def remove(self, rows: List[Dict[str, Any]]):
+        doomed = {id(row) for row in rows}
+        self.rows = [row for row in self.rows if id(row) not in doomed]
+        for row in rows:
+            self.by_id.pop(row["id"], None)
+        self._indexes.clear()
+
+    def changed(self, columns):
+        # Rows are Updated in Place -> Drop the Indexes Whose Keys May Have Moved
+        for column in columns:
+            self._indexes.pop(column, None)
+
+    def index(self, column: str) -> Dict[str, List[Dict[str, Any]]]:
+        found = self._indexes.get(column)
+        if found is None:
+            found = self._indexes[column] = {}
+            for row in self.rows:
+                found.setdefault(_text(row.get(column)), []).append(row)
+        return found
+
+
+def table(state: FakeState, name: str) -> Table:
+    found = state.tables.get(name)
+    if found is None:
+        found = state.tables[name] = Table(name)
+    return found
+
+
+# select=*, a, alias:b, rel!inner(x, y(z)) -> [("column", name, alias) | ("embed", name, alias, inner, children)]
+def parse_select(text: str) -> List[tuple]:
+    items, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            items.append(current)
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    items.append(current)
+
+    nodes = []
+    for item in (item.strip() for item in items):
+        if not item:
+            continue
+        alias = None
+        head = item.split("(", 1)[0]
+        if ":" in head and "::" not in head:
+            alias, item = item.split(":", 1)
+        if "(" in item:
+            name, inner_text = item.split("(", 1)
+            inner = "!inner" in name
+            name = name.split("!", 1)[0].strip()
+            nodes.append(("embed", name, alias or name, inner, parse_select(inner_text[:-1])))
+        else:
+            name = item.split("::", 1)[0].strip()
+            nodes.append(("column", name, alias or name))
+    return nodes
+
+
+def _like(pattern: str, case_insensitive: bool) -> re.Pattern:
+    regex = "".join(".*" if c in "%*" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(regex, re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _compare(value: Any, raw: str) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            other = float(raw)
+            return (value > other) - (value < other)
+        except ValueError:
+            pass
+    text = _text(value)
+    return (text > raw) - (text < raw)
+
+
+def parse_filter(raw: str) -> Tuple[bool, str, Any]:
+    negate = raw.startswith("not.")
+    if negate:
+        raw = raw[4:]
+    operator, _, value = raw.partition(".")
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown Operator {operator}")
+    if operator == "in":
+        value = [part.strip().strip('"') for part in value.strip("()").split(",")] if value.strip("()") else []
+    elif operator in ("like", "ilike"):
+        value = _like(value, operator == "ilike")
+    return negate, operator, value
+
+
+def matches(row: Dict[str, Any], column: str, condition: Tuple[bool, str, Any]) -> bool:
+    negate, operator, value = condition
+    current = row.get(column)
+    if operator == "eq":
+        result = _text(current) == value if not isinstance(current, (int, float)) or isinstance(current, bool) else _compare(current, value) == 0
+    elif operator == "neq":
+        result = _text(current) != value
+    elif operator == "in":
+        result = _text(current) in value
+    elif operator == "is":
+        result = _text(current) == value
+    elif operator in ("like", "ilike"):
+        result = current is not None and value.fullmatch(str(current)) is not None
+    else:
+        order = _compare(current, value)
+        result = order is not None and {"gt": order > 0, "gte": order >= 0, "lt": order < 0, "lte": order <= 0}[operator]
+    return not result if negate else result
+
+
+def sort_rows(rows: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+    for term in reversed([term for term in order.split(",") if term]):
+        column, *modifiers = term.split(".")
+        descending = "desc" in modifiers
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key = lambda row: row[column], reverse = descending)
+        # PostgreSQL Puts NULLs Last Ascending and First Descending
+        rows = missing + present if descending else present + missing
+    return rows
+
+
+class Query:
+    """One Parsed Request -> Own-Column Filters, Embedded Filters per Embed Path, and the Select Tree"""
+    def __init__(self, request: Request):
+        params = request.query_params
+        self.select = parse_select(params.get("select", "*"))
+        self.filters: List[Tuple[str, tuple]] = []
+        self.embedded: Dict[str, List[Tuple[str, tuple]]] = {}
+        for key, raw in params.multi_items():
+            if key in RESERVED_PARAMS or key.endswith((".limit", ".offset", ".order")):
+                continue
+            path, _, column = key.rpartition(".")
+            condition = parse_filter(raw)
+            if path:
+                self.embedded.setdefault(path, []).append((column, condition))
+            else:
+                self.filters.append((column, condition))
+        self.order = params.get("order")
+        self.limit = int(params["limit"]) if "limit" in params else None
+        self.offset = int(params.get("offset", 0))
+
+    def filter_rows(self, state: FakeState, name: str) -> List[Dict[str, Any]]:
+        source = table(state, name)
+        rows = source.rows
+        # Narrow by the First eq / in Filter Through an Index, Then Check Every Filter on What is Left
+        for column, (negate, operator, value) in self.filters:
+            if negate or operator not in ("eq", "in"):
+                continue
+            index = source.index(column)
+            if operator == "eq":
+                rows = index.get(value, [])
+            else:
+                rows = [row for key in dict.fromkeys(value) for row in index.get(key, [])]
+            break
+        for column, condition in self.filters:
+            rows = [row for row in rows if matches(row, column, condition)]
+        return rows
+
+
+def _related(state: FakeState, name: str, embed: str):
+    relation = RELATIONS.get((name, embed))
+    if relation is None:
+        raise ValueError(f"Could Not Find a Relationship Between '{name}' and '{embed}'")
+    local, target, remote, many = relation
+    target_table = table(state, target)
+    if not many and remote == "id":
+        return target, lambda row: [target_table.by_id[row[local]]] if row.get(local) in target_table.by_id else [], many
+    index = target_table.index(remote)
+    return target, lambda row: index.get(_text(row.get(local)), []), many
+
+
+def render(state: FakeState, name: str, rows: List[Dict[str, Any]], select: List[tuple],
+           embedded: Dict[str, List], path: str = "") -> List[Dict[str, Any]]:
+    """Project the Rows Through the Select Tree -> !inner Embeds Drop Parents Without a Match"""
+    embeds = {}
+    for node in select:
+        if node[0] == "embed":
+            _, embed, alias, inner, children = node
+            target, lookup, many = _related(state, name, embed)
+            embeds[alias] = (embed, target, lookup, many, inner, children)
+
+    output = []
+    for row in rows:
+        item: Dict[str, Any] = {}
+        keep = True
+        for node in select:
+            if node[0] == "column":
+                if node[1] == "*":
+                    item.update(row)
+                else:
+                    item[node[2]] = row.get(node[1])
+                continue
+            embed, target, lookup, many, inner, children = embeds[node[2]]
+            embed_path = f"{path}{embed}"
+            related = lookup(row)
+            for column, condition in embedded.get(embed_path, []):
+                related = [candidate for candidate in related if matches(candidate, column, condition)]
+            if inner and not related:
+                keep = False
+                break
+            rendered = render(state, target, related, children, embedded, f"{embed_path}.")
+            item[node[2]] = rendered if many else (rendered[0] if rendered else None)
+        if keep:
+            output.append(item)
+    return output
+
+
+def _wants_object(request: Request) -> bool:
+    return "vnd.pgrst.object" in request.headers.get("accept", "")
+
+
+def _prefer(request: Request) -> str:
+    return request.headers.get("prefer", "")
+
+
+def _respond(request: Request, rows: List[Dict[str, Any]], status_code: int = 200,
+             total: Optional[int] = None, offset: int = 0) -> Response:
+    headers = {}
+    if total is not None:
+        headers["Content-Range"] = f"{offset}-{offset + len(rows) - 1}/{total}" if rows else f"*/{total}"
+    if "return=minimal" in _prefer(request) and request.method != "GET":
+        return Response(status_code = 201 if request.method == "POST" else 204, headers = headers)
+    if _wants_object(request):
+        if len(rows) != 1:
+            return error(406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                         f"The result contains {len(rows)} rows")
+        return json_response(rows[0], status_code, headers)
+    return json_response(rows, status_code, headers)
+
+
+# Database Functions the Services Call Through rpc() -> (State, Arguments) -> Result Rows
+def _organizer_booking_totals(state: FakeState, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    event_ids = set(args.get("event_ids") or [])
+    totals: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for row in table(state, "bookings").rows:
+        if row.get("event_id") in event_ids and row.get("payment_status") == "paid":
+            total = totals.setdefault((row["event_id"], row.get("currency")), {
+                "event_id": row["event_id"], "currency": row.get("currency"), "amount_total": 0, "tickets": 0
+            })
+            total["amount_total"] += row.get("amount_total") or 0
+            total["tickets"] += 1
+    return list(totals.values())
+
+
+def _create_event_with_category(state: FakeState, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    event = table(state, "event").insert(dict(args["payload"]))
+    if args.get("category_id"):
+        table(state, "event_category_map").insert({"event_id": event["id"], "category_id": args["category_id"]})
+    return [event]
+
+
+FUNCTIONS = {
+    "organizer_booking_totals": _organizer_booking_totals,
+    "create_event_with_category": _create_event_with_category,
+}
+
+
+def make_routes(state: FakeState) -> List[Route]:
+    async def read(request: Request) -> Response:
+        name = request.path_params["table"]
+        try:
+            query = Query(request)
+            rows = query.filter_rows(state, name)
+            rows = render(state, name, rows, query.select, query.embedded)
+        except ValueError as e:
+            return error(400, "PGRST100", str(e))
+        if query.order:
+            rows = sort_rows(rows, query.order)
+        total = len(rows) if "count=" in _prefer(request) else None
+        end = query.offset + query.limit if query.limit is not None else None
+        rows = rows[query.offset:end]
+        if request.method == "HEAD":
+            response = _respond(request, rows, total = total, offset = query.offset)
+            return Response(status_code = response.status_code, headers = {
+                key: value for key, value in response.headers.items() if key.lower() == "content-range"
+            })
+        return _respond(request, rows, total = total, offset = query.offset)
+
+    async def insert(request: Request) -> Response:
+        name = request.path_params["table"]
+        body = await read_json(request)
+        payload = body if isinstance(body, list) else [body]
+        target = table(state, name)
+        prefer = _prefer(request)
+        on_conflict = tuple(request.query_params.get("on_conflict", "id").split(","))
+        written = []
+        for values in payload:
+            values = dict(values)
+            existing = None
+            keys = [on_conflict] if "resolution=" in prefer else [("id",)] + UNIQUE.get(name, [])
+            for key in keys:
+                if all(column in values for column in key):
+                    candidates = target.index(key[0]).get(_text(values[key[0]]), [])
+                    existing = next((row for row in candidates if all(row.get(c) == values[c] for c in key)), None)
+                    if existing is not None:
+                        break
+            if existing is not None:
+                if "resolution=ignore-duplicates" in prefer:
+                    continue
+                if "resolution=merge-duplicates" in prefer:
+                    existing.update(values)
+                    target.changed(values)
+                    written.append(existing)
+                    continue
+                return error(409, "23505", f'duplicate key value violates unique constraint "{name}_pkey"')
+            written.append(target.insert(values))
+        select = parse_select(request.query_params.get("select", "*"))
+        return _respond(request, render(state, name, written, select, {}), 201)
+
+    async def update(request: Request) -> Response:
+        name = request.path_params["table"]
+        values = await read_json(request) or {}
+        try:
+            query = Query(request)
+            rows = query.filter_rows(state, name)
+        except ValueError as e:
+            return error(400, "PGRST100", str(e))
+        for row in rows:
+            row.update(values)
+        table(state, name).changed(values)
+        return _respond(request, render(state, name, rows, query.select, {}))
+
+    async def delete(request: Request) -> Response:
+        name = request.path_params["table"]
+        try:
+            query = Query(request)
+            rows = query.filter_rows(state, name)
+        except ValueError as e:
+            return error(400, "PGRST100", str(e))
+        table(state, name).remove(rows)
+        # ON DELETE CASCADE for the Category Map -> The Only Cascade the Services Rely On
+        if name == "event" and rows:
+            doomed = {row["id"] for row in rows}
+            mapping = table(state, "event_category_map")
+            mapping.remove([row for row in mapping.rows if row.get("event_id") in doomed])
+        return _respond(request, render(state, name, rows, query.select, {}))
+
+    async def rpc(request: Request) -> Response:
+        function = FUNCTIONS.get(request.path_params["function"])
+        if function is None:
+            return error(404, "PGRST202", f"Could not find the function public.{request.path_params['function']} in the schema cache")
+        args = dict(request.query_params) if request.method == "GET" else await read_json(request) or {}
+        return _respond(request, function(state, args))
+
+    return [
+        Route("/rest/v1/rpc/{function}", rpc, methods = ["GET", "POST"]),
+        Route("/rest/v1/{table}", read, methods = ["GET", "HEAD"]),
+        Route("/rest/v1/{table}", insert, methods = ["POST"]),
+        Route("/rest/v1/{table}", update, methods = ["PATCH"]),
+        Route("/rest/v1/{table}", delete, methods = ["DELETE"]),
+    ]
@@ -0,0 +1,134 @@
+"""
+Deterministic Synthetic Data for the Fakes
+    - Organizers, Buyers (Auth Users + Profiles), Categories, Published Events With Synced Stripe Prices,
+      Paid Bookings Spread Over the Last 90 Days, the Matching Participants and a Few Empty Flash-Sale Events
+    - The Same Seed Gives the Same Rows -> Benchmark Runs are Comparable
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import UUID
+from benchmarks.fakes.auth import create_user, issue_session
+from benchmarks.fakes.common import FakeState
+from benchmarks.fakes.postgrest import table
+
+CATEGORIES = ["Music", "Technology", "Business", "Sports", "Arts", "Food & Drink", "Education", "Health", "Charity", "Community"]
+CITIES = ["Kuala Lumpur", "Penang", "Johor Bahru", "Ipoh", "Kuching", "Kota Kinabalu", "Melaka", "Singapore"]
+PASSWORD = "fake-password-123"
+
+
+@dataclass
+class SeedSummary:
+    """What the Load Generator Needs to Build Requests -> IDs and Ready-to-Use Bearer Tokens"""
+    organizers: List[Dict[str, str]] = field(default_factory = list)
+    buyers: List[Dict[str, str]] = field(default_factory = list)
+    event_ids: List[str] = field(default_factory = list)
+    paid_event_ids: List[str] = field(default_factory = list)
+    category_ids: List[str] = field(default_factory = list)
+    flash_event_ids: List[str] = field(default_factory = list)
+    bookings: int = 0
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(UUID(int = rng.getrandbits(128), version = 4))
+
+
+def _stripe_id(rng: random.Random, prefix: str) -> str:
+    return f"{prefix}{rng.getrandbits(96):024x}"
+
+
+def seed(
+    state: FakeState,
+    organizers: int = 20,
+    buyers: int = 500,
+    events_per_organizer: int = 10,
+    bookings: int = 20000,
+    seed_value: int = 42,
+    flash_events: int = 3,
+    flash_slots: int = 200
+) -> SeedSummary:
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc)
+    summary = SeedSummary()
+
+    def user(role: str, index: int) -> Dict[str, str]:
+        account = create_user(state, f"{role}{index}@eventora.test", PASSWORD, f"{role.title()} {index}", _uuid(rng))
+        return {"id": account["id"], "email": account["email"], "token": issue_session(account)["access_token"]}
+
+    summary.organizers = [user("organizer", i) for i in range(organizers)]
+    summary.buyers = [user("buyer", i) for i in range(buyers)]
+
+    categories = table(state, "event_categories")
+    for name in CATEGORIES:
+        summary.category_ids.append(categories.insert({"id": _uuid(rng), "name": name})["id"])
+
+    events, mapping = table(state, "event"), table(state, "event_category_map")
+
+    def add_event(organizer: Dict[str, str], max_slots: int, is_paid: bool) -> Dict:
+        start = now + timedelta(days = rng.randint(-30, 120), hours = rng.randint(8, 20))
+        currency = rng.choice(["myr", "myr", "myr", "usd", "sgd"])
+        price = round(rng.uniform(10, 250), 2) if is_paid else 0
+        row = {
+            "id": _uuid(rng),
+            "title": f"{rng.choice(CATEGORIES)} {rng.choice(['Meetup', 'Summit', 'Festival', 'Workshop', 'Night'])} {len(events.rows) + 1}",
+            "description": "Synthetic Event for Load Benchmarks",
+            "location": rng.choice(CITIES),
+            "event_date": start.isoformat(),
+            "event_end_date": (start + timedelta(hours = rng.randint(2, 10))).isoformat(),
+            "max_slots": max_slots,
+            "is_paid": is_paid,
+            "ticket_price": price,
+            "currency": currency,
+            "event_status": "published",
+            "created_by": organizer["id"],
+            "image_url": "",
+            "created_at": (now - timedelta(days = rng.randint(0, 120), seconds = rng.randint(0, 86400))).isoformat(),
+        }
+        if is_paid:
+            # Already Synced by the Outbox Worker -> Checkout Never Waits on a Price
+            product = _stripe_id(rng, "prod_")
+            row["stripe_product_id"] = product
+            row["stripe_price_id"] = _stripe_id(rng, "price_")
+            state.stripe[product] = {"id": product, "object": "product", "name": row["title"], "active": True, "metadata": {}}
+            state.stripe[row["stripe_price_id"]] = {
+                "id": row["stripe_price_id"], "object": "price", "product": product, "active": True,
+                "currency": currency, "unit_amount": int(round(price * 100)), "type": "one_time", "metadata": {},
+            }
+            summary.paid_event_ids.append(row["id"])
+        events.insert(row)
+        summary.event_ids.append(row["id"])
+        for category_id in rng.sample(summary.category_ids, rng.randint(1, 2)):
+            mapping.insert({"event_id": row["id"], "category_id": category_id})
+        return row
+
+    for organizer in summary.organizers:
+        for _ in range(events_per_organizer):
+            add_event(organizer, rng.choice([50, 100, 200, 500, 1000, 100000]), rng.random() < 0.75)
+
+    booking_table, participants = table(state, "bookings"), table(state, "event_participants")
+    joined = set()
+    for _ in range(bookings):
+        event = events.by_id[rng.choice(summary.event_ids)]
+        buyer = rng.choice(summary.buyers)
+        booking_table.insert({
+            "id": _uuid(rng),
+            "user_id": buyer["id"],
+            "event_id": event["id"],
+            "amount_total": int(round(event["ticket_price"] * 100)),
+            "currency": event["currency"],
+            "payment_status": "paid",
+            "payment_method": "card",
+            "stripe_session_id": _stripe_id(rng, "cs_test_") if event["is_paid"] else None,
+            "created_at": (now - timedelta(days = rng.uniform(0, 90))).isoformat(),
+        })
+        if (buyer["id"], event["id"]) not in joined:
+            joined.add((buyer["id"], event["id"]))
+            participants.insert({"user_id": buyer["id"], "event_id": event["id"], "status": "confirmed"})
+    summary.bookings = bookings
+
+    # Ticket Drops -> Paid, Small and Untouched, So a Flash Sale Sells Them Out During the Run
+    for _ in range(flash_events):
+        summary.flash_event_ids.append(add_event(rng.choice(summary.organizers), flash_slots, True)["id"])
+    return summary
+
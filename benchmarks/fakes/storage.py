@@ -0,0 +1,187 @@
+"""
+In-Memory Supabase Storage Subset
+    - Objects are Held as Bytes Keyed by (bucket, path) -> Every Bucket Exists and is Public
+    - Covers What StorageService and StorageGcService Call: upload / update, signed upload URLs, exists (HEAD),
+      info, download (Whole or One Byte Range), move, copy, remove, list and signed download URLs
+"""
+import hashlib
+import re
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.fakes.common import FakeState, json_response, now_iso, read_json
+
+
+def error(status_code: int, message: str) -> Response:
+    # Storage API Error Shape -> storage3 Raises StorageException From It
+    return json_response({"statusCode": str(status_code), "error": "Error", "message": message}, status_code)
+
+
+def _key(request: Request) -> Tuple[str, str]:
+    return request.path_params["bucket"], request.path_params["path"]
+
+
+def _metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "size": len(entry["data"]),
+        "mimetype": entry["content_type"],
+        "eTag": entry["etag"],
+        "cacheControl": "max-age=3600",
+        "lastModified": entry["updated_at"],
+    }
+
+
+def _store(state: FakeState, bucket: str, path: str, data: bytes, content_type: str) -> Dict[str, Any]:
+    timestamp = now_iso()
+    entry = state.objects[(bucket, path)] = {
+        "id": str(uuid4()),
+        "data": data,
+        "content_type": content_type,
+        "etag": f'"{hashlib.md5(data).hexdigest()}"',
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+    return entry
+
+
+async def _file_from(request: Request) -> Tuple[bytes, str]:
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form["file"]
+        return await upload.read(), upload.content_type or "application/octet-stream"
+    return await request.body(), content_type
+
+
+def make_routes(state: FakeState) -> List[Route]:
+    # Signed Upload Token -> (bucket, path) It Was Issued For, Consumed by the PUT
+    grants: Dict[str, Tuple[str, str]] = {}
+
+    async def upload(request: Request) -> Response:
+        bucket, path = _key(request)
+        upsert = request.method == "PUT" or request.headers.get("x-upsert") == "true"
+        if (bucket, path) in state.objects and not upsert:
+            return error(409, "The resource already exists")
+        data, content_type = await _file_from(request)
+        entry = _store(state, bucket, path, data, content_type)
+        return json_response({"Id": entry["id"], "Key": f"{bucket}/{path}"})
+
+    async def head(request: Request) -> Response:
+        entry = state.objects.get(_key(request))
+        if entry is None:
+            return Response(status_code = 400)
+        return Response(status_code = 200, headers = {"content-length": str(len(entry["data"])), "etag": entry["etag"]})
+
+    async def download(request: Request) -> Response:
+        entry = state.objects.get(_key(request))
+        if entry is None:
+            return error(400, "Object not found")
+        # Single bytes=start-end Ranges Only -> Enough for Header Sniffing
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if match:
+            data = entry["data"]
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+            return Response(data[start:end + 1], status_code = 206, media_type = entry["content_type"], headers = {
+                "etag": entry["etag"], "content-range": f"bytes {start}-{end}/{len(data)}"
+            })
+        return Response(entry["data"], media_type = entry["content_type"], headers = {"etag": entry["etag"]})
+
+    async def info(request: Request) -> Response:
+        bucket, path = _key(request)
+        entry = state.objects.get((bucket, path))
+        if entry is None:
+            return error(400, "Object not found")
+        return json_response({
+            "id": entry["id"], "name": path, "bucket_id": bucket, "version": entry["etag"].strip('"'),
+            "size": len(entry["data"]), "content_type": entry["content_type"], "etag": entry["etag"],
+            "created_at": entry["created_at"], "updated_at": entry["updated_at"], "last_modified": entry["updated_at"],
+            "metadata": _metadata(entry),
+        })
+
+    async def sign_upload(request: Request) -> Response:
+        bucket, path = _key(request)
+        token = uuid4().hex
+        grants[token] = (bucket, path)
+        return json_response({"url": f"/object/upload/sign/{bucket}/{path}?token={token}"})
+
+    async def upload_signed(request: Request) -> Response:
+        bucket, path = _key(request)
+        if grants.pop(request.query_params.get("token", ""), None) != (bucket, path):
+            return error(400, "Invalid signature")
+        data, content_type = await _file_from(request)
+        _store(state, bucket, path, data, content_type)
+        return json_response({"Key": f"{bucket}/{path}"})
+
+    async def sign(request: Request) -> Response:
+        bucket, path = _key(request)
+        if (bucket, path) not in state.objects:
+            return error(400, "Object not found")
+        return json_response({"signedURL": f"/object/sign/{bucket}/{path}?token={uuid4().hex}"})
+
+    async def move_or_copy(request: Request) -> Response:
+        body = await read_json(request) or {}
+        bucket = body.get("bucketId")
+        source = state.objects.get((bucket, body.get("sourceKey")))
+        if source is None:
+            return error(400, "Object not found")
+        destination = (body.get("destinationBucket") or bucket, body.get("destinationKey"))
+        if destination in state.objects:
+            return error(409, "The resource already exists")
+        state.objects[destination] = dict(source, id = str(uuid4()))
+        if request.url.path.endswith("/move"):
+            del state.objects[(bucket, body.get("sourceKey"))]
+            return json_response({"message": "Successfully moved"})
+        return json_response({"Key": f"{destination[0]}/{destination[1]}"})
+
+    async def remove(request: Request) -> Response:
+        bucket = request.path_params["bucket"]
+        body = await read_json(request) or {}
+        removed = []
+        for path in body.get("prefixes", []):
+            entry = state.objects.pop((bucket, path), None)
+            if entry is not None:
+                removed.append({"name": path, "bucket_id": bucket, "id": entry["id"], "metadata": _metadata(entry)})
+        return json_response(removed)
+
+    async def listing(request: Request) -> Response:
+        bucket = request.path_params["bucket"]
+        body = await read_json(request) or {}
+        prefix = (body.get("prefix") or "").strip("/")
+        prefix = f"{prefix}/" if prefix else ""
+        # One Level Deep Like the Real API -> Sub-Folders Come Back as Entries Without an id
+        entries: Dict[str, Dict[str, Any]] = {}
+        for (object_bucket, path), entry in state.objects.items():
+            if object_bucket != bucket or not path.startswith(prefix):
+                continue
+            name, slash, _ = path[len(prefix):].partition("/")
+            if slash:
+                entries.setdefault(name, {"name": name, "id": None, "updated_at": None, "created_at": None, "metadata": None})
+            else:
+                entries[name] = {
+                    "name": name, "id": entry["id"], "updated_at": entry["updated_at"],
+                    "created_at": entry["created_at"], "last_accessed_at": entry["updated_at"], "metadata": _metadata(entry),
+                }
+        sort = body.get("sortBy") or {"column": "name", "order": "asc"}
+        column = sort.get("column", "name")
+        rows = sorted(entries.values(), key = lambda row: row.get(column) or "", reverse = sort.get("order") == "desc")
+        offset = int(body.get("offset") or 0)
+        limit = int(body.get("limit") or 100)
+        return json_response(rows[offset:offset + limit])
+
+    return [
+        Route("/storage/v1/object/upload/sign/{bucket}/{path:path}", sign_upload, methods = ["POST"]),
+        Route("/storage/v1/object/upload/sign/{bucket}/{path:path}", upload_signed, methods = ["PUT"]),
+        Route("/storage/v1/object/sign/{bucket}/{path:path}", sign, methods = ["POST"]),
+        Route("/storage/v1/object/info/{bucket}/{path:path}", info, methods = ["GET"]),
+        Route("/storage/v1/object/public/{bucket}/{path:path}", download, methods = ["GET"]),
+        Route("/storage/v1/object/list/{bucket}", listing, methods = ["POST"]),
+        Route("/storage/v1/object/move", move_or_copy, methods = ["POST"]),
+        Route("/storage/v1/object/copy", move_or_copy, methods = ["POST"]),
+        Route("/storage/v1/object/{bucket}", remove, methods = ["DELETE"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", upload, methods = ["POST", "PUT"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", head, methods = ["HEAD"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", download, methods = ["GET"]),
+    ]
@@ -0,0 +1,175 @@
+"""
+In-Memory Stripe API Subset, in the Spirit of stripe-mock
+    - Products, Prices and Checkout Sessions are Stored so Retrieve / Modify See Earlier Writes
+    - Form Bodies are Decoded Into Nested Dicts (line_items[0][price] -> {"line_items": [{"price": ...}]})
+    - checkout_completed_event() + sign_payload() Build a Webhook Delivery the Real Stripe Library Accepts
+"""
+import hashlib
+import hmac
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+from uuid import uuid4
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.fakes.common import WEBHOOK_SECRET, FakeState, json_response
+
+# URL Collection -> (Object Name, ID Prefix)
+RESOURCES: Dict[str, Tuple[str, str]] = {
+    "products": ("product", "prod_"),
+    "prices": ("price", "price_"),
+    "checkout/sessions": ("checkout.session", "cs_test_"),
+}
+
+_INDEX = re.compile(r"\[([^\]]*)\]")
+
+
+def new_id(prefix: str) -> str:
+    return prefix + uuid4().hex[:24]
+
+
+def decode_form(body: bytes) -> Dict[str, Any]:
+    """Rebuild the Nested Structure the Stripe Library Flattened Into Bracketed Form Keys"""
+    result: Dict[str, Any] = {}
+    for key, value in parse_qsl(body.decode(), keep_blank_values = True):
+        head = key.split("[", 1)[0]
+        parts = [head] + _INDEX.findall(key[len(head):])
+        target: Any = result
+        for part, following in zip(parts, parts[1:] + [None]):
+            container = [] if following is not None and following.isdigit() else {}
+            if isinstance(target, list):
+                index = int(part)
+                while len(target) <= index:
+                    target.append(None)
+                if following is None:
+                    target[index] = value
+                elif target[index] is None:
+                    target[index] = container
+                target = target[index]
+            else:
+                if following is None:
+                    target[part] = value
+                else:
+                    target = target.setdefault(part, container)
+    return result
+
+
+def _coerce(value: Any) -> Any:
+    # Form Values Arrive as Strings -> Turn the Obvious Ones Back Into Numbers and Booleans
+    if isinstance(value, dict):
+        return {key: item if key == "metadata" else _coerce(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_coerce(item) for item in value]
+    if value in ("true", "false"):
+        return value == "true"
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def error(status_code: int, code: str, message: str, param: Optional[str] = None) -> Response:
+    return json_response({"error": {"type": "invalid_request_error", "code": code, "message": message, "param": param}}, status_code)
+
+
+def _missing(name: str, object_id: str) -> Response:
+    return error(404, "resource_missing", f"No such {name}: '{object_id}'", "id")
+
+
+def _build(state: FakeState, collection: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    name, prefix = RESOURCES[collection]
+    obj = {"id": new_id(prefix), "object": name, "created": int(time.time()), "livemode": False, "metadata": {}}
+    obj.update(params)
+    if collection in ("products", "prices"):
+        obj.setdefault("active", True)
+    if collection == "prices":
+        if obj.get("product") not in state.stripe:
+            return None
+        obj.setdefault("type", "one_time")
+    if collection == "checkout/sessions":
+        amount = 0
+        for item in obj.get("line_items") or []:
+            price = state.stripe.get(item.get("price"))
+            if price is None:
+                return None
+            amount += price.get("unit_amount", 0) * int(item.get("quantity", 1))
+            obj.setdefault("currency", price.get("currency"))
+        obj.pop("line_items", None)
+        obj.update({
+            "url": f"https://checkout.stripe.com/c/pay/{obj['id']}",
+            "amount_total": amount,
+            "amount_subtotal": amount,
+            "status": "open",
+            "payment_status": "unpaid",
+            "payment_intent": None,
+        })
+    state.stripe[obj["id"]] = obj
+    return obj
+
+
+def make_routes(state: FakeState) -> List[Route]:
+    def collection_of(request: Request) -> Optional[str]:
+        path = request.path_params["path"]
+        return next((name for name in RESOURCES if path == name or path.startswith(name + "/")), None)
+
+    async def dispatch(request: Request) -> Response:
+        collection = collection_of(request)
+        if collection is None:
+            return error(404, "resource_missing", f"Unrecognized request URL ({request.method}: {request.url.path})")
+        name = RESOURCES[collection][0]
+        object_id = request.path_params["path"][len(collection) + 1:] or None
+        params = _coerce(decode_form(await request.body())) if request.method == "POST" else {}
+
+        if object_id is None:
+            if request.method == "POST":
+                obj = _build(state, collection, params)
+                if obj is None:
+                    return error(400, "resource_missing", "No such price or product referenced", "price")
+                return json_response(obj)
+            prefix = RESOURCES[collection][1]
+            data = [obj for key, obj in state.stripe.items() if key.startswith(prefix)]
+            return json_response({"object": "list", "data": data[:int(request.query_params.get("limit", 10))], "has_more": False})
+
+        obj = state.stripe.get(object_id)
+        if obj is None:
+            return _missing(name, object_id)
+        if request.method == "POST":
+            metadata = params.pop("metadata", None)
+            obj.update(params)
+            if metadata:
+                obj["metadata"].update(metadata)
+        elif request.method == "DELETE":
+            del state.stripe[object_id]
+            return json_response({"id": object_id, "object": name, "deleted": True})
+        return json_response(obj)
+
+    return [Route("/v1/{path:path}", dispatch, methods = ["GET", "POST", "DELETE"])]
+
+
+def complete_session(state: FakeState, session_id: str) -> Dict[str, Any]:
+    # What Stripe Does When the Customer Pays -> The Webhook Payload Carries the Updated Session
+    session = state.stripe[session_id]
+    session.update({"status": "complete", "payment_status": "paid", "payment_intent": new_id("pi_")})
+    return session
+
+
+def checkout_completed_event(session: Dict[str, Any]) -> bytes:
+    return json.dumps({
+        "id": new_id("evt_"),
+        "object": "event",
+        "api_version": "2024-06-20",
+        "created": int(time.time()),
+        "type": "checkout.session.completed",
+        "livemode": False,
+        "pending_webhooks": 1,
+        "data": {"object": session},
+    }).encode()
+
+
+def sign_payload(payload: bytes, secret: str = WEBHOOK_SECRET, timestamp: Optional[int] = None) -> str:
+    """Stripe-Signature Header Value -> t=<unix>,v1=<HMAC-SHA256 of "<t>.<payload>">"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
@@ -0,0 +1,132 @@
+"""
+JSON Response Benchmark
+
+Compares FastAPI's Default Response Path With the orjson / TypeAdapter Path on a 50-Item
+Event Page (Plain Dicts, No response_model) and a 50-Item Booking History (response_model),
+Then Reports the Body Size With Gzip and Brotli.
+
+Usage:
+    python -m benchmarks.json_responses --items 50
+"""
+import argparse
+import asyncio
+import gzip
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import uuid4
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from app.core.responses import FastJSONResponse, TypedJSONResponse
+from app.schemas.booking import BookingDetailResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Build a Page Shaped Like the EventService.list_events Response
+def make_event_page(items: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    events = []
+    for i in range(items):
+        start = now + timedelta(days = rng.randrange(1, 120))
+        events.append({
+            "id": str(uuid4()),
+            "title": f"Event {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * rng.randrange(2, 8),
+            "location": rng.choice(("Kuala Lumpur", "Penang", "Online")),
+            "event_date": start.isoformat(),
+            "event_end_date": (start + timedelta(hours = 3)).isoformat(),
+            "event_status": "published",
+            "image_url": f"https://example.supabase.co/storage/v1/object/public/event-images/banners/{uuid4().hex}/card.webp",
+            "image_original_url": f"https://example.supabase.co/storage/v1/object/public/event-images/banners/{uuid4().hex}/original.jpg",
+            "max_slots": rng.randrange(20, 500),
+            "is_paid": True,
+            "currency": "myr",
+            "ticket_price": rng.choice((15.0, 25.5, 80.0)),
+            "created_by": str(uuid4()),
+            "created_at": now.isoformat(),
+            "stripe_product_id": f"prod_{uuid4().hex[:14]}",
+            "stripe_price_id": f"price_{uuid4().hex[:14]}",
+            "current_bookings": rng.randrange(0, 20),
+            "event_category_map": [{"event_categories": {"id": str(uuid4()), "name": "Music"}}]
+        })
+    return {"items": events, "total": items * 10, "page": 1, "size": items}
+
+
+# Build a Booking History Shaped Like the BookingService.list_my_bookings Response
+def make_booking_history(items: int):
+    now = datetime.now(timezone.utc).isoformat()
+    return [{
+        "id": str(uuid4()), "event_id": str(uuid4()), "user_id": str(uuid4()),
+        "amount_total": 2550, "currency": "myr", "payment_status": "paid", "payment_method": "card",
+        "created_at": now, "stripe_session_id": f"cs_test_{uuid4().hex}",
+        "event": {"title": "Event", "location": "Online", "event_date": now, "image_url": None},
+        "profile": {"full_name": "Buyer", "email": "buyer@example.com"}
+    } for _ in range(items)]
+
+
+# FastAPI Without a response_model -> jsonable_encoder, Then json.dumps
+def default_untyped(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+def fast_untyped(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+# FastAPI With a response_model -> Validate, Serialize to Python, Then json.dumps
+booking_field = create_model_field("Response_get_my_booking_history", List[BookingDetailResponse], mode = "serialization")
+booking_adapter = TypeAdapter(List[BookingDetailResponse])
+loop = asyncio.new_event_loop()
+
+def default_typed(content) -> bytes:
+    return JSONResponse(loop.run_until_complete(serialize_response(field = booking_field, response_content = content))).body
+
+def fast_typed(content) -> bytes:
+    return TypedJSONResponse(booking_adapter, content).body
+
+
+def _time(fn, content, repeat: int) -> float:
+    fn(content)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type = int, default = 50)
+    parser.add_argument("--repeat", type = int, default = 500)
+    args = parser.parse_args()
+
+    page = make_event_page(args.items)
+    history = make_booking_history(args.items)
+    # Sanity Check -> Both Paths Must Produce the Same Document
+    assert fast_untyped(page) == default_untyped(page)
+    assert TypeAdapter(list).validate_json(fast_typed(history)) == TypeAdapter(list).validate_json(default_typed(history))
+
+    for label, content, default, fast in (
+        (f"event page ({args.items} items, untyped)", page, default_untyped, fast_untyped),
+        (f"booking history ({args.items} items, typed)", history, default_typed, fast_typed)
+    ):
+        default_seconds = _time(default, content, args.repeat)
+        fast_seconds = _time(fast, content, args.repeat)
+        print(label)
+        print(f"  {'fastapi default':<20} {default_seconds * 1e6:>10.1f} us")
+        print(f"  {'fast path':<20} {fast_seconds * 1e6:>10.1f} us   x{default_seconds / fast_seconds:.1f}")
+
+    body = fast_untyped(page)
+    print(f"event page body: {len(body):,} B raw, {len(gzip.compress(body, 6)):,} B gzip-6", end = "")
+    print(f", {len(brotli.compress(body, quality = 4)):,} B br-4" if brotli else " (brotli not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+End-to-End Load Test Against the Local Fake Backends
+
+Starts the Fakes (python -m benchmarks.fakes) and the App (uvicorn) as Separate Processes, Drives the
+Hot Endpoints With a Weighted Request Mix From Concurrent Virtual Users, Then Writes p50 / p95 / p99
+Latency, Throughput and Error Rates per Endpoint as JSON and Compares Them With a Stored Baseline.
+
+Scenarios:
+    browse      A Browse-Heavy Day -> Mostly Event Listing and Detail Pages, Occasional Checkouts and Dashboards
+    flash-sale  A Ticket Drop -> Hundreds of Buyers Hammering Checkout on a Few Small Events, Webhooks Close Behind
+
+Expected Refusals (a Sold-Out or Already-Registered Checkout is a 400) are Counted per Status Code but
+Not as Errors. Errors are Transport Failures, Timeouts, 5xx and Any Other Unexpected Status.
+
+Usage:
+    python -m benchmarks.load_test --scenario browse --duration 30
+    python -m benchmarks.load_test --scenario flash-sale --output flash.json
+    python -m benchmarks.load_test --scenario browse --save-baseline
+    python -m benchmarks.load_test --scenario browse --app-env METRICS_ENABLED=false
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import httpx
+from benchmarks.fakes.app import FakeBackends, _free_port
+from benchmarks.fakes.common import FakeState
+from benchmarks.fakes.seed import SeedSummary, seed
+from benchmarks.fakes.stripe_mock import checkout_completed_event, new_id, sign_payload
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+API = "/api/v1"
+
+
+@dataclass
+class Scenario:
+    """
+    A Request Mix
+        - weights: Operation Name -> Relative Share of Requests
+        - hot_events: How Many of the Seeded Flash-Sale Events Checkouts Concentrate On (0 -> Spread Over All Paid Events)
+    """
+    name: str
+    users: int
+    weights: Dict[str, float]
+    think_ms: Tuple[float, float]
+    hot_events: int = 0
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "browse": Scenario(
+        "browse", users = 32, think_ms = (0, 20),
+        weights = {"list_events": 50, "get_event": 35, "dashboard": 7, "checkout": 6, "webhook": 2}
+    ),
+    "flash-sale": Scenario(
+        "flash-sale", users = 128, think_ms = (0, 5), hot_events = 3,
+        weights = {"list_events": 5, "get_event": 25, "dashboard": 2, "checkout": 55, "webhook": 13}
+    ),
+}
+
+# Endpoint -> Statuses That are a Correct Answer Under Load
+EXPECTED_STATUSES: Dict[str, Tuple[int, ...]] = {
+    "GET /events": (200,),
+    "GET /events/{id}": (200,),
+    "POST /bookings/checkout": (201, 400),
+    "POST /bookings/webhook": (200,),
+    "GET /dashboard/organizer": (200,),
+}
+
+ENDPOINTS: Dict[str, str] = {
+    "list_events": "GET /events",
+    "get_event": "GET /events/{id}",
+    "checkout": "POST /bookings/checkout",
+    "webhook": "POST /bookings/webhook",
+    "dashboard": "GET /dashboard/organizer",
+}
+
+SEARCH_TERMS = ["music", "summit", "night", "tech", "festival", "workshop"]
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadContext:
+    summary: SeedSummary
+    rng: random.Random
+    hot_event_ids: List[str]
+    # Checkouts Waiting for Their Webhook -> Filled by checkout, Drained by webhook
+    sessions: Deque[Dict] = field(default_factory = deque)
+    samples: List[Sample] = field(default_factory = list)
+    recording: bool = False
+
+
+# Operations -> Each Sends One Request and Returns (Endpoint Label, Response)
+async def op_list_events(client: httpx.AsyncClient, ctx: LoadContext):
+    rng = ctx.rng
+    params = {"page": rng.choice([1, 1, 1, 2, 3]), "size": rng.choice([9, 9, 12, 24])}
+    roll = rng.random()
+    if roll < 0.2:
+        params["category_id"] = rng.choice(ctx.summary.category_ids)
+    elif roll < 0.3:
+        params["search"] = rng.choice(SEARCH_TERMS)
+    return "GET /events", await client.get(f"{API}/events/", params = params)
+
+
+async def op_get_event(client: httpx.AsyncClient, ctx: LoadContext):
+    pool = ctx.hot_event_ids if ctx.hot_event_ids and ctx.rng.random() < 0.8 else ctx.summary.event_ids
+    return "GET /events/{id}", await client.get(f"{API}/events/{ctx.rng.choice(pool)}")
+
+
+async def op_checkout(client: httpx.AsyncClient, ctx: LoadContext):
+    buyer = ctx.rng.choice(ctx.summary.buyers)
+    event_id = ctx.rng.choice(ctx.hot_event_ids or ctx.summary.paid_event_ids)
+    response = await client.post(
+        f"{API}/bookings/checkout",
+        json = {"event_id": event_id, "success_url": "http://localhost/success", "cancel_url": "http://localhost/cancel"},
+        headers = {"Authorization": f"Bearer {buyer['token']}"}
+    )
+    if response.status_code == 201:
+        body = response.json()
+        if body.get("checkout_url"):
+            ctx.sessions.append({
+                "id": body["checkout_url"].rsplit("/", 1)[-1],
+                "booking_id": body["booking_id"],
+                "user_id": buyer["id"],
+                "event_id": event_id,
+            })
+    return "POST /bookings/checkout", response
+
+
+async def op_webhook(client: httpx.AsyncClient, ctx: LoadContext):
+    if not ctx.sessions:
+        # Nothing to Confirm Yet -> Keep the Mix Moving With Another Checkout
+        return await op_checkout(client, ctx)
+    pending = ctx.sessions.popleft()
+    session = {
+        "id": pending["id"],
+        "object": "checkout.session",
+        "status": "complete",
+        "payment_status": "paid",
+        "payment_intent": new_id("pi_"),
+        "amount_total": 5000,
+        "metadata": {"booking_id": pending["booking_id"], "user_id": pending["user_id"], "event_id": pending["event_id"]},
+    }
+    payload = checkout_completed_event(session)
+    return "POST /bookings/webhook", await client.post(
+        f"{API}/bookings/webhook",
+        content = payload,
+        headers = {"Stripe-Signature": sign_payload(payload), "Content-Type": "application/json"}
+    )
+
+
+async def op_dashboard(client: httpx.AsyncClient, ctx: LoadContext):
+    organizer = ctx.rng.choice(ctx.summary.organizers)
+    params = {"granularity": ctx.rng.choice(["day", "day", "week", "month"])}
+    return "GET /dashboard/organizer", await client.get(
+        f"{API}/dashboard/organizer", params = params, headers = {"Authorization": f"Bearer {organizer['token']}"}
+    )
+
+
+OPERATIONS: Dict[str, Callable] = {
+    "list_events": op_list_events,
+    "get_event": op_get_event,
+    "checkout": op_checkout,
+    "webhook": op_webhook,
+    "dashboard": op_dashboard,
+}
+
+
+async def virtual_user(client: httpx.AsyncClient, ctx: LoadContext, scenario: Scenario, deadline: float):
+    names = list(scenario.weights)
+    weights = [scenario.weights[name] for name in names]
+    while time.monotonic() < deadline:
+        name = ctx.rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            endpoint, response = await OPERATIONS[name](client, ctx)
+            sample = Sample(endpoint, response.status_code, time.perf_counter() - started)
+            if response.status_code not in EXPECTED_STATUSES[endpoint]:
+                sample.error = f"HTTP {response.status_code}"
+        except (httpx.HTTPError, ValueError) as e:
+            sample = Sample(ENDPOINTS[name], 0, time.perf_counter() - started, type(e).__name__)
+        if ctx.recording:
+            ctx.samples.append(sample)
+        low, high = scenario.think_ms
+        if high:
+            await asyncio.sleep(ctx.rng.uniform(low, high) / 1000)
+
+
+async def drive(app_url: str, ctx: LoadContext, scenario: Scenario, users: int, warmup: float, duration: float, timeout: float) -> float:
+    """Run the Virtual Users -> Returns the Measured Wall-Clock Seconds (Warm-Up Excluded)"""
+    limits = httpx.Limits(max_connections = users, max_keepalive_connections = users)
+    async with httpx.AsyncClient(base_url = app_url, limits = limits, timeout = timeout) as client:
+        deadline = time.monotonic() + warmup + duration
+        measured_from = []
+
+        async def start_recording():
+            await asyncio.sleep(warmup)
+            ctx.recording = True
+            measured_from.append(time.monotonic())
+
+        recorder = asyncio.create_task(start_recording())
+        await asyncio.gather(*(virtual_user(client, ctx, scenario, deadline) for _ in range(users)))
+        await recorder
+        return time.monotonic() - measured_from[0]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-Rank -> Always a Latency That Was Actually Observed
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: List[Sample], seconds: float) -> Dict:
+    def stats(group: List[Sample]) -> Dict:
+        latencies = sorted(sample.seconds * 1000 for sample in group)
+        errors = sum(1 for sample in group if sample.error)
+        statuses: Dict[str, int] = {}
+        for sample in group:
+            statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+        return {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "throughput_rps": round(len(group) / seconds, 1) if seconds else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "status_codes": statuses,
+        }
+
+    endpoints: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        endpoints.setdefault(sample.endpoint, []).append(sample)
+    return {"total": stats(samples), "endpoints": {name: stats(group) for name, group in sorted(endpoints.items())}}
+
+
+# Percentile -> Fraction, and the Fewest Samples That Make It Worth Comparing (About 10 Beyond the Cut)
+PERCENTILES = {"p50_ms": 0.50, "p95_ms": 0.95, "p99_ms": 0.99}
+
+
+def compare(report: Dict, baseline: Dict, latency_tolerance: float, throughput_tolerance: float, error_tolerance: float) -> List[str]:
+    """
+    Regressions Against the Baseline -> Empty When Everything is Within Tolerance
+        - A Percentile is Only Compared When Both Runs Have Enough Requests for It to be Stable
+        - Throughput is Compared on the Total Only, per-Endpoint Shares are Fixed by the Mix
+    """
+    regressions = []
+    current_sections = {"total": report["total"], **report["endpoints"]}
+    baseline_sections = {"total": baseline["total"], **baseline["endpoints"]}
+    for name, previous in baseline_sections.items():
+        current = current_sections.get(name)
+        if current is None:
+            regressions.append(f"{name}: No Requests Recorded (Baseline Had {previous['requests']})")
+            continue
+        for metric, fraction in PERCENTILES.items():
+            if min(current["requests"], previous["requests"]) < 10 / (1 - fraction):
+                continue
+            limit = previous[metric] * (1 + latency_tolerance)
+            if current[metric] > limit:
+                regressions.append(f"{name}: {metric} {current[metric]:.2f} > {limit:.2f} (Baseline {previous[metric]:.2f})")
+        limit = previous["error_rate"] + error_tolerance
+        if current["error_rate"] > limit:
+            regressions.append(f"{name}: error_rate {current['error_rate']:.4f} > {limit:.4f} (Baseline {previous['error_rate']:.4f})")
+
+    limit = baseline["total"]["throughput_rps"] * (1 - throughput_tolerance)
+    if report["total"]["throughput_rps"] < limit:
+        regressions.append(
+            f"total: throughput {report['total']['throughput_rps']:.1f} rps < {limit:.1f} (Baseline {baseline['total']['throughput_rps']:.1f})"
+        )
+    return regressions
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, name: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} Exited With Code {process.returncode}")
+        try:
+            if httpx.get(url, timeout = 1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{name} Not Ready After {timeout:.0f}s ({url})")
+
+
+def stop(process: Optional[subprocess.Popen]):
+    if process is not None and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices = sorted(SCENARIOS), default = "browse")
+    parser.add_argument("--duration", type = float, default = 20.0, help = "Measured Seconds")
+    parser.add_argument("--warmup", type = float, default = 3.0, help = "Seconds of Load Before Measuring Starts")
+    parser.add_argument("--users", type = int, default = None, help = "Concurrent Virtual Users (Default: Per Scenario)")
+    parser.add_argument("--timeout", type = float, default = 10.0, help = "Per-Request Timeout in Seconds")
+    parser.add_argument("--workers", type = int, default = 1, help = "uvicorn Worker Processes for the App")
+    parser.add_argument("--latency-ms", type = float, default = 2.0, help = "Injected Base Latency per Backend Call")
+    parser.add_argument("--jitter-ms", type = float, default = 3.0, help = "Injected Jitter per Backend Call")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "Injected Backend Failure Rate")
+    parser.add_argument("--buyers", type = int, default = 500)
+    parser.add_argument("--bookings", type = int, default = 20000)
+    parser.add_argument("--seed", type = int, default = 42)
+    parser.add_argument("--app-env", action = "append", default = [], metavar = "KEY=VALUE", help = "Extra Settings for the App")
+    parser.add_argument("--output", help = "Write the JSON Report Here (Default: Stdout)")
+    parser.add_argument("--baseline", help = "Baseline JSON (Default: benchmarks/baselines/load_<scenario>.json)")
+    parser.add_argument("--save-baseline", action = "store_true", help = "Store This Run as the Baseline Instead of Comparing")
+    parser.add_argument("--latency-tolerance", type = float, default = 0.25, help = "Allowed Relative p50/p95/p99 Increase")
+    parser.add_argument("--throughput-tolerance", type = float, default = 0.20, help = "Allowed Relative Throughput Drop")
+    parser.add_argument("--error-tolerance", type = float, default = 0.01, help = "Allowed Absolute Error-Rate Increase")
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    users = args.users or scenario.users
+    root = Path(__file__).resolve().parent.parent
+
+    # The Fakes Seed Deterministically -> Seeding a Local Copy Gives the Same IDs Without Asking Them
+    summary = seed(FakeState(), buyers = args.buyers, bookings = args.bookings, seed_value = args.seed)
+    ctx = LoadContext(summary, random.Random(args.seed), summary.flash_event_ids[:scenario.hot_events])
+
+    fakes_port, app_port = _free_port("127.0.0.1"), _free_port("127.0.0.1")
+    env = dict(os.environ, PYTHONPATH = str(root), LOG_LEVEL = "WARNING", WARMUP_ENABLED = "true")
+    env.update(FakeBackends(port = fakes_port).env())
+    env.update(item.split("=", 1) for item in args.app_env)
+
+    fakes = app = None
+    try:
+        fakes = subprocess.Popen([
+            sys.executable, "-m", "benchmarks.fakes", "--port", str(fakes_port),
+            "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms), "--error-rate", str(args.error_rate),
+            "--buyers", str(args.buyers), "--bookings", str(args.bookings), "--seed", str(args.seed),
+        ], cwd = root, env = env, stdout = subprocess.DEVNULL)
+        wait_until_ready(f"http://127.0.0.1:{fakes_port}/__fakes__/stats", fakes, "Fake Backends")
+        app = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+            "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+        ], cwd = root, env = env, stdout = subprocess.DEVNULL)
+        app_url = f"http://127.0.0.1:{app_port}"
+        wait_until_ready(f"{app_url}/ready", app, "App")
+
+        print(f"Running {scenario.name}: {users} Users, {args.warmup:.0f}s Warm-Up + {args.duration:.0f}s Measured...", file = sys.stderr)
+        seconds = asyncio.run(drive(app_url, ctx, scenario, users, args.warmup, args.duration, args.timeout))
+        fake_calls = httpx.get(f"http://127.0.0.1:{fakes_port}/__fakes__/stats").json()["calls"]
+    finally:
+        stop(app)
+        stop(fakes)
+
+    report = {
+        "scenario": scenario.name,
+        "config": {
+            "users": users, "duration_s": args.duration, "warmup_s": args.warmup, "workers": args.workers,
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+            "buyers": args.buyers, "bookings": args.bookings, "seed": args.seed, "app_env": args.app_env,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        **summarize(ctx.samples, seconds),
+        "backend_calls": fake_calls,
+    }
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"load_{scenario.name}.json"
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents = True, exist_ok = True)
+        baseline_path.write_text(json.dumps(report, indent = 2) + "\n")
+        print(f"Baseline Saved to {baseline_path}", file = sys.stderr)
+    elif baseline_path.exists():
+        report["regressions"] = compare(
+            report, json.loads(baseline_path.read_text()),
+            args.latency_tolerance, args.throughput_tolerance, args.error_tolerance
+        )
+    else:
+        print(f"No Baseline at {baseline_path} -> Run With --save-baseline to Create One", file = sys.stderr)
+
+    text = json.dumps(report, indent = 2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    total = report["total"]
+    print(
+        f"{scenario.name}: {total['requests']} Requests, {total['throughput_rps']} rps, "
+        f"p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms, Errors {total['error_rate']:.2%}",
+        file = sys.stderr
+    )
+    if report.get("regressions"):
+        print("\nREGRESSIONS AGAINST BASELINE:", file = sys.stderr)
+        for line in report["regressions"]:
+            print(f"  - {line}", file = sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Micro-Benchmarks for the CPU-Bound Python Paths
+
+Times the Service Code That Runs Between the Database Call and the Response, Isolated From I/O by
+Injecting a Canned Query Client Into the Services. Each Case Runs Over Synthetic Datasets From 1k to
+1M Bookings and Reports min / median / mean / stddev Over Calibrated Rounds (pytest-benchmark Style)
+Plus the Peak Memory Allocated by One Call (tracemalloc).
+
+Cases:
+    dashboard.bucket_bookings[granularity]   Timestamp Prefix Bucketing of the Sales Chart
+    dashboard.aggregate                      DashboardService.get_organizer_dashboard End to End
+    events.booking_count_merge               The Counter Merge in EventService.list_events
+    categories.reorder                       CategoryService.get_all_categories ("Other" Moved Last)
+    pydantic.booking_history                 List[BookingDetailResponse] Validation + JSON Encoding
+    pydantic.dashboard_response              DashboardResponse Validation + JSON Encoding
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --sizes 1000,10000 -k dashboard
+    python -m benchmarks.micro --save                      # Store as benchmarks/baselines/micro.json
+    python -m benchmarks.micro --compare --fail-threshold 15
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from pydantic import TypeAdapter
+from benchmarks.dashboard_bucketing import make_bookings
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro.json"
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+
+class CannedResult:
+    __slots__ = ("data", "count")
+
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int]):
+        self.data = data
+        self.count = count
+
+
+class CannedQuery:
+    # Accepts Any Builder Chain (select / eq / in_ / order / range ...) -> execute() Returns the Canned Rows
+    def __init__(self, client: "CannedClient", table: str):
+        self.client = client
+        self.table = table
+        self.columns: Optional[str] = None
+
+    def select(self, *columns: str, **kwargs) -> "CannedQuery":
+        self.columns = ",".join(columns)
+        return self
+
+    def __getattr__(self, name: str) -> Callable[..., "CannedQuery"]:
+        return lambda *args, **kwargs: self
+
+    def execute(self) -> CannedResult:
+        rows, fresh = self.client.responses.get((self.table, self.columns)) or self.client.responses[(self.table, None)]
+        # Services That Annotate Rows in Place Get Copies -> Every Round Sees the Same Input
+        data = [dict(row) for row in rows] if fresh else rows
+        return CannedResult(data, len(rows))
+
+
+class CannedClient:
+    """Stands in for the Supabase Client -> Responses Keyed by (Table, Select String), None Matches Any Select"""
+    def __init__(self):
+        self.responses: Dict[Tuple[str, Optional[str]], Tuple[List[Dict[str, Any]], bool]] = {}
+
+    def respond(self, table: str, rows: List[Dict[str, Any]], select: Optional[str] = None, fresh: bool = False) -> "CannedClient":
+        self.responses[(table, select)] = (rows, fresh)
+        return self
+
+    def table(self, name: str) -> CannedQuery:
+        return CannedQuery(self, name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> CannedQuery:
+        # Database Functions are Canned Like Tables, Under the Function Name
+        return CannedQuery(self, name)
+
+
+@dataclass
+class Dataset:
+    """Synthetic Rows for One Size -> Built Lazily, Outside the Timed Region"""
+    size: int
+    seed: int = 42
+
+    @cached_property
+    def rng(self) -> random.Random:
+        return random.Random(self.seed)
+
+    @cached_property
+    def bookings(self) -> List[Dict[str, Any]]:
+        # Same Shape as the Dashboard's Paid-Bookings Query (50 Events, 365 Days, Mixed Currencies)
+        return make_bookings(self.size, seed = self.seed)
+
+    @cached_property
+    def booking_totals(self) -> List[Dict[str, Any]]:
+        # What organizer_booking_totals Returns for the Same Bookings -> One Row per (Event, Currency)
+        totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for b in self.bookings:
+            row = totals.setdefault((b["event_id"], b["currency"]), {
+                "event_id": b["event_id"], "currency": b["currency"], "amount_total": 0, "tickets": 0
+            })
+            row["amount_total"] += b["amount_total"]
+            row["tickets"] += 1
+        return list(totals.values())
+
+    @cached_property
+    def organizer_events(self) -> List[Dict[str, Any]]:
+        event_ids = sorted({b["event_id"] for b in self.bookings})
+        return [{"id": eid, "title": f"Event {eid}", "max_slots": self.rng.choice([100, 500, 1000, 100000])} for eid in event_ids]
+
+    @cached_property
+    def event_page(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        return [{
+            "id": str(UUID(int = self.rng.getrandbits(128), version = 4)),
+            "title": f"Event {i}",
+            "image_url": f"https://example.supabase.co/storage/v1/object/public/event-images/banners/{i:064x}/original.png",
+            "created_at": (now - timedelta(days = i)).isoformat(),
+        } for i in range(24)]
+
+    @cached_property
+    def page_bookings(self) -> List[Dict[str, str]]:
+        # The select("event_id") Rows for One Listing Page
+        page_ids = [event["id"] for event in self.event_page]
+        return [{"event_id": self.rng.choice(page_ids)} for _ in range(self.size)]
+
+    @cached_property
+    def categories(self) -> List[Dict[str, Any]]:
+        # One Category per 100 Bookings -> 10 to 10k Rows, a Few Spellings of "Other" Mixed In
+        count = max(10, self.size // 100)
+        names = [f"Category {i:06d}" for i in range(count)]
+        for i in range(0, count, 50):
+            names[i] = self.rng.choice(["Other", " other ", "OTHER"])
+        return [{"id": str(UUID(int = i + 1, version = 4)), "name": name} for i, name in enumerate(names)]
+
+    @cached_property
+    def booking_history(self) -> List[Dict[str, Any]]:
+        # Rows Shaped Like the /bookings/my-history Query -> Booking + Embedded Event
+        event = {"title": "Event", "location": "Kuala Lumpur", "event_date": datetime.now(timezone.utc).isoformat(), "image_url": None}
+        return [{
+            "id": str(UUID(int = i + 1, version = 4)),
+            "event_id": str(UUID(int = i % 50 + 1, version = 4)),
+            "user_id": str(UUID(int = 7, version = 4)),
+            "amount_total": b["amount_total"],
+            "currency": b["currency"],
+            "payment_status": "paid",
+            "payment_method": "card",
+            "created_at": b["created_at"],
+            "stripe_session_id": f"cs_test_{i:024x}",
+            "event": event,
+        } for i, b in enumerate(self.bookings)]
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    size: int
+    rounds: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    stddev_ms: float
+    peak_kib: float
+
+
+@dataclass
+class Benchmark:
+    """
+    pytest-benchmark Style Runner -> benchmark(fn, *args) Times fn and Returns Its Result
+        - One Warm-Up Call Calibrates the Rounds to Fill min_time (Within min_rounds..max_rounds)
+        - A Separate Call Under tracemalloc Measures the Peak Allocation, So Tracing Never Skews the Timings
+    """
+    min_time: float = 1.0
+    min_rounds: int = 3
+    max_rounds: int = 200
+    memory: bool = True
+    results: List[Result] = field(default_factory = list)
+    _current: Tuple[str, str, int] = ("", "", 0)
+
+    def __call__(self, fn: Callable, *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        first = time.perf_counter() - started
+        rounds = max(self.min_rounds, min(self.max_rounds, int(self.min_time / max(first, 1e-9))))
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn(*args, **kwargs)
+            timings.append(time.perf_counter() - started)
+
+        peak = 0
+        if self.memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            fn(*args, **kwargs)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        name, group, size = self._current
+        self.results.append(Result(
+            name, group, size, rounds,
+            min_ms = round(min(timings) * 1000, 4),
+            median_ms = round(statistics.median(timings) * 1000, 4),
+            mean_ms = round(statistics.fmean(timings) * 1000, 4),
+            stddev_ms = round(statistics.stdev(timings) * 1000, 4) if len(timings) > 1 else 0.0,
+            peak_kib = round(peak / 1024, 1),
+        ))
+        return result
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    run: Callable[[Benchmark, Dataset], None]
+    max_size: Optional[int] = None
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, group: str, max_size: Optional[int] = None):
+    def register(fn: Callable[[Benchmark, Dataset], None]):
+        CASES.append(Case(name, group, fn, max_size))
+        return fn
+    return register
+
+
+def _bucket_case(granularity: str):
+    def run(benchmark: Benchmark, data: Dataset):
+        from app.utils.time_buckets import bucket_bookings
+        benchmark(bucket_bookings, data.bookings, granularity)
+    case(f"dashboard.bucket_bookings[{granularity}]", "dashboard")(run)
+
+
+for _granularity in ("hour", "day", "week", "month"):
+    _bucket_case(_granularity)
+
+
+def dashboard_service(data: Dataset):
+    from app.services.dashboard_service import DashboardService
+    recent = [dict(b, id = str(UUID(int = i + 1, version = 4)), profile = {"full_name": "Buyer", "email": "buyer@example.com"})
+              for i, b in enumerate(data.bookings[:10])]
+    client = (
+        CannedClient()
+        .respond("event", data.organizer_events)
+        .respond("organizer_booking_totals", data.booking_totals)
+        .respond("bookings", data.bookings)
+        .respond("bookings", recent, select = "id, event_id, amount_total, currency, created_at, profile(full_name, email)")
+    )
+    return DashboardService(client, client)
+
+
+@case("dashboard.aggregate", "dashboard")
+def bench_dashboard_aggregate(benchmark: Benchmark, data: Dataset):
+    service = dashboard_service(data)
+    benchmark(service.get_organizer_dashboard, "organizer", None, None, "day")
+
+
+@case("events.booking_count_merge", "events")
+def bench_booking_count_merge(benchmark: Benchmark, data: Dataset):
+    from app.services.event_service import EventService
+    client = CannedClient().respond("event", data.event_page, fresh = True).respond("bookings", data.page_bookings)
+    service = EventService(client, client, storage = object())
+    benchmark(service.list_events, 1, len(data.event_page))
+
+
+@case("categories.reorder", "categories")
+def bench_category_reorder(benchmark: Benchmark, data: Dataset):
+    from app.services.event_category_service import CategoryService
+    service = CategoryService(CannedClient().respond("event_categories", data.categories))
+
+    def uncached():
+        service._cache = None
+        return service.get_all_categories()
+    benchmark(uncached)
+
+
+@case("pydantic.booking_history", "pydantic", max_size = 100_000)
+def bench_booking_history(benchmark: Benchmark, data: Dataset):
+    from app.schemas.booking import BookingDetailResponse
+    adapter = TypeAdapter(List[BookingDetailResponse])
+    benchmark(lambda rows: adapter.dump_json(adapter.validate_python(rows)), data.booking_history)
+
+
+@case("pydantic.dashboard_response", "pydantic")
+def bench_dashboard_response(benchmark: Benchmark, data: Dataset):
+    from app.schemas.dashboard import DashboardResponse
+    adapter = TypeAdapter(DashboardResponse)
+    payload = dashboard_service(data).get_organizer_dashboard("organizer", None, None, "hour")
+    benchmark(lambda content: adapter.dump_json(adapter.validate_python(content)), payload)
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], time_threshold: float, memory_threshold: float) -> List[str]:
+    """Cases Slower (Median) or Hungrier (Peak) Than the Baseline by More Than the Threshold Percentages"""
+    previous = {(row["name"], row["size"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get((row["name"], row["size"]))
+        if before is None:
+            continue
+        if row["median_ms"] > before["median_ms"] * (1 + time_threshold / 100):
+            regressions.append(f"{row['name']} @ {row['size']:,}: median {row['median_ms']:.3f} ms vs {before['median_ms']:.3f} ms")
+        if before["peak_kib"] and row["peak_kib"] > before["peak_kib"] * (1 + memory_threshold / 100):
+            regressions.append(f"{row['name']} @ {row['size']:,}: peak {row['peak_kib']:.0f} KiB vs {before['peak_kib']:.0f} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default = DEFAULT_SIZES, help = "Comma-Separated Booking Counts")
+    parser.add_argument("-k", dest = "keyword", default = "", help = "Only Run Cases Whose Name Contains This")
+    parser.add_argument("--min-time", type = float, default = 1.0, help = "Seconds of Timed Rounds per Case")
+    parser.add_argument("--min-rounds", type = int, default = 3)
+    parser.add_argument("--max-rounds", type = int, default = 200)
+    parser.add_argument("--no-memory", action = "store_true", help = "Skip the tracemalloc Peak Measurement")
+    parser.add_argument("--json", help = "Write the Results Here")
+    parser.add_argument("--save", action = "store_true", help = f"Store the Results as the Baseline ({BASELINE_PATH.name})")
+    parser.add_argument("--compare", nargs = "?", const = str(BASELINE_PATH), help = "Compare With a Baseline File")
+    parser.add_argument("--fail-threshold", type = float, default = 10.0, help = "Allowed Median Slowdown in Percent")
+    parser.add_argument("--memory-threshold", type = float, default = 10.0, help = "Allowed Peak Memory Growth in Percent")
+    args = parser.parse_args()
+
+    benchmark = Benchmark(args.min_time, args.min_rounds, args.max_rounds, not args.no_memory)
+    cases = [c for c in CASES if args.keyword in c.name]
+    print(f"{'case':<38} {'bookings':>10} {'rounds':>7} {'min ms':>11} {'median ms':>11} {'stddev':>9} {'peak KiB':>11}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        data = Dataset(size)
+        for item in cases:
+            if item.max_size is not None and size > item.max_size:
+                continue
+            benchmark._current = (item.name, item.group, size)
+            item.run(benchmark, data)
+            r = benchmark.results[-1]
+            print(f"{r.name:<38} {r.size:>10,} {r.rounds:>7} {r.min_ms:>11.3f} {r.median_ms:>11.3f} {r.stddev_ms:>9.3f} {r.peak_kib:>11.1f}")
+
+    results = [vars(r) for r in benchmark.results]
+    report = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent = 2) + "\n")
+    if args.save:
+        BASELINE_PATH.parent.mkdir(parents = True, exist_ok = True)
+        BASELINE_PATH.write_text(json.dumps(report, indent = 2) + "\n")
+        print(f"Baseline Saved to {BASELINE_PATH}")
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text())["results"], args.fail_threshold, args.memory_threshold)
+        if regressions:
+            print("\nREGRESSIONS AGAINST BASELINE:", file = sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file = sys.stderr)
+            sys.exit(1)
+        print("No Regressions Against the Baseline")
+
+
+if __name__ == "__main__":
+    main()
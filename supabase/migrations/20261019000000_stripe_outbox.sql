@@ -0,0 +1,86 @@
+-- Stripe Outbox
+-- Every Write to the Event Table That Changes What Stripe Should Contain Records a Row Here
+-- in the Same Transaction. The API Background Worker (StripeSyncService) Reconciles Them.
+
+create table if not exists public.stripe_outbox (
+    id bigint generated always as identity primary key,
+    event_id uuid not null,
+    operation text not null check (operation in ('sync', 'archive')),
+    payload jsonb not null default '{}'::jsonb,
+    status text not null default 'pending' check (status in ('pending', 'done', 'dead')),
+    attempts integer not null default 0,
+    next_attempt_at timestamptz not null default now(),
+    last_error text,
+    created_at timestamptz not null default now(),
+    processed_at timestamptz
+);
+
+create index if not exists stripe_outbox_pending_idx
+    on public.stripe_outbox (next_attempt_at)
+    where status = 'pending';
+
+create index if not exists stripe_outbox_event_pending_idx
+    on public.stripe_outbox (event_id)
+    where status = 'pending';
+
+-- Only the Service Role (Used by the Worker and the Checkout Readiness Check) Reads the Outbox
+alter table public.stripe_outbox enable row level security;
+
+create or replace function public.enqueue_stripe_outbox()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'DELETE' then
+        if coalesce(old.stripe_product_id, '') <> '' or coalesce(old.stripe_price_id, '') <> '' then
+            insert into public.stripe_outbox (event_id, operation, payload)
+            values (
+                old.id,
+                'archive',
+                jsonb_build_object(
+                    'stripe_product_id', old.stripe_product_id,
+                    'stripe_price_id', old.stripe_price_id
+                )
+            );
+        end if;
+        return old;
+    end if;
+
+    -- Free Events That Stay Free Have Nothing to Sync
+    if tg_op = 'INSERT' and not new.is_paid then
+        return new;
+    end if;
+    if tg_op = 'UPDATE' and not old.is_paid and not new.is_paid then
+        return new;
+    end if;
+
+    insert into public.stripe_outbox (event_id, operation) values (new.id, 'sync');
+    return new;
+end;
+$$;
+
+drop trigger if exists event_stripe_outbox_insert on public.event;
+create trigger event_stripe_outbox_insert
+    after insert on public.event
+    for each row execute function public.enqueue_stripe_outbox();
+
+-- The Worker Only Writes the stripe_* Columns, So Its Own Updates Never Re-Enqueue
+drop trigger if exists event_stripe_outbox_update on public.event;
+create trigger event_stripe_outbox_update
+    after update of title, description, is_paid, ticket_price, currency on public.event
+    for each row
+    when (
+        old.title is distinct from new.title
+        or old.description is distinct from new.description
+        or old.is_paid is distinct from new.is_paid
+        or old.ticket_price is distinct from new.ticket_price
+        or old.currency is distinct from new.currency
+    )
+    execute function public.enqueue_stripe_outbox();
+
+drop trigger if exists event_stripe_outbox_delete on public.event;
+create trigger event_stripe_outbox_delete
+    after delete on public.event
+    for each row execute function public.enqueue_stripe_outbox();
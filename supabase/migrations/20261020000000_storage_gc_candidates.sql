@@ -0,0 +1,92 @@
+-- Storage Garbage Collection Candidates
+-- Storage Objects That May No Longer Be Referenced. Triggers Record the Old Image When an Event or
+-- Profile Stops Pointing at It, and the API Records Rollbacks and Rejected Uploads. The Background
+-- Worker (StorageGcService) Re-Checks References and Deletes the Unreferenced Objects in Batches.
+
+create table if not exists public.storage_gc_candidates (
+    id bigint generated always as identity primary key,
+    bucket text not null,
+    path text not null,
+    created_at timestamptz not null default now(),
+    unique (bucket, path)
+);
+
+create index if not exists storage_gc_candidates_created_idx
+    on public.storage_gc_candidates (created_at);
+
+-- Only the Service Role (Used by the API and the Worker) Reads or Writes the Candidates
+alter table public.storage_gc_candidates enable row level security;
+
+-- Public URL -> (Bucket, Path) -> https://.../storage/v1/object/public/{bucket}/{path}[?...]
+create or replace function public.record_storage_gc_candidate(url text)
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    object_ref text[];
+begin
+    object_ref := regexp_match(split_part(coalesce(url, ''), '?', 1), '/storage/v1/object/public/([^/]+)/(.+)$');
+    if object_ref is null then
+        return;
+    end if;
+    insert into public.storage_gc_candidates (bucket, path)
+    values (object_ref[1], object_ref[2])
+    on conflict (bucket, path) do nothing;
+end;
+$$;
+
+create or replace function public.enqueue_event_image_gc()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.record_storage_gc_candidate(old.image_url);
+    if tg_op = 'DELETE' then
+        return old;
+    end if;
+    return new;
+end;
+$$;
+
+create or replace function public.enqueue_profile_avatar_gc()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.record_storage_gc_candidate(old.avatar_url);
+    if tg_op = 'DELETE' then
+        return old;
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists event_image_gc_update on public.event;
+create trigger event_image_gc_update
+    after update of image_url on public.event
+    for each row
+    when (old.image_url is distinct from new.image_url)
+    execute function public.enqueue_event_image_gc();
+
+drop trigger if exists event_image_gc_delete on public.event;
+create trigger event_image_gc_delete
+    after delete on public.event
+    for each row execute function public.enqueue_event_image_gc();
+
+drop trigger if exists profile_avatar_gc_update on public.profile;
+create trigger profile_avatar_gc_update
+    after update of avatar_url on public.profile
+    for each row
+    when (old.avatar_url is distinct from new.avatar_url)
+    execute function public.enqueue_profile_avatar_gc();
+
+drop trigger if exists profile_avatar_gc_delete on public.profile;
+create trigger profile_avatar_gc_delete
+    after delete on public.profile
+    for each row execute function public.enqueue_profile_avatar_gc();
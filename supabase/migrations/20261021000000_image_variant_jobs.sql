@@ -0,0 +1,24 @@
+-- Image Variant Jobs
+-- Completing a Direct (Signed URL) Upload Only Checks the Object's Metadata and Magic Bytes, Then Records
+-- a Row Here. The API Background Worker (ImageVariantService) Downloads the Original and Uploads Its Variants.
+
+create table if not exists public.image_variant_jobs (
+    id bigint generated always as identity primary key,
+    bucket text not null,
+    path text not null,
+    variants jsonb not null,
+    status text not null default 'pending' check (status in ('pending', 'done', 'dead')),
+    attempts integer not null default 0,
+    next_attempt_at timestamptz not null default now(),
+    last_error text,
+    created_at timestamptz not null default now(),
+    processed_at timestamptz,
+    unique (bucket, path)
+);
+
+create index if not exists image_variant_jobs_pending_idx
+    on public.image_variant_jobs (next_attempt_at)
+    where status = 'pending';
+
+-- Only the Service Role (Used by the API and the Worker) Reads or Writes the Jobs
+alter table public.image_variant_jobs enable row level security;
@@ -0,0 +1,22 @@
+-- Organizer Booking Totals
+-- Paid Booking Totals per (Event, Currency) for the Organizer Dashboard, Summed in the Database So the
+-- API Receives One Row per Pair Instead of Every Booking Ever Sold. Runs as the Caller -> Row Level
+-- Security on bookings Applies Exactly as It Does to the Plain Select It Replaces.
+
+create or replace function public.organizer_booking_totals(event_ids uuid[])
+returns table (event_id uuid, currency text, amount_total bigint, tickets bigint)
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+    select b.event_id, b.currency, sum(b.amount_total)::bigint, count(*)::bigint
+    from public.bookings b
+    where b.event_id = any(organizer_booking_totals.event_ids)
+      and b.payment_status = 'paid'
+    group by b.event_id, b.currency;
+$$;
+
+create index if not exists bookings_event_paid_created_idx
+    on public.bookings (event_id, created_at)
+    where payment_status = 'paid';
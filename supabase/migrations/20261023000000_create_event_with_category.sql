@@ -0,0 +1,30 @@
+-- Create Event With Category
+-- Inserts the Event Row and Its Category Mapping in One Transaction, So a Failed Mapping Never Leaves an
+-- Unmapped Event Behind (and the Stripe Outbox Trigger on the Event Insert Rolls Back With It). Runs as the
+-- Caller -> Row Level Security on event and event_category_map Applies as It Does to the Two Plain Inserts.
+
+create or replace function public.create_event_with_category(payload jsonb, category_id uuid default null)
+returns setof public.event
+language sql
+volatile
+security invoker
+set search_path = public
+as $$
+    with created as (
+        insert into public.event (
+            id, title, description, location, event_date, event_end_date, max_slots,
+            is_paid, ticket_price, currency, event_status, created_by, image_url
+        )
+        select
+            e.id, e.title, e.description, e.location, e.event_date, e.event_end_date, e.max_slots,
+            e.is_paid, e.ticket_price, e.currency, e.event_status, e.created_by, e.image_url
+        from jsonb_populate_record(null::public.event, payload) e
+        returning *
+    ), mapped as (
+        insert into public.event_category_map (event_id, category_id)
+        select created.id, create_event_with_category.category_id
+        from created
+        where create_event_with_category.category_id is not null
+    )
+    select * from created;
+$$;
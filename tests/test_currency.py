@@ -0,0 +1,31 @@
+import pytest
+from app.services.dashboard_service import DashboardService
+from app.utils.currency import FxRateNotFound, to_major_units, to_minor_units
+
+
+@pytest.mark.parametrize("amount, currency, expected", [
+    (19.99, "myr", 1999),
+    (1500, "JPY", 1500),
+    (5.126, "KWD", 5130),
+    (12.344, "bhd", 12340),
+    (0.001, "OMR", 0),
+])
+def test_to_minor_units(amount, currency, expected):
+    assert to_minor_units(amount, currency) == expected
+
+
+def test_three_decimal_amounts_end_in_zero():
+    # Stripe Rejects Three-Decimal unit_amount Values Whose Last Digit isn't 0
+    for cents in range(0, 100000, 7):
+        assert to_minor_units(cents / 1000, "KWD") % 10 == 0
+
+
+def test_to_major_units_round_trip():
+    assert to_major_units(to_minor_units(12.34, "MYR"), "MYR") == 12.34
+
+
+def test_missing_fx_rate_leaves_amount_unconverted():
+    service = DashboardService(supabase = object(), supabase_admin = object())
+    assert service._to_reporting(1000, "XYZ", "MYR") is None
+    with pytest.raises(FxRateNotFound):
+        service._to_reporting(1000, "MYR", "XYZ")
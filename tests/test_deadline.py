@@ -0,0 +1,231 @@
+import asyncio
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from app.core.deadline import Deadline, DeadlineExceeded, DeadlineTransport, current_deadline, load_budgets, stripe_session
+from app.middleware.deadline import DeadlineMiddleware
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.timeouts = None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.timeouts = request.extensions.get("timeout")
+        if self.error is not None:
+            raise self.error
+        return httpx.Response(200)
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.timeout = None
+
+    def send(self, request, timeout = None, **kwargs):
+        self.timeout = timeout
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def deadline():
+    # Set for One Test Only -> Other Tests See No Deadline
+    def start(budget: float) -> Deadline:
+        value = Deadline("GET /test", budget)
+        tokens.append(current_deadline.set(value))
+        return value
+    tokens = []
+    yield start
+    for token in reversed(tokens):
+        current_deadline.reset(token)
+
+
+def send(transport: httpx.BaseTransport, timeout: httpx.Timeout = httpx.Timeout(30.0, connect = 5.0)) -> httpx.Response:
+    with httpx.Client(transport = transport, timeout = timeout) as client:
+        return client.get("http://upstream.test/rest/v1/event")
+
+
+def test_load_budgets_adds_prefix_and_overrides():
+    budgets = load_budgets("/api/v1", {"GET /events/": 3, "POST /bookings/checkout": 5})
+    assert budgets["GET /api/v1/events/"] == 3.0
+    assert budgets["POST /api/v1/bookings/checkout"] == 5.0
+    assert budgets["POST /api/v1/bookings/webhook"] == 20.0
+
+
+def test_transport_without_deadline_keeps_client_timeouts():
+    inner = RecordingTransport()
+    send(DeadlineTransport(inner))
+    assert inner.timeouts == {"connect": 5.0, "read": 30.0, "write": 30.0, "pool": 30.0}
+
+
+def test_transport_caps_timeouts_at_remaining_budget(deadline):
+    deadline(2.0)
+    inner = RecordingTransport()
+    send(DeadlineTransport(inner))
+    assert set(inner.timeouts) == {"connect", "read", "write", "pool"}
+    assert all(1.0 < value <= 2.0 for value in inner.timeouts.values())
+
+
+def test_transport_keeps_shorter_client_timeouts(deadline):
+    deadline(10.0)
+    inner = RecordingTransport()
+    send(DeadlineTransport(inner), httpx.Timeout(30.0, connect = 1.0))
+    assert inner.timeouts["connect"] == 1.0
+    assert inner.timeouts["read"] <= 10.0
+
+
+def test_transport_fills_unset_timeouts(deadline):
+    deadline(3.0)
+    inner = RecordingTransport()
+    send(DeadlineTransport(inner), httpx.Timeout(None))
+    assert all(value is not None and value <= 3.0 for value in inner.timeouts.values())
+
+
+def test_transport_refuses_calls_once_spent(deadline):
+    spent = deadline(0.0)
+    inner = RecordingTransport()
+    with pytest.raises(DeadlineExceeded) as exc:
+        send(DeadlineTransport(inner))
+    assert not exc.value.during_call
+    assert inner.timeouts is None # -> Never Sent
+    assert spent.exceeded
+
+
+def test_transport_converts_timeout_past_the_deadline(deadline):
+    spent = deadline(5.0)
+
+    class SlowTransport(httpx.BaseTransport):
+        def handle_request(self, request):
+            spent.expires = 0.0 # -> The Budget Runs Out While the Call is in Flight
+            raise httpx.ReadTimeout("timed out")
+
+    with pytest.raises(DeadlineExceeded) as exc:
+        send(DeadlineTransport(SlowTransport()))
+    assert exc.value.during_call
+    assert spent.exceeded
+
+
+def test_transport_keeps_timeouts_inside_the_budget(deadline):
+    deadline(30.0)
+    transport = DeadlineTransport(RecordingTransport(httpx.ReadTimeout("timed out")))
+    with pytest.raises(httpx.ReadTimeout):
+        send(transport)
+
+
+# BUDGET Stands for the Remaining Budget (Just Under 5s When the Call is Made)
+BUDGET = object()
+
+
+@pytest.mark.parametrize("timeout, expected", [
+    (None, BUDGET),
+    (60, BUDGET),
+    (0.5, 0.5),
+    ((0.5, 60), (0.5, BUDGET)),
+    ((None, 60), (BUDGET, BUDGET)),
+])
+def test_stripe_session_caps_timeouts(deadline, timeout, expected):
+    deadline(5.0)
+    session = stripe_session()
+    adapter = RecordingAdapter()
+    session.mount("https://", adapter)
+    session.request("GET", "https://api.stripe.test/v1/products", timeout = timeout)
+    recorded = adapter.timeout if isinstance(expected, tuple) else (adapter.timeout,)
+    for value, wanted in zip(recorded, expected if isinstance(expected, tuple) else (expected,)):
+        if wanted is BUDGET:
+            assert 4.0 < value <= 5.0
+        else:
+            assert value == wanted
+
+
+def test_stripe_session_refuses_calls_once_spent(deadline):
+    deadline(0.0)
+    session = stripe_session()
+    adapter = RecordingAdapter()
+    session.mount("https://", adapter)
+    with pytest.raises(DeadlineExceeded):
+        session.request("GET", "https://api.stripe.test/v1/products")
+    assert adapter.timeout is None
+
+
+async def run(app, route: str = "GET /api/v1/test"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/test", "headers": [], "route_template": route}
+    await DeadlineMiddleware(app)(scope, receive, send)
+    return messages
+
+
+def status_of(messages) -> int:
+    return next(message["status"] for message in messages if message["type"] == "http.response.start")
+
+
+def body_of(messages) -> bytes:
+    return b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+
+
+def respond(status: int, spend: bool = False, raise_error: bool = False):
+    async def app(scope, receive, send):
+        if spend:
+            current_deadline.get().expire("timeout")
+        if raise_error:
+            raise RuntimeError("upstream failed")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"original"})
+    return app
+
+
+def test_middleware_passes_responses_through():
+    messages = asyncio.run(run(respond(200)))
+    assert status_of(messages) == 200
+    assert body_of(messages) == b"original"
+
+
+def test_middleware_replaces_5xx_after_spent_budget():
+    messages = asyncio.run(run(respond(500, spend = True)))
+    assert status_of(messages) == 504
+    assert b"original" not in body_of(messages)
+    assert b"Deadline" in body_of(messages)
+
+
+def test_middleware_keeps_4xx_after_spent_budget():
+    messages = asyncio.run(run(respond(404, spend = True)))
+    assert status_of(messages) == 404
+
+
+def test_middleware_keeps_5xx_without_spent_budget():
+    assert status_of(asyncio.run(run(respond(502)))) == 502
+
+
+def test_middleware_turns_errors_after_spent_budget_into_504():
+    messages = asyncio.run(run(respond(500, spend = True, raise_error = True)))
+    assert status_of(messages) == 504
+
+
+def test_middleware_reraises_other_errors():
+    with pytest.raises(RuntimeError):
+        asyncio.run(run(respond(500, raise_error = True)))
+
+
+def test_middleware_sets_budget_by_route():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["budget"] = current_deadline.get().budget
+        await respond(200)(scope, receive, send)
+
+    asyncio.run(run(app, "POST /api/v1/bookings/checkout"))
+    assert seen["budget"] == 15.0
+    assert current_deadline.get() is None
@@ -0,0 +1,148 @@
+import httpx
+import orjson
+import pytest
+from fastapi import HTTPException
+from app.core import last_known_good as lkg
+from app.core.config import settings
+from app.core.deadline import current_deadline
+from app.core.last_known_good import LastKnownGoodStore, Staleness, current_staleness, last_known_good
+
+
+def test_store_evicts_least_recently_used_past_max_bytes():
+    store = LastKnownGoodStore(max_bytes = 10)
+    store.put("a", b"aaaa", 0.0)
+    store.put("b", b"bbbb", 0.0)
+    store.get("a") # -> a is Now the Most Recently Used
+    store.put("c", b"cccc", 0.0)
+    assert store.get("b") is None
+    assert store.get("a") == (0.0, b"aaaa")
+    assert store.bytes == 8
+    assert len(store) == 2
+
+
+def test_store_replacing_a_key_frees_its_old_bytes():
+    store = LastKnownGoodStore(max_bytes = 10)
+    store.put("a", b"aaaaaaaa", 0.0)
+    store.put("a", b"aa", 1.0)
+    assert store.bytes == 2
+    assert store.get("a") == (1.0, b"aa")
+
+
+def test_store_skips_entries_larger_than_the_bound():
+    store = LastKnownGoodStore(max_bytes = 4)
+    store.put("a", b"aaaa", 0.0)
+    store.put("big", b"bbbbb", 0.0)
+    assert store.get("big") is None
+    assert store.get("a") is not None
+
+
+def test_store_fresh_window():
+    store = LastKnownGoodStore(max_bytes = 100)
+    store.put("a", b"1", 10.0)
+    assert store.fresh("a", 10.5)
+    assert not store.fresh("a", 11.0)
+    assert not store.fresh("missing", 10.0)
+
+
+class EventService:
+    def __init__(self):
+        self.reply = None
+
+    @last_known_good("events")
+    def get_event(self, event_id: str, expand: bool = False):
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "LAST_KNOWN_GOOD_ENABLED", True)
+    monkeypatch.setattr(lkg, "store", LastKnownGoodStore(max_bytes = 1 << 20))
+    return EventService()
+
+
+@pytest.fixture
+def staleness():
+    value = Staleness()
+    token = current_staleness.set(value)
+    yield value
+    current_staleness.reset(token)
+
+
+def test_live_result_is_returned_and_stored(service):
+    service.reply = {"id": "e1", "title": "Live"}
+    assert service.get_event("e1") == {"id": "e1", "title": "Live"}
+    stored = lkg.store.get(("events", ("e1",), ()))
+    assert orjson.loads(stored[1]) == {"id": "e1", "title": "Live"}
+
+
+@pytest.mark.parametrize("error", [
+    HTTPException(status_code = 500, detail = "Get Event Fail"),
+    HTTPException(status_code = 503, detail = "Unavailable"),
+    httpx.ConnectError("refused"),
+    RuntimeError("circuit open"),
+])
+def test_outage_serves_the_stored_copy(service, staleness, error):
+    service.reply = {"id": "e1", "title": "Live"}
+    service.get_event("e1")
+    service.reply = error
+    assert service.get_event("e1") == {"id": "e1", "title": "Live"}
+    assert staleness.reason == "error"
+    assert staleness.age >= 0
+
+
+@pytest.mark.parametrize("status_code", [400, 403, 404])
+def test_4xx_passes_through(service, staleness, status_code):
+    service.reply = {"id": "e1"}
+    service.get_event("e1")
+    service.reply = HTTPException(status_code = status_code, detail = "Event Not Found")
+    with pytest.raises(HTTPException) as exc:
+        service.get_event("e1")
+    assert exc.value.status_code == status_code
+    assert staleness.reason is None
+
+
+def test_outage_without_a_stored_copy_raises(service):
+    service.reply = HTTPException(status_code = 500, detail = "Get Event Fail")
+    with pytest.raises(HTTPException):
+        service.get_event("e1")
+
+
+def test_copies_are_kept_per_arguments(service):
+    service.reply = {"id": "e1"}
+    service.get_event("e1")
+    service.reply = {"id": "e1", "expanded": True}
+    service.get_event("e1", expand = True)
+    service.reply = HTTPException(status_code = 500, detail = "Down")
+    assert service.get_event("e1") == {"id": "e1"}
+    assert service.get_event("e1", expand = True) == {"id": "e1", "expanded": True}
+    with pytest.raises(HTTPException):
+        service.get_event("e2")
+
+
+def test_slow_call_is_served_as_slow(service, staleness, monkeypatch):
+    monkeypatch.setattr(settings, "DEADLINES_ENABLED", True)
+    monkeypatch.setattr(settings, "LAST_KNOWN_GOOD_LATENCY_SECONDS", 2.0)
+    service.reply = {"id": "e1"}
+    service.get_event("e1")
+
+    class SlowReply(EventService):
+        @last_known_good("events")
+        def get_event(self, event_id: str, expand: bool = False):
+            # The Latency Budget is Installed Only Because a Copy Exists -> The Deadline Transport Would Cut the Call Here
+            budget = current_deadline.get()
+            assert budget is not None and budget.budget == 2.0
+            budget.expire("timeout")
+            raise httpx.ReadTimeout("timed out")
+
+    assert SlowReply().get_event("e1") == {"id": "e1"}
+    assert staleness.reason == "slow"
+    assert current_deadline.get() is None
+
+
+def test_disabled_calls_straight_through(service, monkeypatch):
+    monkeypatch.setattr(settings, "LAST_KNOWN_GOOD_ENABLED", False)
+    service.reply = {"id": "e1"}
+    service.get_event("e1")
+    assert len(lkg.store) == 0
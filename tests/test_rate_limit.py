@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import hmac
+import orjson
+import pytest
+from app.core.config import settings
+from app.core.rate_limit import MemoryBackend, RateLimitPolicy, headers, load_policies, token_subject
+from app.middleware.rate_limit import bearer_subject, client_ip
+
+
+def b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def jwt(claims: dict, secret: str) -> str:
+    signing_input = f"{b64(orjson.dumps({'alg': 'HS256', 'typ': 'JWT'}))}.{b64(orjson.dumps(claims))}"
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{b64(signature)}"
+
+
+def scope(headers = (), client = ("10.0.0.1", 5000)) -> dict:
+    return {"type": "http", "headers": [(name.encode(), value.encode()) for name, value in headers], "client": client}
+
+
+# 10 Requests per 10 Seconds -> One Token Back per Second
+POLICY = RateLimitPolicy("test", 10, 10)
+
+
+def test_bucket_allows_capacity_then_rejects():
+    backend = MemoryBackend()
+    decisions = [backend.take("k", POLICY, 100.0) for _ in range(11)]
+    assert all(d.allowed for d in decisions[:10])
+    assert [d.remaining for d in decisions[:3]] == [9, 8, 7]
+    rejected = decisions[10]
+    assert not rejected.allowed
+    assert rejected.remaining == 0
+    assert rejected.retry_after == pytest.approx(1.0)
+    assert rejected.reset_after == pytest.approx(10.0)
+
+
+def test_bucket_refills_continuously():
+    backend = MemoryBackend()
+    for _ in range(10):
+        backend.take("k", POLICY, 100.0)
+    assert not backend.take("k", POLICY, 100.5).allowed
+    assert backend.take("k", POLICY, 101.0).allowed # -> 1 Token Back After 1 Second
+    assert not backend.take("k", POLICY, 101.0).allowed
+    # Refill Stops at Capacity However Long the Key Was Idle
+    assert backend.take("k", POLICY, 10_000.0).remaining == 9
+
+
+def test_burst_caps_the_bucket_below_the_limit():
+    policy = RateLimitPolicy("checkout", 10, 60, burst = 5)
+    backend = MemoryBackend()
+    assert sum(backend.take("k", policy, 0.0).allowed for _ in range(10)) == 5
+    assert policy.rate == pytest.approx(10 / 60)
+
+
+def test_keys_have_separate_buckets():
+    backend = MemoryBackend()
+    for _ in range(10):
+        backend.take("a", POLICY, 0.0)
+    assert not backend.take("a", POLICY, 0.0).allowed
+    assert backend.take("b", POLICY, 0.0).allowed
+
+
+def test_eviction_drops_refilled_buckets_first():
+    backend = MemoryBackend(max_keys = 3)
+    backend.take("drained", RateLimitPolicy("slow", 1, 1000), 0.0)
+    backend.take("refilled-1", POLICY, 0.0)
+    backend.take("refilled-2", POLICY, 0.0)
+    backend.take("new", POLICY, 5.0)
+    assert set(backend._buckets) == {"drained", "new"}
+
+
+def test_eviction_drops_oldest_when_nothing_refilled():
+    slow = RateLimitPolicy("slow", 1, 1000)
+    backend = MemoryBackend(max_keys = 10)
+    for i in range(10):
+        backend.take(f"k{i}", slow, 0.0)
+    backend.take("new", slow, 1.0)
+    # One Tenth of max_keys is Freed in One Go -> Eviction Doesn't Run on Every New Key
+    assert "k0" not in backend._buckets
+    assert "new" in backend._buckets
+    assert len(backend._buckets) <= 10
+
+
+def test_load_policies_applies_overrides_and_disables():
+    policies = load_policies("/api/v1", {"login": "20/30", "register": "0/60"})
+    login = policies["POST /api/v1/auth/login"]
+    assert (login.limit, login.window) == (20, 30.0)
+    assert "POST /api/v1/auth/register" not in policies
+    assert policies["POST /api/v1/bookings/checkout"].key == "user"
+
+
+def test_headers():
+    policy = RateLimitPolicy("one", 1, 60)
+    backend = MemoryBackend()
+    allowed = headers(policy, backend.take("k", policy, 0.0))
+    assert "Retry-After" not in allowed
+    assert allowed["RateLimit-Reset"] == "60"
+    rejected = headers(policy, backend.take("k", policy, 0.0))
+    assert rejected["Retry-After"] == "60"
+    assert rejected["RateLimit-Remaining"] == "0"
+    assert rejected["RateLimit-Policy"] == "1;w=60;burst=1"
+
+
+@pytest.mark.parametrize("forwarded, hops, expected", [
+    (None, 1, "10.0.0.1"),
+    ("203.0.113.9", 0, "10.0.0.1"), # -> No Trusted Proxies -> The Header is Ignored
+    ("203.0.113.9", 1, "203.0.113.9"),
+    ("198.51.100.7, 203.0.113.9", 1, "203.0.113.9"), # -> Left Entries are Client-Controlled
+    ("198.51.100.7, 203.0.113.9", 2, "198.51.100.7"),
+    ("203.0.113.9", 3, "203.0.113.9"), # -> Fewer Hops Than Configured -> The Leftmost
+    (" , ", 1, "10.0.0.1"),
+])
+def test_client_ip(forwarded, hops, expected):
+    request_headers = [("x-forwarded-for", forwarded)] if forwarded is not None else []
+    assert client_ip(scope(request_headers), hops) == expected
+
+
+def test_client_ip_without_client():
+    assert client_ip(scope(client = None), 0) == "unknown"
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "HS256")
+    return "test-secret"
+
+
+def test_token_subject_verifies_signature(jwt_secret):
+    assert token_subject(jwt({"sub": "user-1"}, jwt_secret)) == "user-1"
+    assert token_subject(jwt({"sub": "user-1"}, "forged")) is None
+
+
+def test_token_subject_rejects_tampered_claims(jwt_secret):
+    header, _, signature = jwt({"sub": "user-1"}, jwt_secret).split(".")
+    tampered = f"{header}.{b64(orjson.dumps({'sub': 'user-2'}))}.{signature}"
+    assert token_subject(tampered) is None
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", "a.b.c", "a.b"])
+def test_token_subject_rejects_malformed(jwt_secret, token):
+    assert token_subject(token) is None
+
+
+def test_token_subject_needs_a_string_subject(jwt_secret):
+    assert token_subject(jwt({"sub": 42}, jwt_secret)) is None
+    assert token_subject(jwt({}, jwt_secret)) is None
+
+
+def test_token_subject_without_secret(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", "")
+    assert token_subject(jwt({"sub": "user-1"}, "")) is None
+
+
+def test_bearer_subject(jwt_secret):
+    token = jwt({"sub": "user-1"}, jwt_secret)
+    assert bearer_subject(scope([("authorization", f"Bearer {token}")])) == "user-1"
+    assert bearer_subject(scope([("authorization", f"Basic {token}")])) is None
+    assert bearer_subject(scope()) is None
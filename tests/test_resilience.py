@@ -0,0 +1,250 @@
+import httpx
+import pytest
+from app.core import resilience
+from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded, current_deadline
+from app.core.resilience import CLOSED, HALF_OPEN, IDEMPOTENT, OPEN, CircuitBreaker, CircuitOpenError, ResilientTransport, circuit_cause
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    value = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", value)
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    return value
+
+
+def breaker(**overrides) -> CircuitBreaker:
+    options = {"failure_rate": 0.5, "min_calls": 4, "window": 10, "open_seconds": 15, "half_open_calls": 2, **overrides}
+    return CircuitBreaker("test", **options)
+
+
+def trip(target: CircuitBreaker):
+    for _ in range(target.min_calls):
+        assert target.allow()
+        target.record(False)
+
+
+def test_breaker_needs_min_calls_before_opening(clock):
+    target = breaker()
+    for _ in range(3):
+        target.record(False)
+    assert target.state == CLOSED
+    target.record(False)
+    assert target.state == OPEN
+
+
+def test_breaker_opens_on_failure_rate(clock):
+    target = breaker()
+    for success in (True, True, True, False, False):
+        target.record(success)
+    assert target.state == CLOSED # -> 2 of 5 Failed
+    target.record(False)
+    assert target.state == OPEN # -> 3 of 6 Failed
+
+
+def test_breaker_forgets_failures_outside_the_window(clock):
+    target = breaker()
+    for _ in range(3):
+        target.record(False)
+    clock.now += 11
+    target.record(False)
+    assert target.state == CLOSED
+
+
+def test_open_breaker_rejects_until_open_seconds_pass(clock):
+    target = breaker()
+    trip(target)
+    assert not target.allow()
+    assert target.retry_after() == pytest.approx(15)
+    clock.now += 15
+    assert target.allow()
+    assert target.state == HALF_OPEN
+
+
+def test_half_open_closes_after_all_trials_succeed(clock):
+    target = breaker()
+    trip(target)
+    clock.now += 15
+    assert target.allow() and target.allow()
+    assert not target.allow() # -> Only half_open_calls Trials
+    target.record(True)
+    assert target.state == HALF_OPEN
+    target.record(True)
+    assert target.state == CLOSED
+    assert target.allow()
+
+
+def test_half_open_reopens_on_a_failed_trial(clock):
+    target = breaker()
+    trip(target)
+    clock.now += 15
+    assert target.allow()
+    target.record(False)
+    assert target.state == OPEN
+    assert not target.allow()
+
+
+def test_neutral_outcome_hands_the_trial_slot_back(clock):
+    target = breaker(half_open_calls = 1)
+    trip(target)
+    clock.now += 15
+    assert target.allow()
+    assert not target.allow()
+    target.record(None)
+    assert target.state == HALF_OPEN
+    assert target.allow()
+
+
+def test_abandoned_trials_expire(clock):
+    target = breaker(half_open_calls = 1)
+    trip(target)
+    clock.now += 15
+    assert target.allow() # -> Never Reports Back
+    assert not target.allow()
+    clock.now += 15
+    assert target.allow()
+
+
+def test_closing_clears_the_window(clock):
+    target = breaker(half_open_calls = 1)
+    trip(target)
+    clock.now += 15
+    target.allow()
+    target.record(True)
+    assert target.state == CLOSED
+    for _ in range(3):
+        target.record(False)
+    assert target.state == CLOSED
+
+
+def test_idempotent_set_covers_reads_only():
+    assert ("postgrest", "select") in IDEMPOTENT
+    assert ("storage", "download") in IDEMPOTENT
+    assert ("auth", "get") in IDEMPOTENT
+    for write in [("postgrest", "insert"), ("postgrest", "update"), ("postgrest", "delete"), ("postgrest", "upsert"),
+                  ("postgrest", "rpc"), ("storage", "upload"), ("storage", "remove"), ("auth", "post")]:
+        assert write not in IDEMPOTENT
+
+
+class ScriptedTransport(httpx.BaseTransport):
+    """Replies With the Given Statuses (or Raises the Given Errors) in Order"""
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply)
+
+
+@pytest.fixture
+def postgrest(monkeypatch, clock):
+    monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 2)
+    target = breaker(min_calls = 100)
+    monkeypatch.setitem(resilience.breakers, "postgrest", target)
+    return target
+
+
+def call(transport: httpx.BaseTransport, method: str, path: str = "/rest/v1/event") -> httpx.Response:
+    with httpx.Client(transport = transport) as client:
+        return client.request(method, f"http://supabase.test{path}")
+
+
+def test_reads_are_retried_on_503(postgrest):
+    inner = ScriptedTransport(503, 503, 200)
+    assert call(ResilientTransport(inner), "GET").status_code == 200
+    assert inner.calls == 3
+
+
+def test_reads_are_retried_on_connection_errors(postgrest):
+    inner = ScriptedTransport(httpx.ConnectError("refused"), 200)
+    assert call(ResilientTransport(inner), "GET").status_code == 200
+    assert inner.calls == 2
+
+
+def test_retries_stop_after_max_attempts(postgrest):
+    inner = ScriptedTransport(503, 503, 503, 200)
+    assert call(ResilientTransport(inner), "GET").status_code == 503
+    assert inner.calls == 3
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+def test_writes_are_never_retried(postgrest, method):
+    inner = ScriptedTransport(503, 200)
+    assert call(ResilientTransport(inner), method).status_code == 503
+    assert inner.calls == 1
+
+
+def test_rpc_is_never_retried(postgrest):
+    inner = ScriptedTransport(503, 200)
+    assert call(ResilientTransport(inner), "POST", "/rest/v1/rpc/organizer_booking_totals").status_code == 503
+    assert inner.calls == 1
+
+
+def test_500_is_not_retried(postgrest):
+    inner = ScriptedTransport(500, 200)
+    assert call(ResilientTransport(inner), "GET").status_code == 500
+    assert inner.calls == 1
+
+
+def test_no_retry_when_the_deadline_cant_fit_it(postgrest):
+    token = current_deadline.set(Deadline("GET /test", 0.0))
+    try:
+        inner = ScriptedTransport(503, 200)
+        assert call(ResilientTransport(inner), "GET").status_code == 503
+        assert inner.calls == 1
+    finally:
+        current_deadline.reset(token)
+
+
+def test_open_circuit_rejects_without_sending(postgrest):
+    trip(postgrest)
+    inner = ScriptedTransport(200)
+    with pytest.raises(CircuitOpenError) as exc:
+        call(ResilientTransport(inner), "GET")
+    assert inner.calls == 0
+    assert exc.value.name == "postgrest"
+
+
+def test_transport_records_outcomes(postgrest):
+    postgrest.min_calls = 2
+    call(ResilientTransport(ScriptedTransport(404)), "GET")
+    call(ResilientTransport(ScriptedTransport(404)), "GET")
+    assert postgrest.state == CLOSED # -> 4xx Says Nothing Bad About the Dependency
+    call(ResilientTransport(ScriptedTransport(500)), "POST")
+    call(ResilientTransport(ScriptedTransport(500)), "POST")
+    assert postgrest.state == OPEN
+
+
+def test_deadline_refusal_is_neutral(postgrest):
+    trip(postgrest)
+    postgrest._opened_at -= 15
+    inner = ScriptedTransport(DeadlineExceeded("spent"))
+    with pytest.raises(DeadlineExceeded):
+        call(ResilientTransport(inner), "GET")
+    assert postgrest.state == HALF_OPEN
+    assert postgrest._trials == 0
+
+
+def test_circuit_cause_walks_the_chain():
+    error = CircuitOpenError("postgrest", 3)
+    try:
+        try:
+            raise error
+        except CircuitOpenError as e:
+            raise RuntimeError("wrapped") from e
+    except RuntimeError as wrapped:
+        assert circuit_cause(wrapped) is error
+    assert circuit_cause(RuntimeError("other")) is None
@@ -0,0 +1,247 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from app.core.config import settings
+from app.services.storage_gc_service import StorageGcService
+from app.utils.storage import StorageService
+from app.utils.uploads import SpooledUpload
+
+BUCKET = settings.EVENT_IMAGE_BUCKET
+OLD = (datetime.now(timezone.utc) - timedelta(days = 1)).isoformat()
+NEW = datetime.now(timezone.utc).isoformat()
+
+
+def public_url(bucket: str, path: str) -> str:
+    return f"https://supabase.test/storage/v1/object/public/{bucket}/{path}"
+
+
+class Query:
+    """In-Memory PostgREST Query -> Filters are Evaluated Against the Fake's Rows"""
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.values = None
+        self.checks = []
+        self.negate = False
+        self.size = None
+
+    def select(self, columns):
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+
+    def upsert(self, values, **kwargs):
+        self.operation, self.values = "upsert", values
+        return self
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def _check(self, test):
+        negate, self.negate = self.negate, False
+        self.checks.append((lambda row: not test(row)) if negate else test)
+        return self
+
+    def eq(self, column, value):
+        return self._check(lambda row: row.get(column) == value)
+
+    def in_(self, column, values):
+        return self._check(lambda row: row.get(column) in values)
+
+    def lte(self, column, value):
+        return self._check(lambda row: row.get(column) <= value)
+
+    def gt(self, column, value):
+        return self._check(lambda row: row.get(column) > value)
+
+    def is_(self, column, value):
+        return self._check(lambda row: row.get(column) is None)
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = self.client.tables.setdefault(self.table, [])
+        self.client.executed.append(self)
+        if self.operation == "upsert":
+            for value in self.values:
+                if not any(row["bucket"] == value["bucket"] and row["path"] == value["path"] for row in rows):
+                    rows.append({"id": len(rows) + 100, "created_at": NEW, **value})
+            return SimpleNamespace(data = [])
+        matched = [row for row in rows if all(check(row) for check in self.checks)]
+        if self.operation == "delete":
+            self.client.tables[self.table] = [row for row in rows if row not in matched]
+        data = matched[:self.size] if self.size else matched
+        for hook in self.client.hooks:
+            hook(self)
+        return SimpleNamespace(data = data)
+
+
+class FakeBucket:
+    def __init__(self, client: "FakeSupabase", bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def get_public_url(self, path):
+        return public_url(self.bucket, path)
+
+    def remove(self, paths):
+        if self.client.remove_error:
+            raise self.client.remove_error
+        self.client.removed.extend(paths)
+
+    def exists(self, path):
+        return True
+
+    def list(self, folder, options):
+        items = self.client.listing.get(folder or "", [])
+        return items[options["offset"]:options["offset"] + options["limit"]]
+
+
+class FakeSupabase:
+    def __init__(self, **tables):
+        self.tables = {name: list(rows) for name, rows in tables.items()}
+        self.executed = []
+        self.hooks = []
+        self.removed = []
+        self.remove_error = None
+        self.listing = {}
+        self.storage = SimpleNamespace(from_ = lambda bucket: FakeBucket(self, bucket))
+
+    def table(self, name):
+        return Query(self, name)
+
+
+def candidate(row_id: int, path: str, bucket: str = BUCKET, created_at: str = OLD) -> dict:
+    return {"id": row_id, "bucket": bucket, "path": path, "created_at": created_at}
+
+
+def event(row_id: int, path: str, suffix: str = "") -> dict:
+    return {"id": row_id, "image_url": public_url(BUCKET, path) + suffix}
+
+
+@pytest.fixture(autouse = True)
+def gc_settings(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_GC_GRACE_SECONDS", 3600)
+    monkeypatch.setattr(settings, "STORAGE_GC_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "STORAGE_GC_LIST_PAGE_SIZE", 2)
+
+
+def test_unreferenced_candidate_is_removed_with_its_variants():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "banners/abc/original.png")], event = [])
+    StorageGcService(supabase).collect_candidates()
+    assert supabase.removed == ["banners/abc/original.png", "banners/abc/thumb.webp", "banners/abc/card.webp", "banners/abc/hero.webp"]
+    assert supabase.tables["storage_gc_candidates"] == []
+
+
+@pytest.mark.parametrize("suffix", ["", "?"]) # -> Older Rows Saved With a Trailing "?"
+def test_referenced_candidate_is_kept(suffix):
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "banners/abc/original.png")],
+                            event = [event(1, "banners/abc/original.png", suffix)])
+    StorageGcService(supabase).collect_candidates()
+    assert supabase.removed == []
+    assert supabase.tables["storage_gc_candidates"] == [] # -> Dropped, a Later Replace Records It Again
+
+
+def test_young_candidates_wait_for_the_grace_period():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "banners/abc/original.png", created_at = NEW)], event = [])
+    assert StorageGcService(supabase).collect_candidates() is False
+    assert supabase.removed == []
+    assert len(supabase.tables["storage_gc_candidates"]) == 1
+
+
+def test_reuse_after_the_batch_read_saves_the_object():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "banners/abc/original.png"), candidate(2, "banners/def/original.png")],
+                            event = [])
+
+    # An Upload Dedup Hit Cancels abc's Candidate Right After the Batch Was Read
+    def reuse(query):
+        if query.table == "storage_gc_candidates" and query.size is not None:
+            StorageService(supabase)._cancel_delete(BUCKET, "banners/abc/original.png")
+    supabase.hooks.append(reuse)
+
+    StorageGcService(supabase).collect_candidates()
+    assert "banners/abc/original.png" not in supabase.removed
+    assert "banners/def/original.png" in supabase.removed
+
+
+def test_remove_failure_keeps_the_candidates():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(i, f"banners/{i}/original.png") for i in range(10)], event = [])
+    supabase.remove_error = RuntimeError("storage down")
+    assert StorageGcService(supabase).collect_candidates() is False # -> Full Batch, But Don't Spin on a Failure
+    assert len(supabase.tables["storage_gc_candidates"]) == 10
+
+
+def test_unknown_bucket_candidates_are_dropped():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "x/original.png", bucket = "other")])
+    StorageGcService(supabase).collect_candidates()
+    assert supabase.removed == []
+    assert supabase.tables["storage_gc_candidates"] == []
+
+
+def test_full_batch_asks_for_another():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(i, f"banners/{i}/original.png") for i in range(12)], event = [])
+    service = StorageGcService(supabase)
+    assert service.collect_candidates() is True
+    assert service.collect_candidates() is False
+    assert supabase.tables["storage_gc_candidates"] == []
+
+
+def test_reference_scan_pages_by_id():
+    supabase = FakeSupabase(event = [event(i, f"banners/{i}/original.png") for i in range(1, 6)] + [{"id": 6, "image_url": None}])
+
+    # A Row Deleted Between Pages -> An Offset Would Skip a Later Row, the Keyset Cursor Doesn't
+    def delete_first(query):
+        if query.table == "event" and len(supabase.tables["event"]) == 6:
+            supabase.tables["event"].pop(0)
+    supabase.hooks.append(delete_first)
+
+    referenced = StorageGcService(supabase)._all_referenced_paths(BUCKET)
+    assert referenced == {f"banners/{i}/original.png" for i in range(1, 6)}
+
+
+def test_sweep_records_old_unreferenced_originals_once():
+    supabase = FakeSupabase(storage_gc_candidates = [], event = [event(1, "banners/kept/original.png")])
+    supabase.listing = {
+        "banners": [{"name": name, "id": None} for name in ("kept", "orphan", "young")],
+        "banners/kept": [{"name": "original.png", "id": "1", "created_at": OLD}],
+        "banners/orphan": [{"name": name, "id": str(i), "created_at": OLD} for i, name in enumerate(("card.webp", "original.png", "thumb.webp"))],
+        "banners/young": [{"name": "original.png", "id": "9", "created_at": NEW}],
+    }
+    service = StorageGcService(supabase)
+    assert service.sweep(BUCKET) == 1
+    # Variants are Recorded Through Their Original, Not on Their Own
+    assert [row["path"] for row in supabase.tables["storage_gc_candidates"]] == ["banners/orphan/original.png"]
+    service.sweep(BUCKET)
+    assert len(supabase.tables["storage_gc_candidates"]) == 1 # -> Already Recorded Paths Keep Their Time
+
+
+def store(supabase: FakeSupabase) -> dict:
+    upload = SpooledUpload("/nonexistent", 4, "image/png", "png", "abc")
+    return StorageService(supabase)._store_upload(upload, BUCKET, "banners", {"thumb": 320})
+
+
+def test_dedup_hit_cancels_the_pending_delete():
+    supabase = FakeSupabase(storage_gc_candidates = [candidate(1, "banners/abc/original.png"), candidate(2, "banners/def/original.png")])
+    result = store(supabase)
+    assert result["path"] == "banners/abc/original.png"
+    assert [row["path"] for row in supabase.tables["storage_gc_candidates"]] == ["banners/def/original.png"]
+
+
+def test_cancel_failure_does_not_fail_the_upload():
+    supabase = FakeSupabase()
+
+    def fail(query):
+        if query.operation == "delete":
+            raise RuntimeError("postgrest down")
+    supabase.hooks.append(fail)
+    assert store(supabase)["path"] == "banners/abc/original.png"
@@ -0,0 +1,161 @@
+from types import SimpleNamespace
+import pytest
+from app.core.config import settings
+from app.services import stripe_sync_service
+from app.services.stripe_sync_service import StripeSyncService
+
+
+class Query:
+    """Chainable Stand-In for a PostgREST Query -> Records the Operation and Its Filters"""
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.operation = None
+        self.values = None
+        self.filters = []
+
+    def select(self, columns):
+        self.operation = "select"
+        return self
+
+    def update(self, values):
+        self.operation, self.values = "update", values
+        return self
+
+    def __getattr__(self, name):
+        # eq, in_, lte, order, limit ... -> Recorded, Not Evaluated
+        def record(*args):
+            self.filters.append((name, *args))
+            return self
+        return record
+
+    def execute(self):
+        self.client.executed.append(self)
+        return SimpleNamespace(data = self.client.replies.get((self.table, self.operation), []))
+
+
+class FakeSupabase:
+    def __init__(self, replies = None):
+        self.replies = replies or {}
+        self.executed = []
+
+    def table(self, name):
+        return Query(self, name)
+
+    def updates(self, table):
+        return [query for query in self.executed if query.table == table and query.operation == "update"]
+
+
+def outbox_row(row_id: int, event_id: str, operation: str = "sync", **extra) -> dict:
+    return {"id": row_id, "event_id": event_id, "operation": operation, "attempts": 0, "payload": {}, **extra}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "STRIPE_OUTBOX_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "STRIPE_OUTBOX_MAX_ATTEMPTS", 3)
+    return StripeSyncService(supabase_admin = FakeSupabase())
+
+
+def test_rows_are_collapsed_per_event(service, monkeypatch):
+    rows = [outbox_row(1, "e1"), outbox_row(2, "e2"), outbox_row(3, "e1"), outbox_row(4, "e1")]
+    monkeypatch.setattr(service, "_claim_batch", lambda: rows)
+    calls = []
+    monkeypatch.setattr(service, "_reconcile_event", lambda event_id, event_rows: calls.append((event_id, [r["id"] for r in event_rows])))
+
+    assert service.process_batch() is False
+    assert calls == [("e1", [1, 3, 4]), ("e2", [2])]
+    done = service.supabase_admin.updates("stripe_outbox")
+    assert len(done) == 1
+    assert done[0].values["status"] == "done"
+    assert ("in_", "id", [1, 3, 4, 2]) in done[0].filters
+
+
+def test_failed_event_retries_all_its_rows(service, monkeypatch):
+    rows = [outbox_row(1, "e1"), outbox_row(2, "e2"), outbox_row(3, "e1", attempts = 2)]
+    monkeypatch.setattr(service, "_claim_batch", lambda: rows)
+
+    def reconcile(event_id, event_rows):
+        if event_id == "e1":
+            raise RuntimeError("stripe down")
+    monkeypatch.setattr(service, "_reconcile_event", reconcile)
+
+    service.process_batch()
+    retries, done = {}, None
+    for query in service.supabase_admin.updates("stripe_outbox"):
+        if query.values.get("status") == "done":
+            done = query
+        else:
+            retries[query.filters[0][2]] = query.values
+    assert retries[1]["attempts"] == 1 and "next_attempt_at" in retries[1]
+    assert retries[3]["status"] == "dead" # -> Third Attempt Reaches STRIPE_OUTBOX_MAX_ATTEMPTS
+    assert ("in_", "id", [2]) in done.filters
+
+
+def test_full_batch_asks_for_another(service, monkeypatch):
+    monkeypatch.setattr(settings, "STRIPE_OUTBOX_BATCH_SIZE", 2)
+    monkeypatch.setattr(service, "_claim_batch", lambda: [outbox_row(1, "e1"), outbox_row(2, "e1")])
+    monkeypatch.setattr(service, "_reconcile_event", lambda event_id, event_rows: None)
+    assert service.process_batch() is True
+
+
+def test_empty_batch(service, monkeypatch):
+    monkeypatch.setattr(service, "_claim_batch", lambda: [])
+    assert service.process_batch() is False
+    assert service.supabase_admin.executed == []
+
+
+class FakeStripe:
+    """Records Product / Price Calls -> New Objects Get Sequential IDs"""
+    def __init__(self):
+        self.calls = []
+        self.Product = SimpleNamespace(create = self._call("product.create", "prod"), modify = self._call("product.modify"))
+        self.Price = SimpleNamespace(create = self._call("price.create", "price"), modify = self._call("price.modify"),
+                                     retrieve = self._call("price.retrieve"))
+
+    def _call(self, name, prefix = None):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return SimpleNamespace(id = f"{prefix}_{len(self.calls)}") if prefix else None
+        return call
+
+    def names(self):
+        return [name for name, _, _ in self.calls]
+
+
+@pytest.fixture
+def fake_stripe(monkeypatch):
+    fake = FakeStripe()
+    monkeypatch.setattr(stripe_sync_service, "stripe", fake)
+    return fake
+
+
+PAID_EVENT = {"id": "e1", "title": "Summit", "description": "", "is_paid": True, "ticket_price": 25,
+              "currency": "MYR", "stripe_product_id": None, "stripe_price_id": None}
+
+
+def test_collapsed_sync_creates_once_keyed_by_newest_row(fake_stripe):
+    supabase = FakeSupabase({("event", "select"): [PAID_EVENT], ("event", "update"): [PAID_EVENT]})
+    StripeSyncService(supabase_admin = supabase)._reconcile_event("e1", [outbox_row(5, "e1"), outbox_row(7, "e1")])
+    assert fake_stripe.names() == ["product.create", "price.create"]
+    assert fake_stripe.calls[0][2]["idempotency_key"] == "event-e1-outbox-7-product"
+    assert fake_stripe.calls[1][2]["idempotency_key"] == "event-e1-outbox-7-price"
+    assert fake_stripe.calls[1][2]["unit_amount"] == 2500
+    assert supabase.updates("event")[0].values == {"stripe_product_id": "prod_1", "stripe_price_id": "price_2"}
+
+
+def test_archive_rows_run_before_the_sync(fake_stripe):
+    supabase = FakeSupabase({("event", "select"): []})
+    rows = [outbox_row(1, "e1", "archive", payload = {"stripe_product_id": "prod_old", "stripe_price_id": "price_old"}),
+            outbox_row(2, "e1")]
+    StripeSyncService(supabase_admin = supabase)._reconcile_event("e1", rows)
+    # Price Before Product, and the Deleted Event's Sync Row Does Nothing
+    assert [(name, args) for name, args, _ in fake_stripe.calls] == [("price.modify", ("price_old",)), ("product.modify", ("prod_old",))]
+
+
+def test_archive_only_batch_skips_the_event_read(fake_stripe):
+    supabase = FakeSupabase()
+    rows = [outbox_row(1, "e1", "archive", payload = {"stripe_product_id": "prod_old"})]
+    StripeSyncService(supabase_admin = supabase)._reconcile_event("e1", rows)
+    assert fake_stripe.names() == ["product.modify"]
+    assert supabase.executed == []
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from app.services.dashboard_service import DashboardService
+from app.utils.time_buckets import MAX_CHART_BUCKETS, bucket_bookings, count_buckets, floor_to_bucket, next_bucket
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo = timezone.utc)
+
+
+@pytest.mark.parametrize("granularity, expected", [
+    ("hour", utc(2024, 5, 1, 13)),
+    ("day", utc(2024, 5, 1)),
+    ("week", utc(2024, 4, 29)), # -> Wednesday 1 May Falls in the Week Starting Monday 29 April
+    ("month", utc(2024, 5, 1)),
+])
+def test_floor_to_bucket(granularity, expected):
+    assert floor_to_bucket(utc(2024, 5, 1, 13, 45, 12, 123000), granularity) == expected
+
+
+def test_floor_to_bucket_converts_to_utc():
+    # 07:30 in UTC+8 on 1 May is Still 30 April in UTC
+    moment = datetime(2024, 5, 1, 7, 30, tzinfo = timezone(timedelta(hours = 8)))
+    assert floor_to_bucket(moment, "day") == utc(2024, 4, 30)
+
+
+def test_floor_to_bucket_keeps_aligned_starts():
+    assert floor_to_bucket(utc(2024, 4, 29), "week") == utc(2024, 4, 29)
+    assert floor_to_bucket(utc(2024, 5, 1), "month") == utc(2024, 5, 1)
+
+
+@pytest.mark.parametrize("start, granularity, expected", [
+    (utc(2024, 5, 1, 23), "hour", utc(2024, 5, 2, 0)),
+    (utc(2024, 2, 28), "day", utc(2024, 2, 29)),
+    (utc(2024, 12, 30), "week", utc(2025, 1, 6)),
+    (utc(2024, 1, 1), "month", utc(2024, 2, 1)),
+    (utc(2024, 12, 1), "month", utc(2025, 1, 1)),
+])
+def test_next_bucket(start, granularity, expected):
+    assert next_bucket(start, granularity) == expected
+
+
+@pytest.mark.parametrize("first, last, granularity, expected", [
+    (utc(2024, 5, 1, 0), utc(2024, 5, 1, 0), "hour", 1),
+    (utc(2024, 5, 1, 0), utc(2024, 5, 2, 23), "hour", 48),
+    (utc(2024, 5, 1), utc(2024, 5, 31), "day", 31),
+    (utc(2024, 4, 29), utc(2024, 7, 15), "week", 12),
+    (utc(2024, 11, 1), utc(2025, 2, 1), "month", 4),
+])
+def test_count_buckets(first, last, granularity, expected):
+    assert count_buckets(first, last, granularity) == expected
+
+
+def test_count_buckets_matches_stepping():
+    for granularity in ("hour", "day", "week", "month"):
+        first = floor_to_bucket(utc(2023, 12, 31, 22), granularity)
+        last, steps = first, 1
+        for _ in range(40):
+            last, steps = next_bucket(last, granularity), steps + 1
+        assert count_buckets(first, last, granularity) == steps
+
+
+def test_bucket_bookings_groups_by_bucket_and_currency():
+    bookings = [
+        {"created_at": "2024-05-01T13:45:12.123+00:00", "currency": "MYR", "amount_total": 1000},
+        {"created_at": "2024-05-01T13:59:59+00:00", "currency": "MYR", "amount_total": 1000},
+        {"created_at": "2024-05-01T14:00:00+00:00", "currency": "MYR", "amount_total": 2500},
+        {"created_at": "2024-05-01T13:10:00+00:00", "currency": "USD", "amount_total": 500},
+    ]
+    assert bucket_bookings(bookings, "hour") == {
+        (utc(2024, 5, 1, 13), "MYR"): (2000, 2),
+        (utc(2024, 5, 1, 14), "MYR"): (2500, 1),
+        (utc(2024, 5, 1, 13), "USD"): (500, 1),
+    }
+    assert bucket_bookings(bookings, "day") == {
+        (utc(2024, 5, 1), "MYR"): (4500, 3),
+        (utc(2024, 5, 1), "USD"): (500, 1),
+    }
+
+
+def test_bucket_bookings_merges_days_into_weeks_and_months():
+    bookings = [
+        {"created_at": "2024-04-29T00:00:00+00:00", "currency": "MYR", "amount_total": 100}, # -> Monday
+        {"created_at": "2024-05-05T23:59:59+00:00", "currency": "MYR", "amount_total": 200}, # -> Sunday, Same Week
+        {"created_at": "2024-05-06T00:00:00+00:00", "currency": "MYR", "amount_total": 400}, # -> Next Week
+    ]
+    assert bucket_bookings(bookings, "week") == {
+        (utc(2024, 4, 29), "MYR"): (300, 2),
+        (utc(2024, 5, 6), "MYR"): (400, 1),
+    }
+    assert bucket_bookings(bookings, "month") == {
+        (utc(2024, 4, 1), "MYR"): (100, 1),
+        (utc(2024, 5, 1), "MYR"): (600, 2),
+    }
+
+
+@pytest.fixture
+def dashboard():
+    return DashboardService(supabase = object(), supabase_admin = object())
+
+
+def test_chart_window_aligns_both_edges(dashboard):
+    first, last = dashboard._resolve_chart_window(utc(2024, 5, 1, 13, 30), utc(2024, 5, 3, 9, 15), "day")
+    assert (first, last) == (utc(2024, 5, 1), utc(2024, 5, 3))
+
+
+def test_chart_window_treats_naive_datetimes_as_utc(dashboard):
+    first, last = dashboard._resolve_chart_window(datetime(2024, 5, 1, 13), datetime(2024, 5, 1, 15), "hour")
+    assert (first, last) == (utc(2024, 5, 1, 13), utc(2024, 5, 1, 15))
+
+
+def test_chart_window_defaults_from_to(dashboard):
+    first, last = dashboard._resolve_chart_window(None, utc(2024, 5, 31, 12), "day")
+    assert (first, last) == (utc(2024, 5, 1), utc(2024, 5, 31))
+
+
+def test_chart_window_accepts_exactly_max_buckets(dashboard):
+    start = utc(2024, 1, 1)
+    end = start + timedelta(hours = MAX_CHART_BUCKETS - 1)
+    first, last = dashboard._resolve_chart_window(start, end, "hour")
+    assert count_buckets(first, last, "hour") == MAX_CHART_BUCKETS
+
+
+def test_chart_window_rejects_too_many_buckets(dashboard):
+    start = utc(2024, 1, 1)
+    with pytest.raises(HTTPException) as exc:
+        dashboard._resolve_chart_window(start, start + timedelta(hours = MAX_CHART_BUCKETS), "hour")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("date_from, date_to, granularity", [
+    (utc(2024, 5, 2), utc(2024, 5, 1), "day"),
+    (utc(2024, 5, 1), utc(2024, 5, 2), "year"),
+])
+def test_chart_window_rejects_bad_input(dashboard, date_from, date_to, granularity):
+    with pytest.raises(HTTPException) as exc:
+        dashboard._resolve_chart_window(date_from, date_to, granularity)
+    assert exc.value.status_code == 400
@@ -0,0 +1,146 @@
+import hashlib
+import io
+import os
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException, UploadFile
+from app.core.config import settings
+from app.utils.storage import StorageService
+from app.utils.uploads import SNIFF_BYTES, sniff_image_type, spool_chunks, spool_upload
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 12
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+GIF = b"GIF89a" + b"\x00" * 10
+WEBP = b"RIFF\x24\x00\x00\x00WEBPVP8 "
+
+
+@pytest.mark.parametrize("head, expected", [
+    (JPEG, ("image/jpeg", "jpg")),
+    (PNG, ("image/png", "png")),
+    (b"GIF87a" + b"\x00" * 10, ("image/gif", "gif")),
+    (GIF, ("image/gif", "gif")),
+    (WEBP, ("image/webp", "webp")),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", None), # -> RIFF, But Not WebP
+    (b"<svg xmlns='http://www.w3.org/2000/svg'>", None),
+    (b"%PDF-1.7", None),
+    (b"", None),
+])
+def test_sniff_image_type(head, expected):
+    assert sniff_image_type(head[:SNIFF_BYTES]) == expected
+
+
+@pytest.fixture(autouse = True)
+def temp_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "UPLOAD_TEMP_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_spool_copies_and_hashes(temp_dir):
+    chunks = [PNG, b"a" * 100, b"", b"b" * 50]
+    with spool_chunks(chunks, max_bytes = 1000) as upload:
+        assert (upload.content_type, upload.extension) == ("image/png", "png")
+        assert upload.size == 166
+        assert upload.sha256 == hashlib.sha256(b"".join(chunks)).hexdigest()
+        with open(upload.path, "rb") as file:
+            assert file.read() == b"".join(chunks)
+    assert os.listdir(temp_dir) == []
+
+
+def test_spool_type_comes_from_the_bytes():
+    # Whatever the Client Called It, a PNG Named .jpg is Stored as a PNG
+    file = UploadFile(io.BytesIO(PNG + b"rest"), filename = "banner.jpg", headers = {"content-type": "image/jpeg"})
+    with spool_upload(file) as upload:
+        assert upload.content_type == "image/png"
+
+
+def test_spool_rejects_non_images_before_writing(temp_dir):
+    with pytest.raises(HTTPException) as exc:
+        spool_chunks([b"<html>" + b"x" * 100])
+    assert exc.value.status_code == 400
+    assert os.listdir(temp_dir) == []
+
+
+def test_spool_rejects_empty_uploads(temp_dir):
+    with pytest.raises(HTTPException) as exc:
+        spool_chunks([b"", b""])
+    assert exc.value.status_code == 400
+    assert os.listdir(temp_dir) == []
+
+
+def test_spool_stops_reading_once_the_cap_is_crossed(temp_dir):
+    read = []
+
+    def chunks():
+        yield JPEG
+        for i in range(100):
+            read.append(i)
+            yield b"x" * 64
+
+    with pytest.raises(HTTPException) as exc:
+        spool_chunks(chunks(), max_bytes = 200)
+    assert exc.value.status_code == 413
+    assert len(read) == 3 # -> 16 + 3 * 64 Crosses 200, Nothing More is Pulled
+    assert os.listdir(temp_dir) == []
+
+
+def test_spool_accepts_exactly_the_cap():
+    with spool_chunks([JPEG, b"x" * 84], max_bytes = 100) as upload:
+        assert upload.size == 100
+
+
+def test_spool_upload_uses_the_configured_cap(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 32)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 8)
+    file = UploadFile(io.BytesIO(GIF + b"x" * 32), filename = "a.gif")
+    with pytest.raises(HTTPException) as exc:
+        spool_upload(file)
+    assert exc.value.status_code == 413
+
+
+class FakeSupabase:
+    """Storage info() and the Upserts the Direct-Upload Check Makes"""
+    def __init__(self, info: dict):
+        self.info = info
+        self.upserts = []
+        bucket = SimpleNamespace(info = lambda path: self.info, get_public_url = lambda path: f"https://supabase.test/{path}")
+        self.storage = SimpleNamespace(from_ = lambda name: bucket)
+
+    def table(self, name):
+        query = SimpleNamespace(execute = lambda: SimpleNamespace(data = []))
+        query.upsert = lambda values, **kwargs: self.upserts.append((name, values)) or query
+        return query
+
+
+def complete(supabase: FakeSupabase, head: bytes, path: str = "staging/u1/x/original.png") -> dict:
+    service = StorageService(supabase)
+    service._read_head = lambda bucket, path: head
+    return service._generic_complete_upload("avatars", "staging/u1", path, {"thumb": 96})
+
+
+def test_direct_upload_passes_checks():
+    supabase = FakeSupabase({"size": 100, "content_type": "image/png"})
+    assert complete(supabase, PNG)["path"] == "staging/u1/x/original.png"
+    assert [table for table, _ in supabase.upserts] == ["image_variant_jobs"]
+
+
+@pytest.mark.parametrize("info, head, status_code", [
+    ({"size": 0}, PNG, 400),
+    ({"metadata": {"size": 11 * 1024 * 1024, "mimetype": "image/png"}}, PNG, 413),
+    ({"size": 100}, b"<html>", 400),
+    ({"size": 100, "content_type": "image/png"}, JPEG, 400), # -> Bytes Don't Match the Issued Extension
+    ({"size": 100, "content_type": "image/gif"}, PNG, 400),
+])
+def test_direct_upload_failing_checks_schedules_a_delete(monkeypatch, info, head, status_code):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+    supabase = FakeSupabase(info)
+    with pytest.raises(HTTPException) as exc:
+        complete(supabase, head)
+    assert exc.value.status_code == status_code
+    assert supabase.upserts == [("storage_gc_candidates", {"bucket": "avatars", "path": "staging/u1/x/original.png"})]
+
+
+@pytest.mark.parametrize("path", ["other/u2/x/original.png", "staging/u1/../u2/original.png", "staging/u1/x/thumb.webp"])
+def test_direct_upload_rejects_foreign_paths(path):
+    with pytest.raises(HTTPException) as exc:
+        complete(FakeSupabase({"size": 100}), PNG, path)
+    assert exc.value.status_code == 403